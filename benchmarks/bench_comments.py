@@ -0,0 +1,114 @@
+"""
+Conformance check and benchmark for the regex comment scanners of the Go, Javascript and
+shell parsers. The corpus holds the comments extracted by the former per-character state
+machines, edge cases included; the timings are taken on generated sources.
+
+Usage:
+    python benchmarks/bench_comments.py
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sani.debugger.parser import Parser  # noqa: E402
+from sani.utils.exception import UnterminatedCommentError  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+# (language, code, comments as (text, lineno, multiline), None if unterminated)
+CORPUS = [
+    (
+        "go",
+        "package main\n// line\nfunc f() { x := \"// no\" + `/* raw */` + '/' }\n/* block\n * more **/\n",
+        [(" line", 2, False), (" block\n * more *", 4, True)],
+    ),
+    (
+        "go",
+        'a := 1 / 2 // half\nb := x/"//s" // q\n/**/ /*/ x */\n',
+        [(" half", 1, False), ('s" // q', 2, False), ("", 3, True), ("/ x ", 3, True)],
+    ),
+    ("go", 's := "esc \\" // in" // out', [(" out", 1, False)]),
+    ("go", "x := `multi\nline // raw` // after\n", [(" after", 2, False)]),
+    ("go", "/* never closed", None),
+    (
+        "javascript",
+        "let s = 'it\\'s // no'; // yes\nlet r = \"/* no */\"; /* yes */\n",
+        [(" yes", 1, False), (" yes ", 2, True)],
+    ),
+    (
+        "javascript",
+        "let t = `tpl` // backticks are not strings\n",
+        [(" backticks are not strings", 1, False)],
+    ),
+    (
+        "shell",
+        "s='a' # c\necho \\# not\necho \"#no\" #yes\n",
+        [(" c", 1, False), ("yes", 3, False)],
+    ),
+    (
+        "shell",
+        "'\\'' # escaped quote\n#\n",
+        [(" escaped quote", 1, False), ("", 2, False)],
+    ),
+]
+CHUNKS = {
+    "go": '// Function {index}\nfunc f{index}() string {{\n\t/* "block" */\n\treturn "// not a comment" + `raw` // trailing\n}}\n\n',
+    "javascript": "// Function {index}\nfunction f{index}() {{\n  /* 'block' */\n  return \"// not a comment\" + 'x'; // trailing\n}}\n\n",
+    "shell": "# Function {index}\nf{index}() {{\n  echo \"# not a comment\" \\# '#' # trailing\n}}\n\n",
+}
+
+
+def extract(language: str, code: str):
+    return Parser[language].value().extract_attributes(io.StringIO(code))
+
+
+def check() -> int:
+    """
+    Check the corpus, returns the number of mismatches.
+    """
+    mismatches = 0
+    for language, code, expected in CORPUS:
+        try:
+            comments = [tuple(comment) for comment in extract(language, code)[0]]
+        except UnterminatedCommentError:
+            comments = None
+        if comments != expected:
+            mismatches += 1
+            print(f"mismatch {language} {code!r}: {comments} != {expected}")
+    return mismatches
+
+
+def measure(language: str, code: str, repeat: int = 3) -> float:
+    """
+    Best time of `extract_attributes` on the code in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(language, code)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    mismatches = check()
+    print(f"conformance: {len(CORPUS) - mismatches}/{len(CORPUS)} cases")
+    print(f"{'language':>10} {'lines':>8} {'comments':>9} {'ms':>8} {'us/line':>8}")
+    for language, chunk in CHUNKS.items():
+        for size in SIZES:
+            code = "".join(
+                chunk.format(index=index) for index in range(size // chunk.count("\n"))
+            )
+            lines = code.count("\n")
+            comments = len(extract(language, code)[0])
+            elapsed = measure(language, code)
+            print(f"{language:>10} {lines:>8} {comments:>9} ", end="")
+            print(f"{elapsed:>8.1f} {elapsed / lines * 1e3:>8.2f}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
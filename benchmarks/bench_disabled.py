@@ -0,0 +1,101 @@
+"""
+Benchmark for a debugger disabled with `SANI_DISABLE=1`.
+Checks that no heavy dependency is imported and compares a wrapped function with the
+same function without sani, and a `with debug(...)` block with a no-op context manager.
+
+Usage:
+    SANI_DISABLE=1 python benchmarks/bench_disabled.py
+"""
+
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SANI_DISABLE", "1")
+
+HEAVY_MODULES = (
+    "psutil",
+    "distro",
+    "dotenv",
+    "astor",
+    "pylint",
+    "flake8",
+    "sani.core.config",
+    "sani.core.channel",
+    "sani.debugger.linter",
+    "sani.debugger.debugger",
+)
+NUMBER = 1000000
+
+start = time.perf_counter()
+from sani.debugger import Debugger  # noqa: E402
+
+import_ms = (time.perf_counter() - start) * 1e3
+debug = Debugger(__name__, stdout="disabled.txt")
+
+
+def plain(value):
+    return value + 1
+
+
+@debug.wrap(mode="improve")
+def wrapped(value):
+    return value + 1
+
+
+class NoopContext:
+    """
+    Cheapest possible context manager, the floor for any `with` statement.
+    """
+
+    def __call__(self, mode=None):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+noop = NoopContext()
+
+
+def plain_block():
+    with noop(mode="improve"):
+        value = 1
+    return value
+
+
+def with_block():
+    with debug(mode="improve"):
+        value = 1
+    return value
+
+
+def per_call(statement: str) -> float:
+    """
+    Best average cost of statement in nanoseconds.
+    """
+    timings = timeit.repeat(statement, globals=globals(), number=NUMBER, repeat=5)
+    return min(timings) / NUMBER * 1e9
+
+
+def main():
+    loaded = [module for module in HEAVY_MODULES if module in sys.modules]
+    assert not loaded, f"Heavy modules imported by a disabled debugger: {loaded}"
+    assert not hasattr(wrapped, "__wrapped__"), "wrap must return the function itself"
+    print(f"import Debugger: {import_ms:.2f} ms")
+    print(f"{'case':>6} {'sani ns':>10} {'plain ns':>10} {'overhead ns':>12}")
+    for name, case, base in (
+        ("wrap", "wrapped(1)", "plain(1)"),
+        ("with", "with_block()", "plain_block()"),
+    ):
+        case_ns, base_ns = per_call(case), per_call(base)
+        print(f"{name:>6} {case_ns:>10.1f} {base_ns:>10.1f} {case_ns - base_ns:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
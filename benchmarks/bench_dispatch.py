@@ -0,0 +1,56 @@
+"""
+Benchmark for the latency `Debugger.dispatch` adds to the calling thread.
+Compares a synchronous `IoCommChannel.send` with `Dispatcher.put` for a context sized
+like a real one, then reports how long the dispatcher takes to drain the queue.
+
+Usage:
+    python benchmarks/bench_dispatch.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SANI_LOGLEVEL", "ERROR")
+
+from sani.core.channel import IoCommChannel  # noqa: E402
+from sani.core.dispatcher import Dispatcher  # noqa: E402
+
+NUMBER = 2000
+CONTEXT = {
+    "source": {"code": "x = 1\n" * 2000, "startline": 1, "endline": 10},
+    "prompt": {"mode": "improve", "subject": None, "referer": None},
+    "execution": {"status": "inprogress", "output": None},
+}
+
+
+def per_call(function) -> float:
+    """
+    Average cost of one call of function in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        function(CONTEXT)
+    return (time.perf_counter() - start) / NUMBER * 1e6
+
+
+def main():
+    stdout = tempfile.NamedTemporaryFile(suffix=".txt")
+    channel = IoCommChannel(stdout=stdout.name)
+    dispatcher = Dispatcher(channel, maxsize=NUMBER)
+
+    send = per_call(channel.send)
+    put = per_call(dispatcher.put)
+    start = time.perf_counter()
+    dispatcher.flush()
+    drain = (time.perf_counter() - start) * 1e3
+    dispatcher.close()
+    print(f"{'method':>16} {'us/call':>10}")
+    print(f"{'channel.send':>16} {send:>10.1f}")
+    print(f"{'dispatcher.put':>16} {put:>10.1f}")
+    print(f"queue drained {drain:.1f} ms after the last put")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for an error storm: the same error raised by many threads of a wrapped function.
+Feeds `Debugger.handle_exception` like `threading.excepthook` does and reports the cost of
+an occurrence with fingerprinting and with every occurrence going through the dispatch
+path, then checks the storm was dispatched once and its counters were attached to the
+context of the next error.
+
+Usage:
+    python benchmarks/bench_errors.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SANI_LOGLEVEL", "CRITICAL")
+
+from sani.debugger.debugger import Debugger  # noqa: E402
+
+NUMBER = 5000
+stdout = tempfile.NamedTemporaryFile(suffix=".txt")
+debug = Debugger(__name__, stdout=stdout.name)
+
+
+@debug.wrap(mode="fix")
+def work(value):
+    return 1 / value
+
+
+@debug.wrap(mode="fix")
+def last(value):
+    return [][value]
+
+
+def get_error(function=work) -> threading.ExceptHookArgs:
+    try:
+        function(0)
+    except Exception as error:
+        return threading.ExceptHookArgs(
+            (type(error), error, error.__traceback__, threading.current_thread())
+        )
+
+
+def per_error(errors) -> float:
+    """
+    Average cost of one error occurrence in microseconds.
+    """
+    start = time.perf_counter()
+    for error in errors:
+        Debugger.handle_exception(error)
+    return (time.perf_counter() - start) / len(errors) * 1e6
+
+
+def main():
+    errors = [get_error() for _ in range(NUMBER)]
+    fingerprinted = per_error(errors)
+    Debugger.error_fingerprints.limit = NUMBER * 2
+    unlimited = per_error(errors)
+    Debugger.error_fingerprints.limit = 1
+    # The counters are attached to the next dispatched context
+    Debugger.handle_exception(get_error(last))
+    Debugger.dispatcher.flush()
+    print(f"{'error path':>16} {'us/error':>10}")
+    print(f"{'fingerprinted':>16} {fingerprinted:>10.1f}")
+    print(f"{'unlimited':>16} {unlimited:>10.1f}")
+    with open(stdout.name) as file:
+        contexts = [json.loads(line) for line in file]
+    counts = [
+        count
+        for context in contexts
+        for count in context["execution"].get("error_counts", [])
+    ]
+    print(f"contexts dispatched: {len(contexts)}, error counters: {counts}")
+
+
+if __name__ == "__main__":
+    main()
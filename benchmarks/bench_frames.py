@@ -0,0 +1,54 @@
+"""
+Microbenchmark for caller frame resolution.
+Compares `inspect.stack()[-1]` with `FrameResolver.get_root_frame` at several stack depths.
+
+Usage:
+    python benchmarks/bench_frames.py
+"""
+import os
+import sys
+import timeit
+import inspect
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sani.core.frames import FrameResolver  # noqa: E402
+
+DEPTHS = (10, 100, 500)
+resolver = FrameResolver()
+
+
+def at_depth(depth: int, function):
+    """
+    Call function with `depth` extra frames on the stack.
+    """
+    if depth <= 0:
+        return function()
+    return at_depth(depth - 1, function)
+
+
+def measure(depth: int, function, number: int) -> float:
+    """
+    Average cost of one call of function at depth in microseconds.
+    """
+    total = timeit.timeit(lambda: at_depth(depth, function), number=number)
+    baseline = timeit.timeit(lambda: at_depth(depth, lambda: None), number=number)
+    return (total - baseline) / number * 1e6
+
+
+def main():
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max(DEPTHS) * 4))
+    # Both resolvers must agree on the caller frame.
+    expected = at_depth(50, lambda: inspect.stack()[-1])
+    actual = at_depth(50, resolver.get_root_frame)
+    assert (expected.filename, expected.lineno) == (actual.filename, actual.lineno)
+
+    print(f"{'depth':>6} {'inspect.stack (us)':>20} {'FrameResolver (us)':>20} {'speedup':>8}")
+    for depth in DEPTHS:
+        stack = measure(depth, lambda: inspect.stack()[-1], number=20)
+        walk = measure(depth, resolver.get_root_frame, number=2000)
+        print(f"{depth:>6} {stack:>20.1f} {walk:>20.2f} {stack / walk:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
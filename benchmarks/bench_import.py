@@ -0,0 +1,135 @@
+"""
+Import-time budget of `from sani.debugger import Debugger`.
+Runs the import in fresh interpreters with `python -X importtime`, checks that the modules
+loaded on first use only are not imported and that the cumulative import time of the sani
+modules stays within the budget.
+Without a budget in milliseconds, the import time is compared to the one of a baseline
+revision measured in alternation on the same machine, `SANI_IMPORT_BASELINE` or the first
+commit of the repository, and must stay under `BASELINE_RATIO` of it.
+
+Usage:
+    python benchmarks/bench_import.py [budget_ms]
+"""
+
+import io
+import os
+import sys
+import shutil
+import tarfile
+import tempfile
+import compileall
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATEMENT = "from sani.debugger import Debugger; Debugger"
+# The baseline does not export the debugger from its package
+BASELINE_STATEMENT = "from sani.debugger.debugger import Debugger; Debugger"
+BUDGET_MS = float(sys.argv[1]) if len(sys.argv) > 1 else None
+BASELINE_RATIO = 0.6
+RUNS = 7
+LAZY_MODULES = (
+    "asyncio",
+    "multiprocessing",
+    "subprocess",
+    "psutil",
+    "distro",
+    "dotenv",
+    "platformdirs",
+    "astor",
+    "tempfile",
+    "shutil",
+    "hashlib",
+    "pylint",
+    "flake8",
+)
+
+
+def run(*args: str, root: str = ROOT) -> subprocess.CompletedProcess:
+    environment = dict(os.environ, PYTHONPATH=root, SANI_DISABLE="0")
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=root,
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_ms(root: str = ROOT, statement: str = STATEMENT) -> float:
+    """
+    Cumulative import time of the top level sani imports in milliseconds.
+    """
+    output = run("-X", "importtime", "-c", statement, root=root).stderr
+    total_us = 0
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Top level imports are not indented, their time includes their dependencies
+        if name.startswith(" sani"):
+            total_us += int(cumulative)
+    return total_us / 1e3
+
+
+def get_baseline() -> str:
+    """
+    Extract the sani package of the baseline revision to a temporary directory.
+    """
+    revision = os.getenv("SANI_IMPORT_BASELINE")
+    if not revision:
+        revision = subprocess.run(
+            ["git", "rev-list", "--max-parents=0", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()[-1]
+    archive = subprocess.run(
+        ["git", "archive", revision, "sani"], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    directory = tempfile.mkdtemp(prefix="sani-baseline-")
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+    compileall.compile_dir(os.path.join(directory, "sani"), quiet=1)
+    return directory
+
+
+def median_ms(timings: list) -> float:
+    return sorted(timings)[len(timings) // 2]
+
+
+def main():
+    # Measure imports from bytecode even with PYTHONDONTWRITEBYTECODE set
+    compileall.compile_dir(os.path.join(ROOT, "sani"), quiet=1)
+    loaded = run(
+        "-c",
+        f"import sys; {STATEMENT}; "
+        f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+    ).stdout.split()
+    assert not loaded, f"Modules imported eagerly by sani.debugger: {loaded}"
+    if BUDGET_MS is not None:
+        timings = [import_ms() for _ in range(RUNS)]
+        budget = BUDGET_MS
+    else:
+        baseline = get_baseline()
+        try:
+            # Alternate the runs so machine load weighs on both the same
+            timings, baseline_timings = [], []
+            for _ in range(RUNS):
+                timings.append(import_ms())
+                baseline_timings.append(import_ms(baseline, BASELINE_STATEMENT))
+        finally:
+            shutil.rmtree(baseline, ignore_errors=True)
+        baseline_median = median_ms(baseline_timings)
+        budget = baseline_median * BASELINE_RATIO
+        print(f"import Debugger at baseline: median {baseline_median:.1f} ms")
+    median = median_ms(timings)
+    print(f"import Debugger: best {min(timings):.1f} ms, median {median:.1f} ms")
+    assert (
+        median <= budget
+    ), f"Import time {median:.1f} ms over the budget of {budget:.1f} ms"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark for `PythonParser.extract_attributes` on generated sources of 1k, 10k and 100k
+lines, with the tokenize pass and with the regex fallback used for sources that cannot
+be tokenized. The cost per line should stay flat as the source grows.
+
+Usage:
+    python benchmarks/bench_parser.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sani.debugger.parser import PythonParser  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+CHUNK = '''
+def function_{index}(value):
+    """
+    Docstring of function {index} with 'nested' "quotes".
+    """
+    # Comment of function {index}
+    text = "# not a comment" + \'\'\'"""\'\'\'  # trailing comment
+    return value * {index}
+
+'''
+parser = PythonParser()
+
+
+def get_source(lines: int) -> str:
+    """
+    Generate a source of about `lines` lines.
+    """
+    chunk_lines = CHUNK.count("\n")
+    return "".join(CHUNK.format(index=index) for index in range(lines // chunk_lines))
+
+
+def measure(source: str, repeat: int = 3) -> float:
+    """
+    Best time of `extract_attributes` on the source in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.extract_attributes(source)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    print(f"{'lines':>8} {'comments':>9} {'tokenize ms':>12} {'us/line':>8} ", end="")
+    print(f"{'fallback ms':>12} {'us/line':>8}")
+    for size in SIZES:
+        source = get_source(size)
+        lines = source.count("\n")
+        comments = len(parser.extract_attributes(source)[0])
+        tokenized = measure(source)
+        # An unclosed bracket at the end makes the source untokenizable
+        fallback = measure(source + "broken = (\n")
+        print(f"{lines:>8} {comments:>9} {tokenized:>12.1f} ", end="")
+        print(f"{tokenized / lines * 1e3:>8.2f} {fallback:>12.1f} ", end="")
+        print(f"{fallback / lines * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
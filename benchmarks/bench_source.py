@@ -0,0 +1,62 @@
+"""
+Memory of a loaded caller script.
+Loads generated python sources of 1k, 10k and 100k lines with `PythonScript.get_script`
+and reports the Python allocations it keeps, as a multiple of the source size, next to
+the former layout holding `lines`, `string`, `lined_string` and `lined_list`.
+
+Usage:
+    python benchmarks/bench_source.py
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sani.debugger.script import PythonScript  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000)
+CHUNK = (
+    'def function_{index}(value):\n    """Docstring."""\n    return value * {index}\n\n'
+)
+
+
+def former_layout(text: str) -> tuple:
+    lines = text.splitlines(keepends=True)
+    lined_list = [f"{index + 1} : {line}" for index, line in enumerate(lines)]
+    return lines, "".join(lines), "".join(lined_list), lined_list
+
+
+def retained(function, *args) -> int:
+    """
+    Bytes of Python allocations kept by the result of a call.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function(*args)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    utils = PythonScript()
+    print(f"{'lines':>8} {'source MB':>10} {'buffer x':>9} {'former x':>9}")
+    for size in SIZES:
+        text = "".join(CHUNK.format(index=index) for index in range(size // 4))
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+            file.write(text)
+        try:
+            buffer = retained(utils.get_script, file.name)
+            former = retained(former_layout, text)
+        finally:
+            os.unlink(file.name)
+        print(f"{size:>8} {len(text) / (1 << 20):>10.2f} ", end="")
+        print(f"{buffer / len(text):>9.2f} {former / len(text):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark for the streaming comment extraction of memory-mapped source files.
+Scans generated Go and Python files of several megabytes for sani directives, with
+`extract_attributes` on the read file and with `iter_comments` on a `MappedSource`, and
+reports the time and the peak of Python memory allocations of both. The peak of
+`iter_comments` should stay flat as the file grows.
+
+Usage:
+    python benchmarks/bench_stream.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sani.debugger.parser import Parser  # noqa: E402
+from sani.debugger.source import MappedSource  # noqa: E402
+
+SIZES = (1, 4, 8)
+CHUNKS = {
+    "go": '// Function {index}\nfunc f{index}() string {{\n\t/* "block" */\n\treturn "// not a comment" + `raw`\n}}\n\n',
+    "python": 'def function_{index}(value):\n    """Docstring of function {index}."""\n    # Comment of function {index}\n    return "# not a comment" * value\n\n\n',
+}
+DIRECTIVE = {"go": "// sani: fix\n", "python": "# sani: fix\n"}
+
+
+def get_file(language: str, megabytes: int) -> str:
+    """
+    Write a generated source of about `megabytes` MB with one directive at its end.
+    """
+    chunk = CHUNKS[language]
+    number = megabytes * (1 << 20) // len(chunk.format(index=0))
+    file = tempfile.NamedTemporaryFile("w", suffix=f".{language}", delete=False)
+    with file:
+        for index in range(number):
+            file.write(chunk.format(index=index))
+        file.write(DIRECTIVE[language])
+    return file.name
+
+
+def read_directives(language: str, filepath: str) -> list:
+    with open(filepath, encoding="utf-8") as code:
+        comments = Parser[language].value().extract_attributes(code)[0]
+    return [comment for comment in comments if "sani:" in comment.text]
+
+
+def stream_directives(language: str, filepath: str) -> list:
+    with MappedSource(filepath) as source:
+        return [
+            comment
+            for comment in Parser[language].value().iter_comments(source)
+            if "sani:" in comment.text
+        ]
+
+
+def measure(function, *args):
+    """
+    Time in seconds and peak of Python allocations in MB of a call.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1] / (1 << 20)
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    print(f"{'language':>8} {'MB':>4} {'read s':>8} {'read MB':>8} ", end="")
+    print(f"{'stream s':>9} {'stream MB':>10}")
+    for language in CHUNKS:
+        for size in SIZES:
+            filepath = get_file(language, size)
+            try:
+                read, read_time, read_peak = measure(
+                    read_directives, language, filepath
+                )
+                stream, stream_time, stream_peak = measure(
+                    stream_directives, language, filepath
+                )
+                assert read == stream, (read, stream)
+            finally:
+                os.unlink(filepath)
+            print(
+                f"{language:>8} {size:>4} {read_time:>8.2f} {read_peak:>8.1f} ", end=""
+            )
+            print(f"{stream_time:>9.2f} {stream_peak:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark for the per-call overhead of `Debugger.wrap`.
+Compares a wrapped function against the same unwrapped function after the first
+(registering) call.
+
+Usage:
+    python benchmarks/bench_wrap.py
+"""
+import os
+import sys
+import timeit
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SANI_LOGLEVEL", "ERROR")
+
+from sani.debugger.debugger import Debugger  # noqa: E402
+
+NUMBER = 200000
+stdout = tempfile.NamedTemporaryFile(suffix=".txt")
+debug = Debugger(name=__name__, stdout=stdout.name, linter="disable", attach_hook=False)
+
+
+def unwrapped(value):
+    return value + 1
+
+
+@debug.wrap(mode="improve")
+def wrapped_improve(value):
+    return value + 1
+
+
+@debug.wrap(mode="test")
+def wrapped_test(value):
+    return value + 1
+
+
+def main():
+    base = timeit.timeit(lambda: unwrapped(1), number=NUMBER) / NUMBER * 1e9
+    print(f"{'function':>16} {'ns/call':>10} {'overhead ns':>12}")
+    print(f"{'unwrapped':>16} {base:>10.0f} {0:>12.0f}")
+    for function in (wrapped_improve, wrapped_test):
+        function(1)  # registers the block and dispatches
+        cost = timeit.timeit(lambda: function(1), number=NUMBER) / NUMBER * 1e9
+        print(f"{function.__name__:>16} {cost:>10.0f} {cost - base:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -184,7 +184,8 @@ field.
 8. full source code: the complete source code with line numbers included. The 'code block' field is a subset of this field.\
   Also an array of objects. Each object has a line field and statement field.
 9. linter: the type of linter in use
-10. linter suggestions: All suggestions made by the linter. This is usually a multi-line text.
+10. linter suggestions: The suggestions made by the linter for the lines of the code block, one per line as \
+line:column: [code] severity: message.
 Ignore any fields outside of those specified above.
 Here's an example of what the input data could look like:
 {
@@ -197,13 +198,9 @@ Here's an example of what the input data could look like:
   full_traceback: None,
   error line: None,
   linter: pylint,
-  linter suggestions: ************* Module test
-    test.py:1:0: C0114: Missing module docstring (missing-module-docstring)
-    test.py:6:12: C0103: Argument name "a" doesn't conform to snake_case naming style (invalid-name)
-    test.py:6:15: C0103: Argument name "b" doesn't conform to snake_case naming style (invalid-name)
-    test.py:6:0: C0116: Missing function or method docstring (missing-function-docstring)
-    ------------------------------------------------------------------
-    Your code has been rated at 4.29/10 (previous run: 5.00/10, -0.71
+  linter suggestions: 6:0: [C0116] convention: Missing function or method docstring (missing-function-docstring)
+    6:12: [C0103] convention: Argument name "a" doesn't conform to snake_case naming style (invalid-name)
+    6:15: [C0103] convention: Argument name "b" doesn't conform to snake_case naming style (invalid-name)
 }
 
 To improve the code, use the instructions below as guidelines:
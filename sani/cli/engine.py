@@ -3,7 +3,6 @@ from sani.utils.custom_types import (
     Enums,
     Mode,
     Context,
-    script as script_type,
     ChatResponse,
     List,
     Dict,
@@ -20,11 +19,12 @@ from sani.bot.bots import (
 )
 from sani.core.run import ScriptRun
 from sani.core.config import Config
-from sani.debugger.script import Script, BaseScript
+from sani.debugger.script import Script, BaseScript, SourceScript
+from sani.core.store import SourceStore, DispatchLedger, get_workspace
 from termcolor import cprint
-from platformdirs import user_data_path
 
 import os
+from datetime import datetime
 from pathlib import Path
 import shutil
 
@@ -47,7 +47,9 @@ NEW_FILE_MODES = [
 from io import BytesIO, TextIOWrapper
 
 MODIFIED_SOURCE_LIST: List[str] = None
-PARSED_SOURCE: tuple[str, List[str], List[str], script_type] = None
+SOURCE_STORE: SourceStore = SourceStore()
+DISPATCH_LEDGER: DispatchLedger = DispatchLedger()
+PARSED_SOURCE: tuple[str, List[str], List[str], SourceScript] = None
 # import sys
 import difflib
 import json
@@ -62,14 +64,93 @@ import json
 #         print(message)
 
 
-def get_workspace():
-    app_name = config.app_name
-    app_author = config.app_author
-    app_version = config.app_version
-    workspace = user_data_path(app_name, app_author, app_version)
-    if not os.path.exists(workspace):
-        os.makedirs(workspace)
-    return workspace
+def resolve_source(message: dict) -> dict:
+    """
+    Fill the full source of a context from the source store.
+    Contexts only carry the content hash of the caller script; `code`, `lined_code`
+    and `source_list` are rebuilt here for the bots and the script sync.
+    """
+    source: dict = message.get(Context.source)
+    code: str = source.get(Context.code)
+    if code is None and source.get(Context.source_hash):
+        code = SOURCE_STORE.resolve(source.get(Context.source_hash))
+    if code is None:
+        # Source no longer in the store, fall back to the script on disk
+        with open(source.get(Context.source_path), "r", encoding="utf-8") as file:
+            code = file.read()
+    source_list: List[str] = code.splitlines(keepends=True)
+    source[Context.code.value] = code
+    source[Context.lined_code.value] = ("").join(
+        f"{line_number}:{line}" for line_number, line in enumerate(source_list, start=1)
+    )
+    source[Context.source_list.value] = source_list
+    return message
+
+
+def record_dispatch(message: dict, bot_response: str, block: str = None) -> None:
+    """
+    Record a handled context in the dispatch ledger, the debugger does not dispatch its
+    code block again while it is unchanged.
+    Parameters:
+        message (dict): Handled context.
+        bot_response (str): Response of the bot.
+        block (str): Code block rewritten by the cli-engine, recorded under its own key
+            so the next run of the rewritten script does not dispatch it again.
+    """
+    prompt: dict = message.get(Context.prompt)
+    key: str = prompt.get(Context.ledger_key)
+    if not key:
+        return
+    mode: str = prompt.get(Context.mode)
+    subject: str = prompt.get(Context.suggestions, {}).get(Context.subject)
+    keys: List[str] = [key]
+    if block is not None:
+        keys.append(DispatchLedger.get_key(mode, block, subject))
+    source: dict = message.get(Context.source)
+    entry: dict = {
+        Context.mode.value: mode,
+        Context.subject.value: subject,
+        Context.source_path.value: source.get(Context.source_path),
+        Context.startline.value: source.get(Context.startline),
+        Context.endline.value: source.get(Context.endline),
+        "response": bot_response,
+        "completed": datetime.now().isoformat(timespec="seconds"),
+    }
+    for key in dict.fromkeys(keys):
+        DISPATCH_LEDGER.record(key, entry)
+
+
+def get_rewritten_block(
+    block: str, startline: int, source_list: List[str], modified_source_list: List[str]
+) -> str:
+    """
+    Get a code block as the debugger reads it from the rewritten script.
+    The lines of the block are mapped through the diff of the script: kept lines keep
+    their form in the context e.g. omitted sani syntax lines, changed lines are taken from
+    the rewritten script and lines inserted after the last line belong to the block.
+    Parameters:
+        block (str): Code block of the context, one line per line of the script.
+        startline (int): Start line of the code block.
+        source_list (List[str]): Lines of the script before the rewrites.
+        modified_source_list (List[str]): Lines of the rewritten script.
+    """
+    block_lines: List[str] = block.splitlines(keepends=True)
+    start: int = startline - 1
+    end: int = start + len(block_lines)
+    lines: List[str] = []
+    matcher = difflib.SequenceMatcher(
+        None, source_list, modified_source_list, autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if (tag == "insert" and not start < i1 <= end) or (
+            tag != "insert" and (i2 <= start or i1 >= end)
+        ):
+            continue
+        if tag == "equal":
+            lines.extend(block_lines[max(i1, start) - start : min(i2, end) - start])
+        else:
+            lines.extend(modified_source_list[j1:j2])
+    return ("").join(lines)
 
 
 def backup(source_path: str, mode="create"):
@@ -97,11 +178,16 @@ def callback(message: dict):
     try:
         global PARSED_SOURCE
 
+        resolve_source(message)
         mode = message.get(Context.prompt).get(Context.mode)
         source_path = message.get(Context.source).get(Context.source_path)
         script_args = message.get(Context.execution).get(Context.args)
         source_list = message.get(Context.source).get(Context.source_list)
         command = message.get(Context.execution).get(Context.command)
+        # The fix loop replaces the block of the context with the whole script
+        block = message.get(Context.source).get(Context.block)
+        startline = message.get(Context.source).get(Context.startline)
+        original_source_list = source_list
         backup(source_path, mode="create")
         cnt = 0
         bot: BaseBot = DEFAULT_MODE_BOT.get(mode)
@@ -111,6 +197,7 @@ def callback(message: dict):
             raise Exception("Invalid Bot")
 
         bot_response: str = bot.dispatch(append_result=True)
+        success = True
 
         # Get response.. extract code block and parse replacement also creating a backup
         if mode in MUST_RUN_MODES:
@@ -182,6 +269,15 @@ def callback(message: dict):
                 output, _, success = script.check(command)
                 print_changes(diff, explanations, output)
                 cnt += 1
+        if success:
+            rewritten_block = (
+                get_rewritten_block(
+                    block, int(startline), original_source_list, MODIFIED_SOURCE_LIST
+                )
+                if mode in MUST_RUN_MODES and block and str(startline).isdigit()
+                else None
+            )
+            record_dispatch(message, bot_response, rewritten_block)
     except Exception as e:
         print("An Error occured:", e)
         backup(source_path, mode="restore")
@@ -193,7 +289,7 @@ def sync_script_with_json(
     source_list: List[str],
     source_path: str,
     parser: BaseScript,
-) -> tuple[str, List[str], List[str], script_type]:
+) -> tuple[str, List[str], List[str], SourceScript]:
     global MODIFIED_SOURCE_LIST
     print(bot_response)
 
@@ -210,7 +306,7 @@ def sync_script_with_json(
     b_mod_list = BytesIO(("").join(modified_source_list).encode("utf-8"))
     io_mod_source = TextIOWrapper(b_mod_list, encoding="utf-8")
     # try:
-    parsed_object: script_type = parser.get_attributes(io_mod_source)
+    parsed_object: SourceScript = parser.get_attributes(io_mod_source)
     # except IndentationError:
     #     # Use another parser
     #     pass
@@ -6,10 +6,11 @@ from sani.utils.custom_types import (
     ABC,
     io_object,
     Dict,
+    List,
 )
 import time
+import threading
 from json import dumps, loads
-import tempfile
 
 
 class BaseCommChannel(ABC):
@@ -43,6 +44,21 @@ class BaseCommChannel(ABC):
         """
         raise NotImplementedError()
 
+    def send_batch(self, messages: List[Dict] = None, *args, **kwargs):
+        """
+        Send several messages to the comm channel
+            Parameters:
+                messages (List): messages to be sent to the comm channel.
+        """
+        for message in messages or []:
+            self.send(message, *args, **kwargs)
+
+    def reopen(self, *args, **kwargs):
+        """
+        Reopen the comm channel handles in a forked child process
+        """
+        self.connect(*args, **kwargs)
+
     @abstractmethod
     def receive(self, *args, **kwargs):
         """
@@ -72,6 +88,7 @@ class IoCommChannel(BaseCommChannel):
 
         self.TextIOWrapper = TextIOWrapper
         self.sys = sys
+        self.lock = threading.Lock()
 
         super().__init__(*args, **kwargs)
         self.default_stdin = sys.stdin
@@ -93,12 +110,29 @@ class IoCommChannel(BaseCommChannel):
                 message (string): message to be sent to the comm channel.
         """
         message = dumps(message)
-        self.redirect(stdout=True)
-        if self.sys.stdout.writable():
-            print(message, flush=True)
-        self.redirect(stdout=False)
+        # Write to the channel stream directly instead of swapping `sys.stdout`,
+        # messages can be sent from dispatcher threads while the program keeps printing.
+        with self.lock:
+            if self.stdout[1].stream.writable():
+                print(message, file=self.stdout[1].stream, flush=True)
+
+    def send_batch(self, messages: List[Dict] = None):
+        """
+        Send several messages to the io comm channel with a single write
+            Parameters:
+                messages (List): messages to be sent to the comm channel.
+        """
+        if not messages:
+            return
+        payload = "".join(f"{dumps(message)}\n" for message in messages)
+        with self.lock:
+            if self.stdout[1].stream.writable():
+                self.stdout[1].stream.write(payload)
+                self.stdout[1].stream.flush()
 
     def connect(self):
+        import tempfile
+
         stdin = self.kwargs.get("stdin") or tempfile.NamedTemporaryFile()
         stdout = self.kwargs.get("stdout") or tempfile.NamedTemporaryFile()
         stderr = self.kwargs.get("stderr") or tempfile.NamedTemporaryFile()
@@ -106,15 +140,29 @@ class IoCommChannel(BaseCommChannel):
             stdin,
             self.get_io(stdin if isinstance(stdin, str) else stdin.name, mode="r"),
         )
+        # Append mode lets forked child processes write to the same stream safely
         self.stdout: Tuple[tempfile._TemporaryFileWrapper, io_object] = (
             stdout,
-            self.get_io(stdout if isinstance(stdout, str) else stdout.name),
+            self.get_io(
+                stdout if isinstance(stdout, str) else stdout.name,
+                mode="a",
+                truncate=True,
+            ),
         )
         self.stderr: Tuple[tempfile._TemporaryFileWrapper, io_object] = (
             stderr,
-            self.get_io(stdout if isinstance(stdout, str) else stdout.name),
+            self.get_io(stdout if isinstance(stdout, str) else stdout.name, mode="a"),
         )
 
+    def reopen(self):
+        """
+        Reopen the io streams in a forked child process
+        The child gets its own lock and file handles, messages of the parent are kept.
+        """
+        self.lock = threading.Lock()
+        self.stdout = (self.stdout[0], self.get_io(self.stdout[1].path, mode="a"))
+        self.stderr = (self.stderr[0], self.get_io(self.stderr[1].path, mode="a"))
+
     def close(self):
         self.stdin[1].stream.close()
         self.stdout[1].stream.close()
@@ -154,10 +202,12 @@ class IoCommChannel(BaseCommChannel):
         self.sys.stdout = self.stdout[1].stream if stdout else self.default_stdout
         self.sys.stderr = self.stderr[1].stream if stderr else self.default_stderr
 
-    def get_io(self, path: str, mode: str = "w") -> io_object:
+    def get_io(self, path: str, mode: str = "w", truncate: bool = False) -> io_object:
         """
         Get a Text input/output warpper object
         """
+        if truncate:
+            open(path, "w").close()
         io_stream: self.TextIOWrapper = open(
             path,
             mode,
@@ -1,11 +1,30 @@
 from dataclasses import dataclass, field
 from sani.core.ops import RuntimeInfo, Os, TerminalCommand, os
 from sani.utils.custom_types import Dict, Language, List, Mode
-from dotenv import load_dotenv
-import configparser
 from sani.debugger.linter import Linter
 
-load_dotenv()
+
+def has_dotenv() -> bool:
+    """
+    Check for a `.env` file where `load_dotenv` looks for it, the current directory or a
+    parent directory of this module, without importing `dotenv`.
+    """
+    paths = [os.getcwd(), os.path.dirname(os.path.abspath(__file__))]
+    for path in paths:
+        while True:
+            if os.path.isfile(os.path.join(path, ".env")):
+                return True
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+    return False
+
+
+if has_dotenv():
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 
 @dataclass
@@ -16,6 +35,22 @@ class Config:
     linter: str = os.getenv("SANI_LINTER", "pylint").lower()
     # linter_max_line_length: int = int(os.getenv("SANI_LINT_MAX_LENGHT", 120))
     channel: str = os.getenv("SANI_CHANNEL", "io").lower()
+    sampler: str = os.getenv("SANI_SAMPLER", "").lower() or None
+    sample_rate: float = float(os.getenv("SANI_SAMPLE_RATE", 0.1))
+    sample_limit: int = int(os.getenv("SANI_SAMPLE_LIMIT", 1))
+    dispatch_queue_size: int = int(os.getenv("SANI_DISPATCH_QUEUE_SIZE", 1024))
+    dispatch_overflow: str = os.getenv("SANI_DISPATCH_OVERFLOW", "drop_oldest").lower()
+    dispatch_timeout: float = float(os.getenv("SANI_DISPATCH_TIMEOUT", 1.0))
+    dispatch_batch_size: int = int(os.getenv("SANI_DISPATCH_BATCH_SIZE", 64))
+    lint_timeout: float = float(os.getenv("SANI_LINT_TIMEOUT", 10.0))
+    linter_timeout: float = float(os.getenv("SANI_LINTER_TIMEOUT", 30.0))
+    lint_daemon: bool = bool(int(os.getenv("SANI_LINT_DAEMON", "0")))
+    lint_daemon_idle: float = float(os.getenv("SANI_LINT_DAEMON_IDLE", 600.0))
+    forward_errors: bool = bool(int(os.getenv("SANI_FORWARD_ERRORS", "0")))
+    error_capacity: int = int(os.getenv("SANI_ERROR_CAPACITY", 1024))
+    error_window: float = float(os.getenv("SANI_ERROR_WINDOW", 60.0))
+    error_limit: int = int(os.getenv("SANI_ERROR_LIMIT", 1))
+    force_dispatch: bool = bool(int(os.getenv("SANI_FORCE_DISPATCH", "0")))
     log_level = os.getenv("SANI_LOGLEVEL", "DEBUG").upper()
     raise2logs: bool = os.getenv("SANI_RAISE2LOGS", True)
     openai_model_name: str = os.getenv("OPENAI_MODEL_NAME", "gpt-4")
@@ -131,7 +166,11 @@ class Config:
     )
     linter_language_map: Dict[Language, str] = field(
         default_factory=lambda: {
-            Language.python: [Linter.pylint.name, Linter.flake8.name],
+            Language.python: [
+                Linter.pylint.name,
+                Linter.flake8.name,
+                Linter.composite.name,
+            ],
             Language.javascript: [Linter.pyjslint.name],
             Language.html: [Linter.htmllint.name],
         }
@@ -0,0 +1,183 @@
+import types
+import atexit
+import threading
+from collections import deque
+from sani.utils.custom_types import Dict, List, Overflow, Enums
+from sani.utils.logger import get_logger
+from sani.core.channel import BaseCommChannel
+from sani.core.config import Config
+
+config = Config()
+logger = get_logger(__name__)
+
+
+class Dispatcher:
+    """
+    Background dispatcher sending contexts to a comm channel from a single thread.
+    Contexts are put on a bounded queue and sent in batches, so serialization and channel
+    I/O never run on the thread of the code being debugged.
+    When the queue is full the overflow policy decides what is lost:
+    * `drop_oldest` discards the oldest queued context.
+    * `drop_newest` discards the context being put.
+    * `block` waits up to `timeout` seconds for room, then discards the context being put.
+    Contexts can be completed right before they are sent with `prepare` e.g. with results
+    of background work, waiting for them on the dispatcher thread only.
+    The queue is flushed at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        channel: BaseCommChannel,
+        maxsize: int = None,
+        overflow: str = None,
+        timeout: float = None,
+        batch_size: int = None,
+        prepare: types.FunctionType = None,
+    ) -> None:
+        """
+        Parameters:
+            channel (BaseCommChannel): Channel the contexts are sent to.
+            maxsize (int): Maximum number of queued contexts. Default is `config.dispatch_queue_size`.
+            overflow (str): Overflow policy. Default is `config.dispatch_overflow`.
+            timeout (float): Seconds to wait for room with the `block` policy. Default is `config.dispatch_timeout`.
+            batch_size (int): Maximum number of contexts sent at once. Default is `config.dispatch_batch_size`.
+            prepare (Callable[[Dict], None]): Called with every context right before it is sent.
+        """
+        overflow = overflow or config.dispatch_overflow
+        if not Overflow.__dict__.get(Enums.values).get(overflow):
+            logger.warning(
+                f"`{overflow}` overflow policy not supported by DISPATCHER. Default policy `drop_oldest` selected."
+            )
+            overflow = Overflow.drop_oldest.value
+        self.channel: BaseCommChannel = channel
+        self.maxsize: int = max(1, maxsize or config.dispatch_queue_size)
+        self.overflow: str = overflow
+        self.timeout: float = config.dispatch_timeout if timeout is None else timeout
+        self.batch_size: int = max(1, batch_size or config.dispatch_batch_size)
+        self.prepare: types.FunctionType = prepare
+        self.dropped: int = 0
+        self.closed: bool = False
+        self.__queue: deque = deque()
+        self.__pending: int = 0  # Queued and in-flight contexts
+        self.__condition: threading.Condition = threading.Condition()
+        self.__thread: threading.Thread = None
+        atexit.register(self.close)
+
+    def put(self, message: Dict) -> bool:
+        """
+        Queue a context to be sent by the dispatcher thread.
+        Contexts put after the dispatcher is closed are sent synchronously.
+        Parameters:
+            message (Dict): Context for the cli-engine.
+        Returns:
+            False if the context was dropped by the overflow policy.
+        """
+        with self.__condition:
+            if not self.closed:
+                self.__start()
+                if len(self.__queue) >= self.maxsize and not self.__overflow():
+                    return False
+            # The dispatcher may have been closed while waiting for room
+            if not self.closed:
+                self.__queue.append(message)
+                self.__pending += 1
+                self.__condition.notify_all()
+                return True
+        self.__prepare(message)
+        self.channel.send(message)
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued context has been sent.
+        Returns:
+            False if the timeout expired first.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: not self.__pending, timeout)
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Flush the queue and stop the dispatcher thread.
+        """
+        with self.__condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.__condition.notify_all()
+        if self.__thread:
+            self.__thread.join(timeout)
+        if self.dropped:
+            logger.warning(
+                f"DISPATCHER dropped {self.dropped} context(s) with overflow policy `{self.overflow}`."
+            )
+
+    def after_fork(self) -> None:
+        """
+        Reset the dispatcher in a forked child process.
+        Contexts queued by the parent are left to the parent, and the dispatcher thread that
+        does not survive the fork is started again on the next put.
+        """
+        self.dropped = 0
+        self.__queue = deque()
+        self.__pending = 0
+        self.__condition = threading.Condition()
+        self.__thread = None
+
+    def __overflow(self) -> bool:
+        """
+        Apply the overflow policy on a full queue. Called with the condition held.
+        Returns:
+            True if there is room for the new context.
+        """
+        if self.overflow == Overflow.drop_oldest:
+            self.__queue.popleft()
+            self.__pending -= 1
+        elif self.overflow == Overflow.block and self.__condition.wait_for(
+            lambda: len(self.__queue) < self.maxsize or self.closed, self.timeout
+        ):
+            return True
+        self.dropped += 1
+        logger.debug(
+            f"DISPATCHER queue full::policy='{self.overflow}'::dropped={self.dropped}"
+        )
+        return self.overflow == Overflow.drop_oldest
+
+    def __prepare(self, message: Dict) -> None:
+        if not self.prepare:
+            return
+        try:
+            self.prepare(message)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error(f"DISPATCHER failed to prepare a context: {error}")
+
+    def __start(self) -> None:
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__thread = threading.Thread(
+                target=self.__run, name="sani-dispatcher", daemon=True
+            )
+            self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__queue or self.closed)
+                if not self.__queue:
+                    return
+                batch: List[Dict] = [
+                    self.__queue.popleft()
+                    for _ in range(min(self.batch_size, len(self.__queue)))
+                ]
+                # Wake producers blocked on a full queue
+                self.__condition.notify_all()
+            for message in batch:
+                self.__prepare(message)
+            try:
+                self.channel.send_batch(batch)
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error(
+                    f"DISPATCHER failed to send {len(batch)} context(s): {error}"
+                )
+            with self.__condition:
+                self.__pending -= len(batch)
+                self.__condition.notify_all()
@@ -0,0 +1,195 @@
+import os
+import time
+import threading
+import traceback
+from sani.utils.custom_types import Dict, List, Optional, Set, types, TYPE_CHECKING
+from sani.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection, Listener
+
+logger = get_logger(__name__)
+
+
+class ErrorForwarder:
+    """
+    Forward errors raised in worker processes to the debugger of the parent process.
+    The parent listens on a local socket (a named pipe on windows) and hands every error
+    event to a callback; workers started with `fork` or `spawn` find the listener through
+    the `SANI_FORWARD_ADDRESS` and `SANI_FORWARD_AUTHKEY` environment variables.
+    An error event is a compact dict: the pid and name of the worker process, the exception
+    type and message, the formatted traceback and the (filename, lineno) of its frames.
+    """
+
+    address_variable: str = "SANI_FORWARD_ADDRESS"
+    authkey_variable: str = "SANI_FORWARD_AUTHKEY"
+    # Connection of the current worker process to the parent listener
+    client: "Connection" = None
+    client_pid: int = None
+    client_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, callback: types.FunctionType) -> None:
+        """
+        Parameters:
+            callback (Callable[[Dict], None]): Called with every error event received.
+        """
+        self.callback: types.FunctionType = callback
+        self.listener: "Listener" = None
+        self.connections: Set["Connection"] = set()
+        self.receiving: int = 0
+        self.condition: threading.Condition = threading.Condition()
+
+    def start(self) -> None:
+        """
+        Start listening for error events and export the listener to worker processes.
+        """
+        import secrets
+        from multiprocessing.connection import Listener
+
+        authkey: bytes = secrets.token_bytes(16)
+        self.listener = Listener(authkey=authkey)
+        os.environ[self.address_variable] = self.listener.address
+        os.environ[self.authkey_variable] = authkey.hex()
+        threading.Thread(
+            target=self.__accept, name="sani-error-forwarder", daemon=True
+        ).start()
+        logger.debug(f"'FORWARDER' listening on address={self.listener.address}")
+
+    def close(self) -> None:
+        if self.listener:
+            self.listener.close()
+            self.listener = None
+
+    def __accept(self) -> None:
+        while self.listener:
+            try:
+                connection: "Connection" = self.listener.accept()
+            except (OSError, EOFError):
+                return
+            except Exception as error:  # pylint: disable=broad-except
+                # Failed authentication, keep serving the other workers
+                logger.debug(f"'FORWARDER' rejected a connection: {error}")
+                continue
+            with self.condition:
+                self.connections.add(connection)
+            threading.Thread(
+                target=self.__receive, args=(connection,), daemon=True
+            ).start()
+
+    def __receive(self, connection: "Connection") -> None:
+        try:
+            while True:
+                # Wait for an event before counting it as received, see `drain`
+                try:
+                    connection.poll(None)
+                except (OSError, EOFError):
+                    return
+                with self.condition:
+                    self.receiving += 1
+                try:
+                    event: Dict = connection.recv()
+                    self.callback(event)
+                except (OSError, EOFError):
+                    return
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.error(
+                        f"'FORWARDER' failed to handle an error event: {error}"
+                    )
+                finally:
+                    with self.condition:
+                        self.receiving -= 1
+                        self.condition.notify_all()
+        finally:
+            with self.condition:
+                self.connections.discard(connection)
+            connection.close()
+
+    def drain(self, timeout: float = 1.0) -> bool:
+        """
+        Wait until the events already sent by the workers are handled.
+        Parameters:
+            timeout (float): Maximum time to wait in seconds.
+        Returns:
+            True if every pending event was handled.
+        """
+        deadline: float = time.monotonic() + timeout
+        with self.condition:
+            while self.receiving or any(
+                self.__readable(connection) for connection in self.connections
+            ):
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(min(remaining, 0.01))
+        return True
+
+    @staticmethod
+    def __readable(connection: "Connection") -> bool:
+        try:
+            return connection.poll(0)
+        except (OSError, EOFError):
+            return False
+
+    @staticmethod
+    def get_address() -> Optional[str]:
+        """
+        Get the address of the parent listener if the current process is a forwarding worker.
+        """
+        return os.environ.get(ErrorForwarder.address_variable)
+
+    @staticmethod
+    def get_event(
+        exc_value: BaseException, exc_traceback: types.TracebackType = None
+    ) -> Dict:
+        """
+        Build the error event of an exception.
+        """
+        import multiprocessing
+
+        exc_traceback = exc_traceback or exc_value.__traceback__
+        frames: List[tuple] = [
+            (frame.f_code.co_filename, lineno)
+            for frame, lineno in traceback.walk_tb(exc_traceback)
+        ]
+        return {
+            "pid": os.getpid(),
+            "process": multiprocessing.current_process().name,
+            "exception_type": str(type(exc_value)),
+            "exception_message": str(exc_value),
+            "full_traceback": ("").join(traceback.format_tb(exc_traceback)),
+            "frames": frames,
+        }
+
+    @classmethod
+    def send(
+        cls, exc_value: BaseException, exc_traceback: types.TracebackType = None
+    ) -> bool:
+        """
+        Send the error event of an exception to the parent process.
+        Never raises, the worker's own error must not be hidden by a forwarding error.
+        Returns:
+            True if the event was sent.
+        """
+        address: str = cls.get_address()
+        # Errors re-raised through nested wrapped functions are forwarded once
+        if not address or getattr(exc_value, "__sani_forwarded__", False):
+            return False
+        try:
+            exc_value.__sani_forwarded__ = True
+            event: Dict = cls.get_event(exc_value, exc_traceback)
+            with cls.client_lock:
+                # A forked worker must not reuse the connection of its parent
+                if cls.client is None or cls.client_pid != os.getpid():
+                    from multiprocessing.connection import Client
+
+                    cls.client = Client(
+                        address,
+                        authkey=bytes.fromhex(os.environ[cls.authkey_variable]),
+                    )
+                    cls.client_pid = os.getpid()
+                cls.client.send(event)
+            return True
+        except Exception as error:  # pylint: disable=broad-except
+            cls.client = None
+            logger.debug(f"'FORWARDER' unable to forward error: {error}")
+            return False
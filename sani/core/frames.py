@@ -0,0 +1,66 @@
+import sys
+import threading
+from sani.utils.custom_types import types, frame_object
+
+
+class FrameResolver:
+    """
+    Resolve caller frames by walking `f_back` links from `sys._getframe`.
+    Unlike `inspect.stack`, no FrameInfo objects are built and no source
+    context lines are read, so the cost is a pointer walk per frame.
+    """
+
+    def get_frame(
+        self, depth: int = 0, thread: threading.Thread = None
+    ) -> types.FrameType:
+        """
+        Get the frame currently executing in a thread.
+        Parameters:
+            depth (int): Number of frames to skip from the top of the calling thread's stack.
+            thread (threading.Thread): Thread to read the frame from. Defaults to the calling thread.
+        Returns:
+            The frame object, or None if the thread is not running.
+        """
+        if thread is None or thread.ident == threading.get_ident():
+            return sys._getframe(depth + 1)
+        return sys._current_frames().get(thread.ident)
+
+    def get_root_frame(
+        self,
+        filename: str = None,
+        thread: threading.Thread = None,
+    ) -> frame_object:
+        """
+        Get the outermost frame of a thread's stack, the same frame as `inspect.stack()[-1]`.
+        Parameters:
+            filename (str): Only consider frames executing code from this file.
+                            Inside threads the outermost frame belongs to the threading
+                            bootstrap, so passing the caller's filename resolves the
+                            outermost frame of the caller script instead.
+            thread (threading.Thread): Thread to resolve. Defaults to the calling thread.
+        Returns:
+            A NamedTuple object of Type[Frame] ie.`NamedTuple("Frame",[("frame", FrameType),("filename", str),("lineno", int),("function", str)])`.
+            Falls back to the outermost frame if no frame matches `filename`.
+        """
+        frame = self.get_frame(1, thread)
+        root = match = None
+        while frame is not None:
+            root = frame
+            if filename is not None and frame.f_code.co_filename == filename:
+                match = frame
+            frame = frame.f_back
+        return self.get_frame_object(match or root)
+
+    @staticmethod
+    def get_frame_object(frame: types.FrameType) -> frame_object:
+        """
+        Get the filename, line number and function name of a frame without loading its source.
+        Parameters:
+            frame (FrameType): Frame object.
+        Returns:
+            A NamedTuple object of Type[Frame].
+        """
+        if frame is None:
+            return None
+        code: types.CodeType = frame.f_code
+        return frame_object(frame, code.co_filename, frame.f_lineno, code.co_name)
@@ -0,0 +1,578 @@
+import os
+import sys
+import time
+import threading
+from json import dumps, loads
+from collections import OrderedDict
+from sani.utils.custom_types import Dict, Optional, Tuple, TYPE_CHECKING
+from sani.utils.logger import get_logger
+from sani.core.config import Config
+from sani.core.store import ReportStore, get_workspace
+from sani.debugger.linter import BaseLinter, LintReport, Linter
+
+if TYPE_CHECKING:
+    import queue
+    import subprocess
+    from multiprocessing.connection import Connection
+
+config = Config()
+logger = get_logger(__name__)
+
+
+class LintWorker:
+    """
+    Lint a script in a background thread so the linter never delays the debugged program.
+    Reports are cached in a `ReportStore` by script content, linter and options: a cached
+    report is ready almost at once and an unchanged script is never linted again.
+    Reports are parsed to their records once ready, see `LintReport`.
+    """
+
+    def __init__(
+        self,
+        linter: BaseLinter,
+        store: ReportStore = None,
+        client: "LintClient" = None,
+    ) -> None:
+        """
+        Parameters:
+            linter (BaseLinter): Linter of the scripts.
+            store (ReportStore): Cache of the reports. Default is `lints` in the workspace.
+            client (LintClient): Client of the lint server linting the scripts.
+                Default is a client of the workspace server if `SANI_LINT_DAEMON=1`,
+                scripts are linted in process if the server is not available.
+        """
+        self.linter: BaseLinter = linter
+        self.store: ReportStore = store or ReportStore()
+        self.client: Optional[LintClient] = client or (
+            LintClient() if config.lint_daemon and LintServer.is_supported() else None
+        )
+        self.report: Optional[LintReport] = None
+        self.ready: threading.Event = threading.Event()
+        self.__thread: threading.Thread = None
+        self.__job: Optional[Tuple[str, str]] = None
+
+    def submit(self, filepath: str, source: str) -> None:
+        """
+        Lint a script in the background unless its report is cached.
+        Parameters:
+            filepath (str): Path of the script.
+            source (str): Source of the script, the key of its cached report.
+        """
+        self.__job = (filepath, source)
+        self.__thread = threading.Thread(
+            target=self.__run, args=(filepath, source), name="sani-linter", daemon=True
+        )
+        self.__thread.start()
+
+    def get_report(self, timeout: float = 0) -> Optional[LintReport]:
+        """
+        Get the report of the script.
+        Parameters:
+            timeout (float): Seconds to wait for a report still being linted.
+        Returns:
+            The report or None if it is not ready.
+        """
+        if timeout:
+            self.ready.wait(timeout)
+        return self.report
+
+    def after_fork(self) -> None:
+        """
+        Submit the script again in a forked child process if its report was still being
+        linted, the linting thread of the parent does not survive the fork.
+        """
+        if self.__job and not self.ready.is_set():
+            self.ready = threading.Event()
+            self.submit(*self.__job)
+
+    def __run(self, filepath: str, source: str) -> None:
+        try:
+            key: str = self.store.get_key(
+                source, self.linter.linter_name, filepath, self.linter.get_options()
+            )
+            report: Optional[str] = self.store.resolve(key)
+            if report is not None:
+                logger.debug(f"'LINT' cached report for filepath={filepath}")
+                self.__set_report(report)
+                return
+            if self.client:
+                report = self.client.lint(self.linter, filepath, key)
+            if report is None:
+                report = self.linter.get_report(filepath) or str()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error(f"'LINT' failed for filepath={filepath}: {error}")
+            report = str()
+        else:
+            self.store.write(key, report)
+        self.__set_report(report)
+        logger.debug(f"'LINT' report ready for filepath={filepath}")
+
+    def __set_report(self, report: str) -> None:
+        try:
+            self.report = self.linter.parse_report(report)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error(f"'LINT' unable to parse the report: {error}")
+            self.report = LintReport(text=report)
+        self.ready.set()
+
+
+class LintServer:
+    """
+    Long-lived local lint server shared by the debugger processes and the cli-engine.
+    The linters stay loaded between requests, so pylint keeps the modules parsed by astroid
+    and only re-parses the ones changed since (see `PyLinter.refresh`), and reports are kept
+    in memory by content hash so an unchanged script is never linted twice.
+    The server listens on a unix socket of the workspace, authenticated by a key only the
+    user can read; a single server runs per workspace and it exits once idle.
+    Requests are served concurrently, runs are serialized since linters are not thread-safe
+    and identical requests in flight are linted once.
+    Run it with `python -m sani.core.lint`, `LintClient` starts it on demand.
+    """
+
+    socket_name: str = "lint.sock"
+    authkey_name: str = "lint.key"
+    lock_name: str = "lint.lock"
+    max_reports: int = 256
+
+    def __init__(self, root: str = None, idle_timeout: float = None) -> None:
+        """
+        Parameters:
+            root (str): Directory of the socket, key and lock. Default is the workspace.
+            idle_timeout (float): Seconds without requests before the server exits.
+                Default is `SANI_LINT_DAEMON_IDLE`.
+        """
+        self.root: str = root or get_workspace()
+        self.idle_timeout: float = idle_timeout or config.lint_daemon_idle
+        self.linters: Dict[str, BaseLinter] = dict()
+        self.reports: "OrderedDict[str, str]" = OrderedDict()
+        self.linting: Dict[str, threading.Event] = dict()
+        self.active: int = 0
+        self.last_request: float = time.monotonic()
+        self.condition: threading.Condition = threading.Condition()
+        self.lint_lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        The server needs unix sockets and file locks, other platforms lint in process.
+        """
+        import socket
+
+        return hasattr(socket, "AF_UNIX") and os.name == "posix"
+
+    @classmethod
+    def get_paths(cls, root: str) -> Tuple[str, str, str]:
+        """
+        Get the paths of the socket, the authentication key and the lock of a server.
+        """
+        return tuple(
+            os.path.join(root, name)
+            for name in (cls.socket_name, cls.authkey_name, cls.lock_name)
+        )
+
+    @classmethod
+    def get_authkey(cls, root: str) -> bytes:
+        """
+        Get the authentication key of the server, created readable by the user only.
+        """
+        import secrets
+
+        path: str = cls.get_paths(root)[1]
+        if not os.path.exists(path):
+            # Write then link so concurrent processes agree on a complete key
+            temporary: str = f"{path}.{os.getpid()}"
+            descriptor: int = os.open(
+                temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(secrets.token_bytes(32))
+            try:
+                os.link(temporary, path)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(temporary)
+        with open(path, "rb") as file:
+            return file.read()
+
+    def serve(self) -> bool:
+        """
+        Serve lint requests until the server is idle for `idle_timeout` seconds.
+        Returns:
+            False if another server already serves the workspace.
+        """
+        import fcntl
+        from multiprocessing.connection import Listener
+
+        address, _, lock_path = self.get_paths(self.root)
+        lock_file = open(lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # The lock is held, a socket left behind is from a server that died
+        if os.path.exists(address):
+            os.unlink(address)
+        previous_umask: int = os.umask(0o077)
+        try:
+            listener = Listener(
+                address, family="AF_UNIX", authkey=self.get_authkey(self.root)
+            )
+        finally:
+            os.umask(previous_umask)
+        threading.Thread(
+            target=self.__watch_idle,
+            args=(address,),
+            name="sani-lint-idle",
+            daemon=True,
+        ).start()
+        logger.debug(f"'LINT SERVER' listening on address={address}")
+        while True:
+            try:
+                connection: "Connection" = listener.accept()
+            except (OSError, EOFError):
+                return True
+            except Exception as error:  # pylint: disable=broad-except
+                # Failed authentication, keep serving the other clients
+                logger.debug(f"'LINT SERVER' rejected a connection: {error}")
+                continue
+            threading.Thread(
+                target=self.__serve_client, args=(connection,), daemon=True
+            ).start()
+
+    def __watch_idle(self, address: str) -> None:
+        while True:
+            time.sleep(min(self.idle_timeout, 1.0))
+            with self.condition:
+                if (
+                    not self.active
+                    and time.monotonic() - self.last_request > self.idle_timeout
+                ):
+                    logger.debug("'LINT SERVER' idle, exiting")
+                    try:
+                        os.unlink(address)
+                    except OSError:
+                        # The socket was removed e.g. by a cleanup of the directory
+                        pass
+                    finally:
+                        # Closing the listener does not interrupt a blocked accept
+                        os._exit(0)
+
+    def __serve_client(self, connection: "Connection") -> None:
+        with connection:
+            while True:
+                try:
+                    request: Dict = connection.recv()
+                except (OSError, EOFError):
+                    return
+                with self.condition:
+                    self.active += 1
+                try:
+                    response: Dict = {"report": self.lint(**request)}
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.error(f"'LINT SERVER' failed request={request}: {error}")
+                    response = {"error": str(error)}
+                finally:
+                    with self.condition:
+                        self.active -= 1
+                        self.last_request = time.monotonic()
+                try:
+                    connection.send(response)
+                except (OSError, EOFError):
+                    return
+
+    def lint(self, linter: str, options: Dict, filepath: str, key: str) -> str:
+        """
+        Lint a script unless its report is in memory.
+        Parameters:
+            linter (str): Name of the linter.
+            options (Dict): Options of the linter, see `BaseLinter.get_options`.
+            filepath (str): Path of the script.
+            key (str): Key of the report, see `ReportStore.get_key`.
+        Returns:
+            The report of the script.
+        """
+        while True:
+            with self.condition:
+                if key in self.reports:
+                    self.reports.move_to_end(key)
+                    return self.reports[key]
+                linting: Optional[threading.Event] = self.linting.get(key)
+                if linting is None:
+                    self.linting[key] = threading.Event()
+                    break
+            # The same script is being linted for another client, wait for its report
+            linting.wait()
+        try:
+            with self.lint_lock:
+                report: str = self.get_linter(linter, options).get_report(filepath)
+            with self.condition:
+                self.reports[key] = report or str()
+                while len(self.reports) > self.max_reports:
+                    self.reports.popitem(last=False)
+            logger.debug(f"'LINT SERVER' linted filepath={filepath}")
+            return report or str()
+        finally:
+            with self.condition:
+                self.linting.pop(key).set()
+
+    def get_linter(self, name: str, options: Dict) -> BaseLinter:
+        """
+        Get the loaded linter of a name and options, creating it on first use.
+        """
+        key: str = dumps([name, options], sort_keys=True, default=str)
+        linter: Optional[BaseLinter] = self.linters.get(key)
+        if linter is None:
+            linter_class: Optional[type] = Linter[name].value
+            if not linter_class:
+                raise ValueError(f"Linter `{name}` is not supported by the server")
+            linter = linter_class(**options)
+            # A client with another version of the linter lints in process
+            if linter.get_options() != options:
+                raise ValueError(
+                    f"Linter `{name}` options {options} differ from the server's "
+                    f"{linter.get_options()}"
+                )
+            self.linters[key] = linter
+        return linter
+
+
+class LintClient:
+    """
+    Client of the workspace `LintServer`, starting the server if it is not running.
+    """
+
+    def __init__(self, root: str = None, start_timeout: float = 5.0) -> None:
+        """
+        Parameters:
+            root (str): Directory of the server. Default is the workspace.
+            start_timeout (float): Seconds to wait for a server started by the client.
+        """
+        self.root: str = root
+        self.start_timeout: float = start_timeout
+        self.connection: "Connection" = None
+        self.connection_pid: int = None
+        self.lock: threading.Lock = threading.Lock()
+
+    def lint(self, linter: BaseLinter, filepath: str, key: str) -> Optional[str]:
+        """
+        Lint a script with the server.
+        Parameters:
+            linter (BaseLinter): Linter of the script, loaded by the server.
+            filepath (str): Path of the script.
+            key (str): Key of the report, see `ReportStore.get_key`.
+        Returns:
+            The report or None if the server is not available.
+        """
+        request: Dict = {
+            "linter": linter.linter_name,
+            "options": linter.get_options(),
+            "filepath": os.path.abspath(filepath),
+            "key": key,
+        }
+        with self.lock:
+            try:
+                connection: Optional["Connection"] = self.__connect()
+                if connection is None:
+                    return None
+                connection.send(request)
+                response: Dict = connection.recv()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.debug(f"'LINT CLIENT' server unavailable: {error}")
+                self.close()
+                return None
+        if "error" in response:
+            logger.debug(f"'LINT CLIENT' server error: {response['error']}")
+            return None
+        return response["report"]
+
+    def close(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except OSError:
+                pass
+        self.connection = None
+
+    def __connect(self) -> Optional["Connection"]:
+        # A forked process must not share the connection of its parent
+        if self.connection is not None and self.connection_pid == os.getpid():
+            return self.connection
+        from multiprocessing.connection import Client
+
+        self.root = self.root or get_workspace()
+        address: str = LintServer.get_paths(self.root)[0]
+        authkey: bytes = LintServer.get_authkey(self.root)
+        deadline: float = time.monotonic() + self.start_timeout
+        started: bool = False
+        while True:
+            try:
+                self.connection = Client(address, family="AF_UNIX", authkey=authkey)
+                self.connection_pid = os.getpid()
+                return self.connection
+            except (FileNotFoundError, ConnectionRefusedError):
+                if not started:
+                    self.__start_server()
+                    started = True
+                elif time.monotonic() > deadline:
+                    return None
+                time.sleep(0.05)
+
+    def __start_server(self) -> None:
+        import subprocess
+
+        # The server runs sani from the same installation as the client
+        package_root: str = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        environment: Dict[str, str] = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            filter(None, (package_root, environment.get("PYTHONPATH")))
+        )
+        subprocess.Popen(
+            [sys.executable, "-m", "sani.core.lint", self.root],
+            env=environment,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        logger.debug(f"'LINT CLIENT' started the lint server of root={self.root}")
+
+
+class LinterProcess:
+    """
+    A linter loaded in a worker process of its own, so linters run in parallel and a linter
+    over its timeout is killed without stopping the others. The worker keeps its linter
+    loaded between reports and is started again after a timeout or a crash.
+    Requests and reports are json lines on the standard input and output of the worker.
+    """
+
+    def __init__(self, name: str, options: Dict = None) -> None:
+        """
+        Parameters:
+            name (str): Name of the linter, see `Linter`.
+            options (Dict): Options of the linter, see `BaseLinter.get_options`.
+        """
+        self.name: str = name
+        self.options: Dict = options or dict()
+        self.process: "subprocess.Popen" = None
+        self.responses: "queue.Queue" = None
+        self.lock: threading.Lock = threading.Lock()
+
+    def get_report(self, filepath: str, timeout: float = None) -> Optional[str]:
+        """
+        Get a report from the linter of the worker.
+        Parameters:
+            filepath (str): Path of the script.
+            timeout (float): Seconds to wait for the report, the worker is killed after.
+        Returns:
+            The report or None if the linter failed or timed out.
+        """
+        import queue
+
+        with self.lock:
+            try:
+                if self.process is None or self.process.poll() is not None:
+                    self.start()
+                self.process.stdin.write(dumps({"filepath": filepath}) + "\n")
+                self.process.stdin.flush()
+                response: Optional[Dict] = self.responses.get(timeout=timeout)
+            except queue.Empty:
+                logger.warning(
+                    f"'LINT' linter={self.name} timed out after {timeout}s on "
+                    f"filepath={filepath}"
+                )
+                self.close()
+                return None
+            except OSError as error:
+                logger.error(f"'LINT' linter={self.name} worker failed: {error}")
+                self.close()
+                return None
+        if response is None or "error" in response:
+            logger.error(
+                f"'LINT' linter={self.name} failed on filepath={filepath}: "
+                f"{response and response['error']}"
+            )
+            return None
+        return response["report"]
+
+    def start(self) -> None:
+        import queue
+        import subprocess
+
+        self.close()
+        package_root: str = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        environment: Dict[str, str] = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            filter(None, (package_root, environment.get("PYTHONPATH")))
+        )
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "from sani.core.lint import LinterProcess; LinterProcess.serve()",
+                self.name,
+                dumps(self.options),
+            ],
+            env=environment,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        # Responses are read by a thread so waiting for them can time out on any platform
+        self.responses = queue.Queue()
+        threading.Thread(
+            target=self.__read,
+            args=(self.process, self.responses),
+            name=f"sani-linter-{self.name}",
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def __read(process: "subprocess.Popen", responses: "queue.Queue") -> None:
+        for line in process.stdout:
+            responses.put(loads(line))
+        responses.put(None)  # The worker exited
+
+    def close(self) -> None:
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.wait()
+            for stream in (self.process.stdin, self.process.stdout):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+        self.process = None
+
+    @staticmethod
+    def serve() -> None:
+        """
+        Serve the reports of a linter until the standard input is closed, run by the worker.
+        The name and options of the linter are the arguments of the worker.
+        """
+        # Linters print to the standard output, keep it for the reports only
+        reports = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+        devnull: int = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        linter: BaseLinter = Linter[sys.argv[1]].value(**loads(sys.argv[2]))
+        for line in sys.stdin:
+            request: Dict = loads(line)
+            try:
+                response: Dict = {
+                    "report": linter.get_report(request["filepath"]) or str()
+                }
+            except Exception as error:  # pylint: disable=broad-except
+                response = {"error": str(error)}
+            reports.write(dumps(response) + "\n")
+            reports.flush()
+
+
+if __name__ == "__main__":
+    LintServer(sys.argv[1] if len(sys.argv) > 1 else None).serve()
@@ -1,15 +1,42 @@
-import psutil  # https://psutil.readthedocs.io/en/latest/
-from sani.utils.custom_types import List, Tuple, types, Enum, Os
+from sani.utils.custom_types import (
+    List,
+    Tuple,
+    types,
+    Enum,
+    Os,
+    frame_object,
+    TYPE_CHECKING,
+)
+from sani.core.frames import FrameResolver
+import importlib
 import inspect
+import threading
 import time
 import sys
 import os
-import subprocess
-import distro
+
+if TYPE_CHECKING:
+    import psutil
 
 # import platform  # https://docs.python.org/3/library/platform.html
 # import resource  # https://docs.python.org/3/library/resource.html
 
+# Modules only needed by some utilities, imported on first use
+LAZY_MODULES: Tuple[str, ...] = (
+    "psutil",  # https://psutil.readthedocs.io/en/latest/
+    "distro",
+    "subprocess",
+)
+
+
+def __getattr__(name: str) -> types.ModuleType:
+    # `sani.core.ops.psutil` and the other lazy modules are imported on first access
+    if name in LAZY_MODULES:
+        module: types.ModuleType = importlib.import_module(name)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class OsProcess:
     """
@@ -20,16 +47,19 @@ class OsProcess:
         """
         Checks if a process is still alive
         """
+        import psutil
+
         try:
             while self.get_process(process_id):
                 time.sleep(1)
         except psutil.NoSuchProcess:
             return False
 
-    def get_process(self, process_id: int) -> psutil.Process:
+    def get_process(self, process_id: int) -> "psutil.Process":
         """
         Get process object of a process
         """
+        import psutil
 
         return psutil.Process(process_id)
 
@@ -45,6 +75,8 @@ class OsProcess:
         """
         Get process id of a process by its name
         """
+        import subprocess
+
         try:
             output = b""
             if os == Os.windows32 or os == Os.windows64:
@@ -95,7 +127,17 @@ class RuntimeInfo:
 
     def __init__(self) -> None:
         self.os = self.__get_os()
-        self.distro = self.__get_distro()
+        self.__distro: Tuple[str, str, str] = None
+        self.frame_resolver = FrameResolver()
+
+    @property
+    def distro(self) -> Tuple[str, str, str]:
+        """
+        The current linux distribution, detected on first access
+        """
+        if self.__distro is None:
+            self.__distro = self.__get_distro()
+        return self.__distro
 
     def __get_os(self) -> str:
         """
@@ -107,6 +149,8 @@ class RuntimeInfo:
         """
         Get the current linux distribution
         """
+        import distro
+
         return distro.linux_distribution()
 
     def get_stack(self) -> List[inspect.FrameInfo]:
@@ -127,12 +171,16 @@ class RuntimeInfo:
         """
         return inspect.getmembers(module)
 
-    def get_stack_caller_frame(self) -> inspect.FrameInfo:
+    def get_stack_caller_frame(
+        self, filename: str = None, thread: threading.Thread = None
+    ) -> frame_object:
         """
-        Get the caller frame of the current process
+        Get the caller frame of the current process (the outermost frame of the stack)
+        Parameters:
+            filename (str): Resolve the outermost frame executing code from this file.
+            thread (threading.Thread): Thread to resolve. Defaults to the calling thread.
         """
-        caller_stack = self.get_stack()[-1]
-        return caller_stack
+        return self.frame_resolver.get_root_frame(filename, thread)
 
     def get_module(self, module):
         """
@@ -0,0 +1,193 @@
+import os
+from json import dumps, loads
+from sani.utils.custom_types import Dict, List, Optional, Set
+from sani.utils.utils import get_content_hash
+from sani.utils.logger import get_logger
+from sani.core.config import Config
+
+config = Config()
+logger = get_logger(__name__)
+
+
+def get_workspace() -> str:
+    """
+    Get the data directory of the application, creating it if needed.
+    """
+    from platformdirs import user_data_path
+
+    workspace = user_data_path(config.app_name, config.app_author, config.app_version)
+    if not os.path.exists(workspace):
+        os.makedirs(workspace)
+    return workspace
+
+
+class SourceStore:
+    """
+    Content-addressed store of source scripts shared by the debugger and the cli-engine.
+    Each version of a source is written once under its content hash, so contexts only carry
+    the hash and the code block instead of copies of the whole script.
+    """
+
+    store_name: str = "sources"
+
+    def __init__(self, root: str = None) -> None:
+        """
+        Parameters:
+            root (str): Directory of the store. Default is `sources` in the workspace.
+        """
+        self.root: str = root
+        self.published: Set[str] = set()
+
+    def get_root(self) -> str:
+        if not self.root:
+            self.root = os.path.join(get_workspace(), self.store_name)
+        return self.root
+
+    def get_path(self, source_hash: str) -> str:
+        """
+        Get the path of a source in the store.
+        """
+        return os.path.join(self.get_root(), source_hash[:2], source_hash)
+
+    def publish(self, source: str) -> Optional[str]:
+        """
+        Write a source to the store if it is not there yet.
+        Parameters:
+            source (str): Source script.
+        Returns:
+            The content hash of the source or None if the store is not writable.
+        """
+        source_hash: str = get_content_hash(source)
+        if source_hash in self.published:
+            return source_hash
+        if not self.write(source_hash, source):
+            return None
+        self.published.add(source_hash)
+        return source_hash
+
+    def write(self, key: str, content: str, replace: bool = False) -> bool:
+        """
+        Write a content to the store under a key if it is not there yet.
+        Parameters:
+            replace (bool): Replace the content already under the key.
+        Returns:
+            False if the store is not writable.
+        """
+        import tempfile
+
+        path: str = self.get_path(key)
+        try:
+            if replace or not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so readers never see a partial content
+                descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                    file.write(content)
+                os.replace(temporary, path)
+        except OSError as error:
+            logger.warning(f"Unable to write to the store `{path}`: {error}")
+            return False
+        return True
+
+    def resolve(self, source_hash: str) -> Optional[str]:
+        """
+        Read a source from the store.
+        Parameters:
+            source_hash (str): Content hash of the source.
+        Returns:
+            The source or None if it is not in the store.
+        """
+        try:
+            with open(self.get_path(source_hash), "r", encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+
+class ReportStore(SourceStore):
+    """
+    Store of linter reports keyed by the linted content and the linter configuration,
+    an unchanged script is never linted twice with the same linter and options.
+    """
+
+    store_name: str = "lints"
+
+    @staticmethod
+    def get_key(source: str, linter: str, filepath: str, options: Dict = None) -> str:
+        """
+        Get the key of a linter report.
+        Parameters:
+            source (str): Linted source script.
+            linter (str): Name of the linter.
+            filepath (str): Path of the script, reports refer to it.
+            options (Dict): Options of the linter changing its report.
+        """
+        return get_content_hash(
+            dumps(
+                [get_content_hash(source), linter, filepath, options or {}],
+                sort_keys=True,
+                default=str,
+            )
+        )
+
+
+class DispatchLedger(SourceStore):
+    """
+    Ledger of the completed dispatches of code blocks, shared by the debugger and the
+    cli-engine. The cli-engine records a block with the bot response once it is handled and
+    the debugger does not dispatch the block again in the same mode while it is unchanged.
+    Blocks are keyed by mode, intended action and normalized content, so blank lines,
+    trailing whitespace and indentation changes do not make a block new.
+    """
+
+    store_name: str = "ledger"
+
+    @staticmethod
+    def normalize(block: str) -> str:
+        """
+        Normalize a code block, dropping blank lines, trailing whitespace and indentation.
+        """
+        import textwrap
+
+        lines: List[str] = [
+            line.rstrip() for line in textwrap.dedent(block or str()).splitlines()
+        ]
+        return "\n".join(line for line in lines if line)
+
+    @classmethod
+    def get_key(cls, mode: str, block: str, subject: str = None) -> str:
+        """
+        Get the key of a code block in the ledger.
+        Parameters:
+            mode (str): Mode of the dispatch.
+            block (str): Code block.
+            subject (str): Intended action of the code block.
+        """
+        return get_content_hash(
+            dumps([str(mode), get_content_hash(cls.normalize(block)), subject])
+        )
+
+    def record(self, key: str, entry: Dict) -> bool:
+        """
+        Record a completed dispatch, replacing the previous one of the key.
+        Parameters:
+            key (str): Key of the code block, see `get_key`.
+            entry (Dict): Result of the dispatch e.g. the bot response.
+        Returns:
+            False if the ledger is not writable.
+        """
+        return self.write(key, dumps(entry, default=str), replace=True)
+
+    def get_entry(self, key: str) -> Optional[Dict]:
+        """
+        Get the completed dispatch of a key.
+        Returns:
+            The recorded entry or None if the code block was not dispatched or is unreadable.
+        """
+        entry: Optional[str] = self.resolve(key)
+        if entry is None:
+            return None
+        try:
+            return loads(entry)
+        except ValueError:
+            return None
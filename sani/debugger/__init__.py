@@ -1 +1,12 @@
-# from sani.debugger.debugger import Debugger
+from sani.debugger.null import NullDebugger, is_disabled
+
+
+def __getattr__(name: str):
+    # Resolve `Debugger` on first access so a disabled debugger never loads its dependencies
+    if name == "Debugger":
+        if is_disabled():
+            return NullDebugger
+        from sani.debugger.debugger import Debugger
+
+        return Debugger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
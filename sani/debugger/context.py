@@ -0,0 +1,54 @@
+import threading
+from sani.utils.custom_types import Dict, Optional, Context, types
+
+
+class LazyContext:
+    """
+    Context of a code block that is only built when it is dispatched.
+    Blocks of modes dispatched on error or at exit mostly never fail, so registering them
+    records the block coordinates and a builder instead of the full context.
+    Changes to the `source` section made before the context is built are kept in `source`
+    and applied on top of the built context.
+    The context is built once even when several threads dispatch the block at once.
+    """
+
+    __slots__ = ("startline", "endline", "builder", "source", "context", "lock")
+
+    def __init__(
+        self, startline: int, endline: int, builder: types.FunctionType
+    ) -> None:
+        """
+        Parameters:
+            startline (int): Start line of the code block.
+            endline (int): End line of the code block.
+            builder (Callable[[], Dict]): Builds the context, returns None for an invalid block.
+        """
+        self.startline: int = startline
+        self.endline: int = endline
+        self.builder: types.FunctionType = builder
+        self.source: Dict = dict()
+        self.context: Optional[Dict] = None
+        self.lock: threading.Lock = threading.Lock()
+
+    def copy(self) -> "LazyContext":
+        """
+        Get an unbuilt copy sharing the builder.
+        """
+        return LazyContext(self.startline, self.endline, self.builder)
+
+    def materialize(self) -> Optional[Dict]:
+        """
+        Build the context once.
+        Returns:
+            The context or None if the block is invalid.
+        """
+        if self.builder is None:
+            return self.context
+        with self.lock:
+            # Callers waiting on the lock get the context built by the first one
+            if self.builder is not None:
+                context: Optional[Dict] = self.builder()
+                if context and self.source:
+                    context[Context.source.value].update(self.source)
+                self.context, self.builder = context, None
+        return self.context
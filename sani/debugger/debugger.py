@@ -1,31 +1,46 @@
-import re
+import gc
 import atexit
-import asyncio
 import threading
 import traceback
-import multiprocessing
-from functools import wraps
+from functools import wraps, partial
 from sani.utils.custom_types import (
     Dict,
     List,
     Any,
     Tuple,
+    Union,
+    Optional,
     types,
     block_object,
-    script,
+    frame_object,
+    preload_object,
     Code,
     Context,
     Enums,
+    TYPE_CHECKING,
 )
 from sani.utils.utils import Object
 from sani.core.config import Config, Mode, Language
 from sani.utils.logger import get_logger
-from sani.debugger.linter import Linter, BaseLinter
+from sani.debugger.linter import Linter, BaseLinter, LintReport
 from sani.core.channel import Channel, BaseCommChannel
-from sani.debugger.script import Script, BaseScript, ast
+from sani.core.dispatcher import Dispatcher
+from sani.core.store import SourceStore, DispatchLedger
+from sani.core.forward import ErrorForwarder
+from sani.core.lint import LintWorker
+from sani.debugger.fingerprint import ErrorFingerprints
+from sani.debugger.script import Script, BaseScript, SourceScript
+from sani.debugger.symbols import SymbolIndex
+from sani.debugger.registry import BlockRegistry
+from sani.debugger.sampling import Sampler, BaseSampler
+from sani.debugger.context import LazyContext
+from sani.debugger.null import NullDebugger
 from sani.core.ops import OsProcess, RuntimeInfo, inspect, os, sys
 from sani.utils.exception import CallerNotFoundError
 
+if TYPE_CHECKING:
+    import multiprocessing
+
 config = Config()
 logger = get_logger(__name__)
 
@@ -42,13 +57,32 @@ class Debugger(Object):
     disable: bool = config.disable
     runtime_info: RuntimeInfo = RuntimeInfo()
     process_utils: OsProcess = OsProcess()
-    watch_logs: Dict = dict()
+    watch_logs: BlockRegistry = BlockRegistry()
+    samplers: Dict[str, BaseSampler] = dict()
+    pending_dispatches: set = set()
+    source_store: SourceStore = SourceStore()
+    # Code blocks already handled by the cli-engine, not dispatched again unless forced
+    dispatch_ledger: DispatchLedger = DispatchLedger()
+    force_dispatch: bool = config.force_dispatch
+    # Errors of worker processes: the parent aggregates them, workers only forward them
+    error_forwarder: ErrorForwarder = None
+    forward_only: bool = False
+    worker_errors: Dict[int, Dict] = dict()
+    worker_errors_lock: threading.Lock = threading.Lock()
+    worker_blocks: List[Tuple[int, int, types.FunctionType]] = []
+    # Errors raised by threads, repeated occurrences are counted instead of dispatched
+    error_fingerprints: ErrorFingerprints = ErrorFingerprints()
+    # Parsed, indexed and linted caller scripts, inherited by forked processes
+    preloaded: Dict[Tuple[str, str, str], preload_object] = dict()
+    lint_worker: LintWorker = None
+    fork_hooks: bool = False
     instant_modes: List[Mode] = config.instant_modes
     atexit_modes: List[Mode] = config.atexit_modes
     on_error_modes: List[Mode] = config.on_error_modes
     skip_errors: List[str] = config.skip_errors
     redirect_on_error: Dict[Mode, Mode] = config.redirect_on_error_mode
     redirect_atexit: Dict[Mode, Mode] = config.redirect_atexit_mode
+    __caller_filename: str = None
 
     def __new__(
         cls,
@@ -61,6 +95,8 @@ class Debugger(Object):
         run_as_main: bool = True,
         script_args: List[str] = [],
         command: List[str] = [],
+        forward_errors: bool = None,
+        force_dispatch: bool = None,
         *args,
         **kwargs,
     ):
@@ -75,6 +111,8 @@ class Debugger(Object):
             language: str     -> Language of the script
             run_as_main: bool -> Run as main script
             script_args: List[str] -> Arguments to pass to the script
+            forward_errors: bool -> Aggregate errors raised by worker processes. Default is `config.forward_errors`.
+            force_dispatch: bool -> Dispatch the instant modes of code blocks unchanged since the cli-engine handled them. Default is `config.force_dispatch`.
             args             -> Positional arguments
             kwargs           -> Keyword arguments
         Returns
@@ -83,12 +121,20 @@ class Debugger(Object):
                 For flake8 linter: line lengths are recommended to be no greater than 79 characters. The reasoning for this comes from PEP8 itself:
                 Limiting the required editor window width makes it possible to have several files open side-by-side, and works well when using code review tools that present the two versions in adjacent columns.
                 You would have to sepcify a max_line_length as **kwargs if selecting the flake8 linter.
+        Note:
+                For composite linter: pylint and flake8 run in parallel and their findings are merged. The following kwargs are supported:
+                    linters (List[str]): Linters to run. Default is pylint and flake8.
+                    timeout (float): Seconds a linter may take before it is skipped. Default is `config.linter_timeout`.
         Note:
                 For io communication channel: The following kwargs are supported:
                     stderr (string): The path to the log file which stderr would be redirected to.
                     stdin (string): The path to the log file which stdin would be redirected to.
                     stdout (string): The path to the log file which stdout would be redirected to.
+        Returns a `NullDebugger` when sani is disabled with `SANI_DISABLE`.
         """
+        if config.disable:
+            # Decorators and context managers of a disabled debugger vanish
+            return NullDebugger()
         cls.run_as_main: bool = run_as_main
         cls.attach_hook: bool = attach_hook
         cls.language = language
@@ -123,9 +169,16 @@ class Debugger(Object):
             )
         if run_as_main:
             if name != "__main__":
-                logger.error(
-                    f"DEBUGGER can only be used in `__main__` module. DEBUGGER has been `DISABLED` in `{name}` module."
-                )
+                if name == "__mp_main__" and ErrorForwarder.get_address():
+                    # Main module re-imported by a spawned worker process
+                    cls.forward_only = True
+                    logger.debug(
+                        f"DEBUGGER is forwarding errors of `{name}` module to the parent process."
+                    )
+                else:
+                    logger.error(
+                        f"DEBUGGER can only be used in `__main__` module. DEBUGGER has been `DISABLED` in `{name}` module."
+                    )
                 cls.disable = True
             elif (
                 name == "__main__"
@@ -134,6 +187,8 @@ class Debugger(Object):
             ):
                 cls.disable = False
 
+        if force_dispatch is not None:
+            cls.force_dispatch = force_dispatch
         if not cls.disable:
             logger.debug("DEBUGGER=`ENABLED`")
             logger.info(
@@ -145,7 +200,19 @@ class Debugger(Object):
             channel: Channel = Channel.__dict__.get(Enums.members).get(
                 channel or config.channel
             )
-            cls.channel: BaseCommChannel = channel.value(*args, **kwargs)
+            if isinstance(getattr(cls, "channel", None), channel.value) and (
+                cls.channel.args,
+                cls.channel.kwargs,
+            ) == (args, kwargs):
+                # Keep the open channel e.g. inherited by a forked process, reconnecting would truncate it
+                logger.debug(f"'CHANNEL' reused channel=`{channel.name}`")
+            else:
+                cls.channel: BaseCommChannel = channel.value(*args, **kwargs)
+                if getattr(cls, "dispatcher", None):
+                    cls.dispatcher.close()
+                cls.dispatcher: Dispatcher = Dispatcher(
+                    cls.channel, prepare=cls.__attach_lint_suggestions
+                )
             linter: Linter = Linter.__dict__.get(Enums.members).get(
                 linter or config.linter
             )
@@ -154,9 +221,8 @@ class Debugger(Object):
             )
 
             if not caller and language == Language.python:
-                cls.__caller_module = cls.runtime_info.get_module(
-                    cls.runtime_info.get_stack()[-1][0]
-                )
+                caller_frame: frame_object = cls.runtime_info.get_stack_caller_frame()
+                cls.__caller_module = cls.runtime_info.get_module(caller_frame.frame)
                 if not cls.__caller_module:
                     logger.error(
                         "Caller module is required for python language. DEBUGGER has been `DISABLED`."
@@ -165,9 +231,7 @@ class Debugger(Object):
                     raise CallerNotFoundError(
                         "Caller module is required for python language."
                     )
-                cls.__caller_filename: str = (
-                    cls.runtime_info.get_stack_caller_frame().filename
-                )
+                cls.__caller_filename: str = caller_frame.filename
                 cls.__caller_filepath: str = os.path.dirname(
                     cls.__caller_module.__file__
                 )
@@ -182,27 +246,27 @@ class Debugger(Object):
                 )
             else:
                 cls.__caller: str = caller
-            if language == Language.python:
-                cls.__caller_source: script = cls.script_utils.get_script(cls.__caller)
-                cls.__script: script = cls.script_utils.get_attributes(
-                    cls.__caller_source.string
-                )
-                cls.caller_comments = cls.__script.comments
-            else:
-                with open(cls.__caller, "r", encoding="utf-8") as code:
-                    cls.__caller_source: script = cls.script_utils.get_attributes(code)
-                cls.caller_comments = cls.__caller_source.comments
+            cls.__load_caller(language, linter.name)
             cls.__caller_pid: int = cls.process_utils.get_pid_of_current_process()
-            cls.__source_lines: List[str] = cls.__caller_source.lines.copy()
+            # End syntax lines replaced by a placeholder, by line number
+            cls.__replaced_lines: Dict[int, str] = dict()
 
             cls.name = name or os.path.basename(cls.__caller)
-            cls.lint_suggestions: str = str()
-
-            if cls.linter:
-                cls.lint_suggestions: str = cls.linter.get_report(cls.__caller)
+            if hasattr(os, "register_at_fork") and not cls.fork_hooks:
+                os.register_at_fork(
+                    before=cls.before_fork, after_in_child=cls.after_fork_in_child
+                )
+                cls.fork_hooks = True
             if cls.attach_hook:
                 sys.excepthook = threading.excepthook = cls.handle_exception
                 atexit.register(cls.exit_handler)
+            if (
+                config.forward_errors if forward_errors is None else forward_errors
+            ) and not cls.error_forwarder:
+                cls.error_forwarder = ErrorForwarder(cls.handle_worker_error)
+                cls.error_forwarder.start()
+                if hasattr(os, "register_at_fork"):
+                    os.register_at_fork(after_in_child=cls.forward_worker_errors)
         else:
             logger.debug("DEBUGGER=`DISABLED`")
         if not hasattr(cls, "instance"):
@@ -222,6 +286,201 @@ class Debugger(Object):
             )
         return cls.instance
 
+    @classmethod
+    def __load_caller(cls, language: str, linter: str) -> None:
+        """
+        Read, parse and lint the caller script.
+        The results are kept per caller script and reused while the script is unchanged, so
+        processes forked from an initialized debugger never load the script again.
+            Parameters:
+                language (str): Language of the caller script.
+                linter (str): Name of the linter.
+        """
+        key: Tuple[str, str, str] = (cls.__caller, language, linter)
+        try:
+            stat: os.stat_result = os.stat(cls.__caller)
+            signature: Tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        preload: preload_object = cls.preloaded.get(key)
+        if preload and signature and preload.signature == signature:
+            logger.debug(f"'PRELOAD' reused for caller={cls.__caller}")
+        else:
+            if language == Language.python:
+                # Its ast, imports and comments are computed on first access
+                caller_source: SourceScript = cls.script_utils.get_script(cls.__caller)
+            else:
+                with open(cls.__caller, "r", encoding="utf-8") as code:
+                    caller_source: SourceScript = cls.script_utils.get_attributes(code)
+            preload = preload_object(
+                signature,
+                caller_source,
+                caller_source,
+                caller_source.comments,
+                # Contexts reference the source by hash, the cli-engine resolves it from the store
+                cls.source_store.publish(caller_source.string),
+                LintWorker(cls.linter) if cls.linter else None,
+            )
+            if preload.lint_worker:
+                # Lint in the background, the report is attached to contexts once ready
+                preload.lint_worker.submit(cls.__caller, caller_source.string)
+            cls.preloaded[key] = preload
+        cls.__caller_source: SourceScript = preload.caller_source
+        cls.__script: SourceScript = preload.script
+        cls.caller_comments = preload.comments
+        cls.__source_hash: str = preload.source_hash
+        cls.lint_worker = preload.lint_worker
+
+    @classmethod
+    def get_lint_suggestions(
+        cls, timeout: float = 0, startline: int = None, endline: int = None
+    ) -> str:
+        """
+        Get the lint records of a code block of the caller script, empty until the
+        background linter is done.
+            Parameters:
+                timeout (float): Seconds to wait for the report.
+                startline (int): Start line of the code block. Default is the first line.
+                endline (int): End line of the code block. Default is the last line.
+        """
+        report: Optional[LintReport] = (
+            cls.lint_worker.get_report(timeout) if cls.lint_worker else None
+        )
+        return report.get_block(startline, endline) if report else str()
+
+    @classmethod
+    def __send(cls, context: Dict) -> None:
+        """
+        Queue a context on the dispatcher.
+        The pid is set here, templates built before a fork are shared with the children.
+        """
+        if not cls.__check_ledger(context):
+            return
+        context[Context.execution.value][Context.traceback.value][
+            Context.pid.value
+        ] = cls.__caller_pid
+        error_counts: List[Dict] = cls.error_fingerprints.drain()
+        if error_counts:
+            context[Context.execution.value][Context.error_counts.value] = error_counts
+        cls.dispatcher.put(context)
+
+    @classmethod
+    def __attach_lint_suggestions(cls, context: Dict) -> None:
+        """
+        Attach the lint report to a context if it was not ready when the context was built.
+        Called by the dispatcher right before the context is sent, so waiting for the report
+        never delays the debugged program.
+        """
+        suggestions: Dict = context[Context.prompt.value][Context.suggestions.value]
+        if not cls.lint_worker or suggestions.get(Context.lint_suggestions.value):
+            return
+        source: Dict = context[Context.source.value]
+        lines: List[Optional[int]] = [
+            int(line) if str(line).isdigit() else None
+            for line in (
+                source.get(Context.startline.value),
+                source.get(Context.endline.value),
+            )
+        ]
+        suggestions[Context.lint_suggestions.value] = cls.get_lint_suggestions(
+            config.lint_timeout, *lines
+        )
+
+    @classmethod
+    def __check_ledger(cls, context: Dict) -> bool:
+        """
+        Set the ledger key of a context of an instant mode.
+        Returns:
+            False if the code block was already handled by the cli-engine in the same mode.
+        """
+        prompt: Dict = context[Context.prompt.value]
+        mode: str = prompt.get(Context.mode.value)
+        if (
+            mode not in cls.instant_modes
+            or prompt.get(Context.referer.value)
+            or context[Context.execution.value][Context.status.value]
+            == Code.failed.value
+        ):
+            return True
+        source: Dict = context[Context.source.value]
+        key: str = cls.dispatch_ledger.get_key(
+            mode,
+            source.get(Context.block.value),
+            prompt[Context.suggestions.value].get(Context.subject.value),
+        )
+        prompt[Context.ledger_key.value] = key
+        if cls.force_dispatch:
+            return True
+        entry: Optional[Dict] = cls.dispatch_ledger.get_entry(key)
+        if entry is None:
+            return True
+        logger.info(
+            f"'LEDGER' skipped mode='{str(mode).upper()}'::startline={source.get(Context.startline.value)}::endline={source.get(Context.endline.value)}::completed={entry.get('completed')}"
+        )
+        return False
+
+    @classmethod
+    def log_error_counts(cls) -> None:
+        """
+        Log the counters of the repeated errors no dispatched context was left to carry.
+        """
+        for error_count in cls.error_fingerprints.drain():
+            logger.error(f"'ERROR COUNTS' not dispatched::{error_count}")
+
+    @classmethod
+    def prefork(cls, freeze: bool = True) -> None:
+        """
+        Prepare the debugger to be inherited by forked worker processes e.g. prefork servers.
+        Call it in the parent process once the debugger is created and before forking workers:
+        * The symbol index of the caller script is built once for every worker.
+        * The lint report of the caller script is awaited, so workers inherit it.
+        * Workers creating a debugger for the same script reuse the parsed and linted script.
+        * With `freeze` the objects of the parent are moved to the permanent generation of the
+          garbage collector, which then leaves the memory pages shared with the workers untouched.
+            Parameters:
+                freeze (bool): Freeze the objects of the parent with `gc.freeze`. Default is True.
+        """
+        if cls.disable or not hasattr(cls, "instance"):
+            return
+        cls.__get_source_index(cls.instance)
+        cls.get_lint_suggestions(config.lint_timeout)
+        if freeze:
+            gc.collect()
+            gc.freeze()
+        logger.debug(f"'PREFORK' ready for caller={cls.__caller}::freeze={freeze}")
+
+    @classmethod
+    def before_fork(cls) -> None:
+        """
+        Send the queued contexts before forking so they are not inherited by the child.
+        A report still being linted is awaited first: forking while the linting thread is
+        importing or running the linter leaves the child with its locks held.
+        """
+        if cls.disable:
+            return
+        cls.get_lint_suggestions(config.lint_timeout)
+        if getattr(cls, "dispatcher", None):
+            cls.dispatcher.flush(config.dispatch_timeout)
+
+    @classmethod
+    def after_fork_in_child(cls) -> None:
+        """
+        Reset the per process state of the debugger in a forked child process.
+        The parsed script and its blocks are inherited, locks, the dispatcher thread and the
+        channel handles are recreated and a lint report still pending is linted again.
+        """
+        cls.__caller_pid = cls.process_utils.get_pid_of_current_process()
+        cls.pending_dispatches = set()
+        cls.worker_errors_lock = threading.Lock()
+        cls.watch_logs.after_fork()
+        cls.error_fingerprints.after_fork()
+        if cls.lint_worker:
+            cls.lint_worker.after_fork()
+        if getattr(cls, "channel", None):
+            cls.channel.reopen()
+        if getattr(cls, "dispatcher", None):
+            cls.dispatcher.after_fork()
+
     def __init__(
         self,
         *args,
@@ -237,9 +496,11 @@ class Debugger(Object):
         self.kwargs = kwargs
         self.assigned_var = None
         if self.language == Language.python and self.run_as_main:
-            startline = self.runtime_info.get_stack_caller_frame().lineno
+            startline = self.runtime_info.get_stack_caller_frame(
+                self.__caller_filename
+            ).lineno
             if not self.disable:
-                line = self.__caller_source.lines[startline - 1].split("=")
+                line = self.__caller_source.get_line(startline).split("=")
                 if len(line) > 1:
                     self.assigned_var = f"{line[0].strip()}"
 
@@ -260,13 +521,19 @@ class Debugger(Object):
         self,
         mode: str = Mode.improve.value,
         subject: str = None,
+        sampler: Union[str, BaseSampler] = None,
     ) -> Any:
         """
         Decorator to debug a function block within the script at runtime.
+        Coroutine functions, generators and async generators are wrapped natively; inside an
+        event loop contexts are dispatched from a worker thread so the loop is never blocked.
 
         Parameters:
             mode (str): The debugger mode to run the function. Default is `improve`.
             subject (str): The subject of the function to debug.
+            sampler (str | BaseSampler): Sampler or sampler name deciding which calls dispatch the function block. Default is `config.sampler`.
+                The block is registered on the first call, so errors of every call are mapped to it, and a block without sampled calls is not dispatched at exit.
+                A block is dispatched once at most: the sampler only picks the call that dispatches it, so `probability` and `token_bucket` delay the dispatch, `once` and `first` decide which blocks and callsites are dispatched at all.
         Returns:
             A result object from executed function.
         """
@@ -275,40 +542,89 @@ class Debugger(Object):
         def wrap(
             function: types.FunctionType,
         ) -> Any:
-            startline = self.runtime_info.get_stack_caller_frame().lineno
-            # line = self.__caller_source.lines[startline-1]
+            # Check if debugger is disabled or an invalid mode.. still run the function/ Do not interrupt execution
+            # Spawned worker processes only forward the errors of the function to the parent
+            if not self.forward_only and (
+                self.disable or mode not in Mode.__dict__.get(Enums.members)
+            ):
+                return function
 
-            @wraps(function)
-            def wrapper(*args, **kwargs) -> Any:
-                check: bool = (
-                    inspect.iscoroutinefunction(function)
-                    or inspect.isawaitable(function)
-                    or inspect.iscoroutine(function)
-                )
-                # Check if debugger is disabled or an invalid mode.. still run the function/ Do not interrupt execution
-                if self.disable or mode not in Mode.__dict__.get(Enums.members):
-                    exc_output = (
-                        asyncio.run(function(*args, **kwargs))
-                        if check
-                        else function(*args, **kwargs)
-                    )
-                    return exc_output
-                context, sync, block = self.build(
+            template, block, code, call_sampler = None, None, None, None
+            if not self.forward_only:
+                startline = self.runtime_info.get_stack_caller_frame(
+                    self.__caller_filename
+                ).lineno
+                # Resolve the block, its comments and the context once per decorated function
+                template, block = self.build_template(
                     mode,
                     startline,
                     subject,
                     remove_pattern=f"{self.assigned_var}.",
                 )
-                logger.debug(
-                    f"method='WRAP'::mode='{mode.upper()}'::startline={startline}::endline={block.endline}::sync={sync}::subject='{subject}'"
-                )
+                code = getattr(function, "__code__", None)
+                call_sampler = self.get_sampler(sampler)
+            # The block is registered in the watch logs on the first call and dispatched by
+            # the first sampled call, later calls are not debugged
+            registered: List[Optional[Tuple[Dict, bool]]] = [None]
+            dispatched: List[bool] = [not template]
+            register_lock: threading.Lock = threading.Lock()
+
+            def start(
+                dispatch: types.FunctionType, call_sampler: BaseSampler = call_sampler
+            ) -> Tuple[Dict, bool]:
+                """
+                Register the block on the first call and dispatch instant modes on the first
+                sampled call.
+                Returns:
+                    Tuple of the call context and sync status or None if the call is not debugged.
+                """
+                if self.disable or dispatched[0]:
+                    return None
+                if registered[0] is None:
+                    with register_lock:
+                        # Only one of the threads racing on the first call registers the block
+                        if registered[0] is None:
+                            context: Dict = self.copy_context(template)
+                            sync, context = self.__sync_modes(
+                                mode,
+                                context,
+                                block.startline,
+                                block.endline,
+                                code,
+                                sampled=not call_sampler,
+                            )
+                            logger.debug(
+                                f"method='WRAP'::mode='{mode.upper()}'::startline={startline}::endline={block.endline}::sync={sync}::subject='{subject}'"
+                            )
+                            registered[0] = (context, sync)
+                context, sync = registered[0]
+                if call_sampler:
+                    if not call_sampler.sample(
+                        code or function,
+                        lambda: self.__caller_source.get_range(
+                            block.startline, block.endline
+                        ),
+                    ):
+                        return None
+                    log: Optional[Dict] = self.watch_logs.get_enclosing(
+                        mode, block.startline
+                    )
+                    if log and sync:
+                        log[Context.sampled.value] = True
+                dispatched[0] = True
                 if mode in self.instant_modes and sync:
-                    self.dispatch(mode, context, set_flag=True)
-                exc_output = (
-                    asyncio.run(function(*args, **kwargs))
-                    if check
-                    else function(*args, **kwargs)
-                )
+                    dispatch(mode, context, set_flag=True)
+                return context, sync
+
+            def finish(
+                dispatch: types.FunctionType, context: Dict, sync: bool, output: Any
+            ) -> None:
+                """
+                Dispatch atexit modes once the function returned successfully.
+                """
+                context = self.materialize_context(context)
+                if not context:
+                    return
                 if (
                     mode in self.atexit_modes
                 ) and sync:  # or mode in self.on_error_modes
@@ -321,13 +637,91 @@ class Debugger(Object):
                             Context.mode.value
                         ] = self.redirect_on_error.get(mode)
                     context[Context.execution.value][Context.output.value] = (
-                        str(exc_output) if exc_output else None
+                        str(output) if output else None
                     )
                     context[Context.execution.value][
                         Context.status.value
                     ] = Code.success.value
-                    self.dispatch(mode, context, set_flag=True)
-                return exc_output
+                    dispatch(mode, context, set_flag=True)
+
+            if template and self.error_forwarder:
+                # Blocks first called in a forked worker process are registered on its error
+                self.worker_blocks.append(
+                    (
+                        block.startline,
+                        block.endline,
+                        partial(start, self.dispatch, None),
+                    )
+                )
+
+            if inspect.iscoroutinefunction(function):
+
+                @wraps(function)
+                async def wrapper(*args, **kwargs) -> Any:
+                    state = start(self.dispatch_nowait)
+                    try:
+                        output = await function(*args, **kwargs)
+                    except Exception as error:
+                        self.forward_error(error)
+                        raise
+                    if state:
+                        finish(self.dispatch_nowait, *state, output)
+                    return output
+
+            elif inspect.isasyncgenfunction(function):
+
+                @wraps(function)
+                async def wrapper(*args, **kwargs) -> Any:
+                    state = start(self.dispatch_nowait)
+                    generator = function(*args, **kwargs)
+                    # Forward asend/athrow/aclose to the wrapped async generator
+                    try:
+                        item = await generator.__anext__()
+                        while True:
+                            try:
+                                value = yield item
+                            except GeneratorExit:
+                                await generator.aclose()
+                                raise
+                            except BaseException as error:
+                                item = await generator.athrow(error)
+                            else:
+                                item = await generator.asend(value)
+                    except StopAsyncIteration:
+                        pass
+                    except Exception as error:
+                        self.forward_error(error)
+                        raise
+                    if state:
+                        finish(self.dispatch_nowait, *state, None)
+
+            elif inspect.isgeneratorfunction(function):
+
+                @wraps(function)
+                def wrapper(*args, **kwargs) -> Any:
+                    state = start(self.dispatch)
+                    try:
+                        output = yield from function(*args, **kwargs)
+                    except Exception as error:
+                        self.forward_error(error)
+                        raise
+                    if state:
+                        finish(self.dispatch, *state, output)
+                    return output
+
+            else:
+
+                @wraps(function)
+                def wrapper(*args, **kwargs) -> Any:
+                    state = start(self.dispatch)
+                    try:
+                        output = function(*args, **kwargs)
+                    except Exception as error:
+                        self.forward_error(error)
+                        raise
+                    if state:
+                        finish(self.dispatch, *state, output)
+                    return output
 
             return wrapper
 
@@ -347,8 +741,10 @@ class Debugger(Object):
         if not mode:
             return
         subject: str = self.get(Context.subject)
-        startline: int = self.runtime_info.get_stack_caller_frame().lineno
-        line = self.__caller_source.lines[startline - 1]
+        startline: int = self.runtime_info.get_stack_caller_frame(
+            self.__caller_filename
+        ).lineno
+        line = self.__caller_source.get_line(startline)
         context, sync, block = self.build(
             mode,
             startline,
@@ -372,7 +768,9 @@ class Debugger(Object):
             exc_value (str): The exception value.
             traceback (traceback): The traceback object.
         """
-        startline = self.runtime_info.get_stack_caller_frame().lineno
+        startline = self.runtime_info.get_stack_caller_frame(
+            self.__caller_filename
+        ).lineno
         logger.debug(
             f"'ENDWITH'::startline={startline}::exc_type={exc_type}::exc_value={exc_value}::traceback={traceback}"
         )
@@ -382,23 +780,23 @@ class Debugger(Object):
 
         # On success dispatch at_exit / on_error modes
         def dispatch(mode):
-            watch_logs = self.watch_logs.get(mode, [])
-            if watch_logs:
-                log = watch_logs[-1]
-                if startline == log[Context.startline]:
-                    context: Dict = log.get(Context.context)
-                    context[Context.execution.value][
-                        Context.status.value
-                    ] = Code.success.value
-                    mode: str = context.get(Context.prompt)[Context.mode]
-                    if mode in self.on_error_modes:
-                        context[Context.prompt.value][
-                            Context.referer.value
-                        ] = mode.lower()
-                        context[Context.prompt.value][
-                            Context.mode.value
-                        ] = self.redirect_on_error.get(mode)
-                    self.dispatch(mode, context, set_flag=True)
+            log: Dict = self.watch_logs.get_block(mode, startline)
+            context: Dict = (
+                self.materialize_context(log.get(Context.context)) if log else None
+            )
+            if context:
+                context[Context.execution.value][
+                    Context.status.value
+                ] = Code.success.value
+                mode: str = context.get(Context.prompt)[Context.mode]
+                if mode in self.on_error_modes:
+                    context[Context.prompt.value][
+                        Context.referer.value
+                    ] = mode.lower()
+                    context[Context.prompt.value][
+                        Context.mode.value
+                    ] = self.redirect_on_error.get(mode)
+                self.dispatch(mode, context, set_flag=True)
 
         for mode in self.atexit_modes:  # + self.on_error_modes:
             dispatch(mode)
@@ -416,6 +814,7 @@ class Debugger(Object):
         mode: str = Mode.improve.value,
         subject: str = None,
         remove_pattern: str = None,
+        sampler: Union[str, BaseSampler] = None,
     ):
         """
         Debug a code block within a codebase.
@@ -424,6 +823,8 @@ class Debugger(Object):
             endline (int): The line number where the code block ends.
             mode (str): The debugger mode to run the function. Defaults to `improve`.
             subject (str): The subject of the code block.
+            sampler (str | BaseSampler): Sampler or sampler name deciding which calls are debugged. Default is `config.sampler`.
+                A block is dispatched once at most: the sampler only picks the call that dispatches it, so `probability` and `token_bucket` delay the dispatch, `once` and `first` decide which blocks and callsites are dispatched at all.
         """
         mode = self.__set_mode(mode, "debug")
         if not mode:
@@ -434,6 +835,12 @@ class Debugger(Object):
             and startline <= endline
             and endline <= self.__caller_source.lenght
         ):
+            call_sampler: BaseSampler = self.get_sampler(sampler)
+            if call_sampler and not call_sampler.sample(
+                (mode, startline, endline),
+                lambda: self.__caller_source.get_range(startline, endline),
+            ):
+                return
             # line = self.__caller_source.lines[startline-1]
             context, sync, block = self.build(
                 mode,
@@ -466,6 +873,8 @@ class Debugger(Object):
                     exc_traceback: Exception traceback, can be None.
                     thread: Thread which raised the exception, can be None.
         """
+        import multiprocessing
+
         lenght: int = len(args)
         thread: threading.Thread = None
         process = multiprocessing.current_process()
@@ -482,6 +891,116 @@ class Debugger(Object):
             exc_type, exc_value, exc_traceback = args
         cls.dispatch_on_error(exc_type, exc_value, exc_traceback, thread, process)
 
+    @classmethod
+    def forward_worker_errors(cls) -> None:
+        """
+        Turn the debugger of a forked worker process into an error forwarder.
+        The worker never registers or dispatches code blocks, the parent does it for its errors.
+        """
+        cls.forward_only = True
+        cls.disable = True
+        cls.error_forwarder = None
+
+    @classmethod
+    def forward_error(cls, error: Exception) -> None:
+        """
+        Forward an error raised by a wrapped function of a worker process to the parent.
+        """
+        if cls.forward_only:
+            ErrorForwarder.send(error)
+
+    @classmethod
+    def handle_worker_error(cls, event: Dict) -> None:
+        """
+        Aggregate an error event forwarded by a worker process on the code block it was raised in.
+        The innermost frame of the caller script within an on error block selects the block.
+            Parameters:
+                event (Dict): Error event, see `ErrorForwarder.get_event`.
+        """
+        linenos: List[int] = [
+            lineno
+            for filename, lineno in reversed(event["frames"])
+            if filename == cls.__caller_filename
+        ]
+        for mode in cls.on_error_modes:
+            log: Dict = cls.__get_worker_log(mode, linenos)
+            if not log:
+                continue
+            with cls.worker_errors_lock:
+                errors: Dict = cls.worker_errors.setdefault(
+                    id(log),
+                    {
+                        Context.mode.value: mode,
+                        Context.context.value: log,
+                        Context.traceback.value: event,
+                        Context.workers.value: {"count": 0, "pids": []},
+                    },
+                )
+                errors[Context.workers.value]["count"] += 1
+                if event["pid"] not in errors[Context.workers.value]["pids"]:
+                    errors[Context.workers.value]["pids"].append(event["pid"])
+            logger.debug(
+                f"method='WORKER-ERROR'::mode='{mode.upper()}'::pid={event['pid']}::startline={log.get('startline')}::endline={log.get('endline')}::error_type={event['exception_type']}"
+            )
+            return
+
+    @classmethod
+    def __get_worker_log(cls, mode: str, linenos: List[int]) -> Optional[Dict]:
+        """
+        Get the block of a mode enclosing the innermost line, registering the wrapped function
+        of the line if it was only ever called in worker processes.
+        """
+        for lineno in linenos:
+            log: Dict = cls.watch_logs.get_enclosing(mode, lineno)
+            if log:
+                return log
+            for startline, endline, register in cls.worker_blocks:
+                if startline <= lineno <= endline:
+                    register()
+                    log = cls.watch_logs.get_enclosing(mode, lineno)
+                    if log:
+                        return log
+        return None
+
+    @classmethod
+    def dispatch_worker_errors(cls) -> None:
+        """
+        Dispatch the errors aggregated from worker processes, one dispatch per code block.
+        """
+        if not cls.error_forwarder:
+            return
+        cls.error_forwarder.drain()
+        with cls.worker_errors_lock:
+            worker_errors, cls.worker_errors = cls.worker_errors, dict()
+        for errors in worker_errors.values():
+            mode: str = errors[Context.mode.value]
+            log: Dict = errors[Context.context.value]
+            event: Dict = errors[Context.traceback.value]
+            if not cls.watch_logs.claim(mode, log):
+                continue
+            context: Dict = cls.materialize_context(log.get(Context.context))
+            if not context:
+                continue
+            context[Context.execution.value][Context.traceback.value] = {
+                Context.exception_type.value: event["exception_type"],
+                Context.exception_message.value: event["exception_message"],
+                Context.full_traceback.value: event["full_traceback"],
+                Context.error_line.value: next(
+                    (
+                        lineno
+                        for filename, lineno in reversed(event["frames"])
+                        if filename == cls.__caller_filename
+                    ),
+                    None,
+                ),
+                Context.workers.value: errors[Context.workers.value],
+            }
+            context[Context.execution.value][Context.status.value] = Code.failed.value
+            cls.__send(context)
+            logger.debug(
+                f"DISPATCHED `on worker error` for mode='{mode.upper()}'::startline={log.get('startline')}::endline={log.get('endline')}::workers={errors[Context.workers.value]}"
+            )
+
     @__check_status
     def __set_mode(self, mode: str, method: str = None) -> str:
         if mode:
@@ -501,6 +1020,7 @@ class Debugger(Object):
         syntax_format: str = Code.end_breakpoint.value,
         startline: int = None,
         remove_pattern: str = None,
+        sampler: Union[str, BaseSampler] = None,
     ) -> None:
         """
         Start Debugger to monitor, redirect stderr to a log file and
@@ -510,11 +1030,26 @@ class Debugger(Object):
             subject (str): A user defined  subject.
             syntax_format (str): The syntax format to use for the end breakpoint.
             startline (int): The line number where the code block starts.
+            sampler (str | BaseSampler): Sampler or sampler name deciding which calls are debugged. Default is `config.sampler`.
+                A block is dispatched once at most: the sampler only picks the call that dispatches it, so `probability` and `token_bucket` delay the dispatch, `once` and `first` decide which blocks and callsites are dispatched at all.
         """
         mode = self.__set_mode(mode, "breakpoint")
         if not mode:
             return
-        startline = startline or self.runtime_info.get_stack_caller_frame().lineno
+        startline = (
+            startline
+            or self.runtime_info.get_stack_caller_frame(self.__caller_filename).lineno
+        )
+        call_sampler: BaseSampler = self.get_sampler(sampler)
+        if call_sampler and not call_sampler.sample(
+            (mode, startline),
+            lambda: self.__caller_source.get_range(
+                startline,
+                self.__get_syntax_endline(startline, syntax_format)
+                or self.__caller_source.lenght,
+            ),
+        ):
+            return
         # line = self.__caller_source.lines[startline-1]
         context, sync, block = self.build(
             mode,
@@ -536,6 +1071,8 @@ class Debugger(Object):
         context: Dict,
         startline: int,
         endline: int,
+        code: types.CodeType = None,
+        sampled: bool = True,
     ) -> Tuple[bool, Dict]:
         """
         Synchronize debugger modes created.
@@ -544,108 +1081,23 @@ class Debugger(Object):
             context (Dict): Debugger context.
             startline (int): Code block startline.
             endline (int): Code block endline.
+            code (CodeType): Code object of the wrapped function if any.
+            sampled (bool): False if the code block is not dispatched at exit until a call is sampled.
         Returns:
             bool: True if the mode was synchronized, False otherwise.
         """
 
-        for mode_ in Mode.__dict__.get(Enums.members):
-            if mode == mode_ and mode not in self.instant_modes:
-                continue
-            check_logs = self.watch_logs.get(mode_, [])
-            for log in check_logs:
-                last_startline = log.get(Context.startline.value)
-                last_endline = log.get(Context.endline.value)
-                if (
-                    startline >= last_endline
-                    and (endline > last_endline and endline >= startline)
-                    or (
-                        last_startline >= startline
-                        and last_startline > endline
-                        and last_startline < last_endline
-                    )
-                ):
-                    # Only add mode if the code blocks are not overlapping
-                    continue
-                logger.debug(
-                    f"`OVERLAP`. `{mode_.upper()}` has already been defined from startline {last_startline} and endline {last_endline}"
-                )
-                return False, context
-        logs = self.watch_logs.get(mode, [])
-        last_item = logs[-1] if logs else None
-        index = None
-
-        def modify_log(startline: int, endline: int) -> Dict:
-            """
-            Modify a log.
-            Parameters:
-                log (Dict): Log to modify.
-                index (int): Index of the log to modify.
-            """
-            log = logs.pop(-1)
-            log[Context.endline.value] = endline
-            logs.append(log)
-            self.watch_logs[mode] = logs
-
-            context[Context.source.value][Context.endline.value] = endline
-            context[Context.source.value][Context.startline.value] = startline
-            logger.debug(
-                f"method='SYNC'::mode='{mode.upper()}'::startline={startline}::endline={endline}::sync={True}"
-            )
-            return context
-
-        if last_item:
-            last_startline = int(last_item[Context.startline])
-            last_endline = int(last_item[Context.endline])
-            # No point in having same code blocks with same mode overlapping each other
-            logger.debug(
-                f"'SYNCHRONIZATION-CALL' mode='{mode.upper()}'::current-startline={startline}::current-endline={endline}::previous-startline={last_startline}::previous-endline={last_endline}"
-            )
-            if (
-                startline >= last_startline
-                and startline < last_endline
-                and endline >= last_endline
-            ):
-                # Swap last line of the previous mode with the current mode
-                # Extend the code block instead of creating a new mode instance
-                context = modify_log(last_startline, endline)
-                # context = (
-                #     modify_log(last_endline, endline)
-                #     if mode in self.instant_modes
-                #     else modify_log(last_startline, endline)
-                # )
-                return True, context
-
-            elif startline >= last_endline and (
-                endline > last_endline and endline >= startline
-            ):
-                # Only add mode if the code blocks are not overlapping
-                pass
-            elif (
-                last_startline >= startline
-                and last_startline > endline
-                and last_startline < last_endline
-            ):
-                # Swap items in the watch logs (Sorting the watch logs)
-                index = -2
-            elif (
-                last_startline <= endline
-                and endline > startline
-                and last_endline > last_startline
-            ):
-                # Get the startline and the last endline
-                # Modify the watch log and context logs to reflect that
-                # context = (
-                #     modify_log(startline, last_startline)
-                #     if mode in self.instant_modes
-                #     else modify_log(startline, last_endline)
-                # )
-                context = modify_log(startline, last_endline)
-                return True, context
-            else:
-                return False, context
-        else:
-            f"'SYNCHRONIZATION-CALL' mode='{mode.upper()}'::current-startline={startline}::current-endline{endline} no logs found"
-        return self.__watch(mode, context, startline, endline, index), context
+        # No point in having same code blocks with same mode overlapping each other,
+        # the watch logs extend the existing code block instead of creating a new mode instance
+        exclusive: List[str] = [
+            mode_
+            for mode_ in Mode.__dict__.get(Enums.members)
+            if mode != mode_ or mode in self.instant_modes
+        ]
+        return (
+            self.__watch(mode, context, startline, endline, code, exclusive, sampled),
+            context,
+        )
 
     def __watch(
         self,
@@ -653,7 +1105,9 @@ class Debugger(Object):
         context: Dict,
         startline: int,
         endline: int,
-        index: int = None,
+        code: types.CodeType = None,
+        exclusive: List[str] = (),
+        sampled: bool = True,
     ) -> bool:
         """
         Update the watch logs, which keep track of all debugger mode calls and their attributes.
@@ -662,10 +1116,16 @@ class Debugger(Object):
             context (Dict): Context for the cli-engine.
             startline (int): Start line of the code block.
             endline (int): End line of the code block.
-            index (int): Index of the watch log to update.
+            code (CodeType): Code object of the wrapped function if any.
+            exclusive (List[str]): Modes whose code blocks the code block must not overlap.
+            sampled (bool): False if the code block is not dispatched at exit until a call is sampled.
+        Returns:
+            bool: False if the code block overlaps a code block of an exclusive mode.
         Note:
             This works for modes that require the code to end before results can be generated.
         """
+        import multiprocessing
+
         current_thread: threading.Thread = threading.current_thread()
         current_process: multiprocessing.Process = multiprocessing.current_process()
         watch_log = {
@@ -675,16 +1135,33 @@ class Debugger(Object):
             Context.startline.value: startline,  # Start line of the code block
             Context.endline.value: endline,  # End line of the code block
             Context.flag.value: False,  # Flag to indicate if the mode was dispatched
+            Context.sampled.value: sampled,  # Flag to indicate if the block is dispatched at exit
         }
-        logs = self.watch_logs.get(mode, [])
-        if index:
-            logs.insert(
-                index,
-                watch_log,
+        overlap, log = self.watch_logs.register(mode, watch_log, code, exclusive)
+        if overlap:
+            logger.debug(
+                f"`OVERLAP`. A mode has already been defined from startline {overlap.get(Context.startline.value)} and endline {overlap.get(Context.endline.value)}"
+            )
+            return False
+        logger.debug(
+            f"'SYNCHRONIZATION-CALL' mode='{mode.upper()}'::current-startline={startline}::current-endline={endline}"
+        )
+        if log:
+            if sampled:
+                log[Context.sampled.value] = True
+            # Modify the context to reflect the extended code block
+            startline = log[Context.startline.value]
+            endline = log[Context.endline.value]
+            source: Dict = (
+                context.source
+                if isinstance(context, LazyContext)
+                else context[Context.source.value]
+            )
+            source[Context.endline.value] = endline
+            source[Context.startline.value] = startline
+            logger.debug(
+                f"method='SYNC'::mode='{mode.upper()}'::startline={startline}::endline={endline}::sync={True}"
             )
-        else:
-            logs.append(watch_log)
-        self.watch_logs[mode] = logs
         return True
 
     @classmethod
@@ -698,12 +1175,16 @@ class Debugger(Object):
     ):
         """
         Dispatch context to the cli-engine.
+        The context is queued on the background dispatcher, channel I/O never runs on the calling thread.
         Parameters:
             mode (str): Debugger mode. Default is `improve`.
             context (Dict): Context for the cli-engine.
             set_flag (bool): Set the flag  indicate the mode was dispatched
-            dispatch_by_last_index (bool): Dispatch the context of the last index item in the watch logs
+            dispatch_by_last_index (bool): Dispatch only if the watch log of the context's code block has not been dispatched
         """
+        context = cls.materialize_context(context)
+        if not context:
+            return
         if (
             (
                 mode in cls.atexit_modes
@@ -717,23 +1198,54 @@ class Debugger(Object):
             )
         ):
             if dispatch_by_last_index:
-                # Check flag of watch log before sending dispatch
-                mode_objects: list = cls.watch_logs.get(mode)
-                if mode_objects:
-                    mode_object = mode_objects.pop(-1)
-                    if not mode_object[Context.flag]:
-                        cls.channel.send(context)
-                        # Update flag to True to indicate the mode was dispatched
-                        if set_flag:
-                            mode_object[Context.flag] = set_flag
-                    mode_objects.append(mode_object)
-                    cls.watch_logs[mode] = mode_objects
+                # Check flag of the watch log of the context's code block before sending dispatch
+                mode_object: Dict = cls.watch_logs.get_enclosing(
+                    mode, int(context.get(Context.source)[Context.startline])
+                )
+                # Claiming the flag lets exactly one thread dispatch the code block
+                if mode_object and (
+                    cls.watch_logs.claim(mode, mode_object)
+                    if set_flag
+                    else not mode_object[Context.flag]
+                ):
+                    cls.__send(context)
             else:
-                cls.channel.send(context)
+                cls.__send(context)
             logger.debug(
                 f"DISPATCHED `successfully` for mode='{context.get('prompt')['mode'].upper()}'::referer='{context.get(Context.prompt)[Context.referer]}'::startline={context.get('source')['startline']}::endline={context.get('source')['endline']}"
             )
 
+    @classmethod
+    @__check_status
+    def dispatch_nowait(
+        cls,
+        mode: str,
+        context: Dict,
+        set_flag: bool = False,
+        dispatch_by_last_index: bool = True,
+    ) -> None:
+        """
+        Dispatch context to the cli-engine without blocking the running event loop.
+        The dispatch runs in the loop's default executor, or inline outside of an event loop.
+        Parameters:
+            mode (str): Debugger mode. Default is `improve`.
+            context (Dict): Context for the cli-engine.
+            set_flag (bool): Set the flag  indicate the mode was dispatched
+            dispatch_by_last_index (bool): Dispatch only if the watch log of the context's code block has not been dispatched
+        """
+        # No event loop can be running before asyncio is imported, don't import it for nothing
+        asyncio: types.ModuleType = sys.modules.get("asyncio")
+        try:
+            loop: "asyncio.AbstractEventLoop" = asyncio.get_running_loop()
+        except (AttributeError, RuntimeError):
+            return cls.dispatch(mode, context, set_flag, dispatch_by_last_index)
+        future: "asyncio.Future" = loop.run_in_executor(
+            None, cls.dispatch, mode, context, set_flag, dispatch_by_last_index
+        )
+        # Hold a reference until the dispatch completes
+        cls.pending_dispatches.add(future)
+        future.add_done_callback(cls.pending_dispatches.discard)
+
     @classmethod
     @__check_status
     def dispatch_on_error(
@@ -742,7 +1254,7 @@ class Debugger(Object):
         exc_value: str = None,
         traceback_n: str = None,
         thread: threading.Thread = None,
-        process: multiprocessing.Process = None,
+        process: "multiprocessing.Process" = None,
         lint_suggestions: str = None,
         linter: str = None,
         line_number: int = None,
@@ -759,8 +1271,22 @@ class Debugger(Object):
             lint_suggestions (str): Lint suggestions for the code.
             linter (str): Lint format for the linter output.
         """
+        if thread and isinstance(traceback_n, types.TracebackType):
+            # Error storms of threads: repeated errors are counted, not dispatched again
+            fingerprint: Tuple = cls.error_fingerprints.get_fingerprint(
+                exc_type, traceback_n, cls.__caller_filename
+            )
+            if not cls.error_fingerprints.observe(fingerprint):
+                # Logged once per window, logging is most of the cost of an occurrence
+                suppressed: int = cls.error_fingerprints.report_suppressed(fingerprint)
+                if suppressed:
+                    logger.error(
+                        f"{getattr(exc_type, '__name__', exc_type)}: {exc_value} raised again in thread `{thread.name}`, occurrences are only counted for {cls.error_fingerprints.window}s::count={cls.error_fingerprints.get_count(fingerprint)}::suppressed={suppressed}"
+                    )
+                return
         if cls.attach_hook:
             atexit.unregister(cls.exit_handler)
+        cls.dispatch_worker_errors()
         # if exc_type in cls.skip_errors:
         if any(error in str(exc_type) for error in cls.skip_errors):
             logger.debug(
@@ -769,75 +1295,87 @@ class Debugger(Object):
             logger.error(f"{exc_type.__name__}: {exc_value}")
             return
         line_number = line_number or cls.__caller_source.lenght
+        codes: List[types.CodeType] = []  # Code objects of the caller frames, innermost first
         if (
             isinstance(traceback_n, types.TracebackType)
             and cls.language == Language.python
         ):
+            for frame, lineno in traceback.walk_tb(traceback_n):
+                if frame.f_code.co_filename == cls.__caller_filename:
+                    codes.insert(0, frame.f_code)
+                    line_number = lineno
             traceback_nodes: List[str] = traceback.format_tb(traceback_n)
-            # traceback_node = traceback_nodes[-1]
-            # line_number: int = int(
-            #     re.search(r"""line (\d+)""", traceback_node).group(1)
-            # )
             traceback_n = ("").join(traceback_nodes)
 
+        import multiprocessing
+
         process = process or multiprocessing.current_process()
         attribute = thread if thread and process else process
         logger.error(traceback_n)
         fixed = False  # Ensure a fix was defined for that block
         # Dispatch all on error modes code blocks on error
 
+        def get_log(mode: str) -> Dict:
+            # Fast path: the code block registered for a function in the traceback
+            for code in codes:
+                log = cls.watch_logs.get_by_code(code, mode)
+                if log:
+                    return log
+            if cls.language == Language.python:
+                return cls.watch_logs.get_enclosing(mode, line_number)
+            return next(
+                (log for log in cls.watch_logs.get(mode, []) if not log[Context.flag]),
+                None,
+            )
+
         def dispatch(mode: str):
             global fixed
             p_mode = mode
-            watch_logs: List[Dict[str, str]] = cls.watch_logs.get(mode, [])
             referer = None
-            for log in watch_logs:
-                if (
-                    log.get(attribute.name) == attribute
-                    and not log.get(Context.flag)
-                    and line_number >= log.get(Context.startline)
-                    and (
-                        line_number <= log.get(Context.endline)
-                        or cls.language != Language.python
-                    )
-                ):
-                    context: Dict = log.get(Context.context)
-                    context[Context.execution.value][Context.traceback.value] = {
-                        Context.exception_type.value: str(exc_type)
-                        if exc_type
-                        else None,
-                        Context.exception_message.value: str(exc_value)
-                        if exc_value
-                        else None,
-                        Context.full_traceback.value: traceback_n,
-                        Context.error_line.value: None,
-                    }
-                    context[Context.execution.value][
-                        Context.status.value
-                    ] = Code.failed.value
-                    if mode in cls.atexit_modes:
-                        context[Context.prompt.value][
-                            Context.mode.value
-                        ] = cls.redirect_atexit.get(mode)
-                        p_mode = cls.redirect_atexit.get(mode)
-                        context[Context.prompt.value][
-                            Context.referer.value
-                        ] = mode.lower()
-                        referer = mode.upper()
-                    # Check the flag that indicates the mode has been dispatched
-                    if lint_suggestions:
-                        Context.prompt.value[Context.suggestions.value][
-                            Context.lint_suggestions.value
-                        ] = lint_suggestions
-                        Context.prompt.value[Context.suggestions.value][
-                            Context.linter.value
-                        ] = linter
-                    cls.channel.send(context)
-                    logger.debug(
-                        f"DISPATCHED `on error` for mode='{p_mode.upper()}'::referer='{referer}::startline={log.get('startline')}::endline={log.get('endline')}::error_line={line_number}::error_type={exc_type}::error_message={exc_value}'"
-                    )
-                    fixed = True
-                    break
+            log = get_log(mode)
+            context: Dict = (
+                cls.materialize_context(log.get(Context.context))
+                if log
+                and log.get(attribute.name) == attribute
+                and cls.watch_logs.claim(mode, log)
+                else None
+            )
+            if context:
+                context[Context.execution.value][Context.traceback.value] = {
+                    Context.exception_type.value: str(exc_type)
+                    if exc_type
+                    else None,
+                    Context.exception_message.value: str(exc_value)
+                    if exc_value
+                    else None,
+                    Context.full_traceback.value: traceback_n,
+                    Context.error_line.value: line_number,
+                }
+                context[Context.execution.value][
+                    Context.status.value
+                ] = Code.failed.value
+                if mode in cls.atexit_modes:
+                    context[Context.prompt.value][
+                        Context.mode.value
+                    ] = cls.redirect_atexit.get(mode)
+                    p_mode = cls.redirect_atexit.get(mode)
+                    context[Context.prompt.value][
+                        Context.referer.value
+                    ] = mode.lower()
+                    referer = mode.upper()
+                # Check the flag that indicates the mode has been dispatched
+                if lint_suggestions:
+                    context[Context.prompt.value][Context.suggestions.value][
+                        Context.lint_suggestions.value
+                    ] = lint_suggestions
+                    context[Context.prompt.value][Context.suggestions.value][
+                        Context.linter.value
+                    ] = linter
+                cls.__send(context)
+                logger.debug(
+                    f"DISPATCHED `on error` for mode='{p_mode.upper()}'::referer='{referer}::startline={log.get('startline')}::endline={log.get('endline')}::error_line={line_number}::error_type={exc_type}::error_message={exc_value}'"
+                )
+                fixed = True
 
         for mode in cls.on_error_modes:
             dispatch(mode)
@@ -846,6 +1384,8 @@ class Debugger(Object):
         #     for mode in cls.atexit_modes:
         #         dispatch(mode)
         logger.debug("Code Failed. No at exit mode was dispatched")
+        if not thread:
+            cls.log_error_counts()
 
     @__check_status
     def build(
@@ -877,9 +1417,10 @@ class Debugger(Object):
             sync (bool): Sync status of the code block.
             block (NamedTuple): Code block.
         """
-        # build code block tuple
-        block: block_object = self.__build_block(
+        context, block = self.build_template(
+            mode,
             startline,
+            subject,
             endline,
             style,
             body_index,
@@ -887,19 +1428,9 @@ class Debugger(Object):
             replace_syntax,
             remove_pattern,
         )
-        if not block.block:
+        if not context:
             return {}, False, block
-
-        # build context with code block
-        context = self.__build_context(
-            mode=mode,
-            startline=startline,
-            endline=block.endline,
-            subject=subject,
-            block=block.block,
-            block_comments=block.block_comments,
-            lined_block=block.lined_block,
-        )
+        context = self.copy_context(context)
         sync, context = self.__sync_modes(
             mode, context, block.startline, block.endline
         )  # synchronize all code blocks in a particular mode
@@ -909,6 +1440,159 @@ class Debugger(Object):
             )
         return context, sync, block
 
+    @__check_status
+    def build_template(
+        self,
+        mode: str,
+        startline: int,
+        subject=None,
+        endline: int = None,
+        style: str = Code.indent,
+        body_index: int = 0,
+        syntax_format: str = None,
+        replace_syntax: bool = True,
+        remove_pattern: str = None,
+    ) -> Tuple[types.MappingProxyType, block_object]:
+        """
+        Build the code block and an immutable context template for a specific mode.
+        The template holds everything known before the block runs; use `copy_context`
+        to get a mutable context to fill in the runtime fields (output, status, traceback).
+        Modes that only dispatch on error or at exit get a `LazyContext` template instead:
+        only the block coordinates are resolved and the block is built when dispatched.
+        Parameters:
+            The same as `build`.
+        Returns:
+            template (MappingProxyType | LazyContext): Read-only context for the cli-engine or None if the block is invalid.
+            block (NamedTuple): Code block. Only the startline and endline are set for a `LazyContext`.
+        """
+        if mode not in self.instant_modes:
+            if not 0 < startline <= self.__caller_source.lenght:
+                return None, block_object(None, startline, endline, None, None)
+            endline = self.__get_endline(
+                startline,
+                endline,
+                style,
+                syntax_format,
+                replace_syntax,
+                self.__get_source_index()
+                if style == Code.indent and not endline
+                else None,
+            )
+            template = LazyContext(
+                startline,
+                endline,
+                partial(
+                    self.__build_template_context,
+                    mode,
+                    startline,
+                    subject,
+                    endline,
+                    style,
+                    body_index,
+                    remove_pattern=remove_pattern,
+                ),
+            )
+            return template, block_object(None, startline, endline, None, None)
+        context, block = self.__build_template_context(
+            mode,
+            startline,
+            subject,
+            endline,
+            style,
+            body_index,
+            syntax_format,
+            replace_syntax,
+            remove_pattern,
+            with_block=True,
+        )
+        return (self.freeze_context(context) if context else None), block
+
+    def __build_template_context(
+        self,
+        mode: str,
+        startline: int,
+        subject=None,
+        endline: int = None,
+        style: str = Code.indent,
+        body_index: int = 0,
+        syntax_format: str = None,
+        replace_syntax: bool = True,
+        remove_pattern: str = None,
+        with_block: bool = False,
+    ) -> Union[Dict, Tuple[Dict, block_object]]:
+        """
+        Build the code block and its context.
+        Parameters:
+            The same as `build`.
+            with_block (bool): Also return the code block.
+        Returns:
+            context (Dict): Context for the cli-engine or None if the block is invalid.
+            block (NamedTuple): Code block if with_block is set.
+        """
+        # build code block tuple
+        block: block_object = self.__build_block(
+            startline,
+            endline,
+            style,
+            body_index,
+            syntax_format,
+            replace_syntax,
+            remove_pattern,
+        )
+        # build context with code block
+        context = (
+            self.__build_context(
+                mode=mode,
+                startline=startline,
+                endline=block.endline,
+                subject=subject,
+                block=block.block,
+                block_comments=block.block_comments,
+                lined_block=block.lined_block,
+            )
+            if block.block
+            else None
+        )
+        return (context, block) if with_block else context
+
+    @staticmethod
+    def materialize_context(context: Union[Dict, LazyContext]) -> Optional[Dict]:
+        """
+        Get the context dict of a context, building a `LazyContext` if needed.
+        """
+        if isinstance(context, LazyContext):
+            return context.materialize()
+        return context
+
+    @staticmethod
+    def freeze_context(context: Dict) -> types.MappingProxyType:
+        """
+        Get a read-only view of a context and its nested sections.
+        """
+        return types.MappingProxyType(
+            {
+                key: Debugger.freeze_context(value) if isinstance(value, dict) else value
+                for key, value in context.items()
+            }
+        )
+
+    @staticmethod
+    def copy_context(
+        template: Union[types.MappingProxyType, LazyContext]
+    ) -> Union[Dict, LazyContext]:
+        """
+        Get a mutable copy of a context template. Source strings are shared, not copied.
+        A `LazyContext` template is copied unbuilt.
+        """
+        if isinstance(template, LazyContext):
+            return template.copy()
+        return {
+            key: Debugger.copy_context(value)
+            if isinstance(value, types.MappingProxyType)
+            else value
+            for key, value in template.items()
+        }
+
     def __build_block(
         self,
         startline: int,
@@ -935,7 +1619,7 @@ class Debugger(Object):
 
         def omit(startline: int, endline: int, pattern: str = None) -> str:
             # Remove a particular pattern from the code block
-            iter_list: List[str] = self.__caller_source.lines[startline - 1 : endline]
+            iter_list: List[str] = self.__caller_source.get_lines(startline, endline)
             lined_block_string = str()
             logger.debug(f"OMITTING: {pattern}")
             result = str()
@@ -989,57 +1673,32 @@ class Debugger(Object):
             return result, lined_block_string
 
         try:
-            if not endline:
-                endline = self.__caller_source.lenght
-                if style == Code.indent:
-                    first_line = self.__caller_source.lines[startline - 1]
-                    strips = len(first_line) - len(first_line.lstrip())
-                    # Get the endline of a code block using the indent style
-                    for line in range(startline + 1, endline):
-                        if (
-                            len(self.__caller_source.lines[line])
-                            - len(self.__caller_source.lines[line].lstrip())
-                            == strips
-                        ):
-                            endline = line
-                            break
-                elif style == Code.syntax:
-                    for line in range(startline, endline):
-                        if syntax_format.lower() in self.__source_lines[line].lower():
-                            # Maintain end syntax.
-                            if replace_syntax:
-                                # Remove so another break point method would find its end syntax
-                                self.__source_lines.pop(line)
-                                self.__source_lines.insert(
-                                    line,
-                                    f"Debugger inserted placeholder in line {line+1}",
-                                )
-                            endline = line + 1
-                            break
+            source_index: SymbolIndex = (
+                self.__get_source_index() if style == Code.indent else None
+            )
+            endline = self.__get_endline(
+                startline, endline, style, syntax_format, replace_syntax, source_index
+            )
             block, lined_block = omit(
                 startline,
                 endline,
                 remove_pattern,
             )
-            # Get the ast of the code block
-            block_ast = (
-                (
-                    self.script_utils.get_ast(block)
-                    if self.language == Language.python
-                    else None
+            if source_index:
+                # Get the comments/docstring of the code block from the parsed source
+                block_comments = (
+                    self.script_utils.get_comments(source_index.tree.body[body_index])
+                    if body_index
+                    else source_index.get_docstring(startline)
                 )
-                if style != Code.indent
-                else (
-                    (
-                        self.script_utils.get_ast(self.__caller_source.string).body[
-                            body_index
-                        ]
-                        if body_index
-                        else self.script_utils.get_ast(self.__caller_source.string)
-                    )
-                    if self.language == Language.python
-                    else None
+                return block_object(
+                    block, startline, endline, block_comments, lined_block
                 )
+            # Get the ast of the code block
+            block_ast = (
+                self.script_utils.get_ast(block)
+                if self.language == Language.python and style != Code.indent
+                else None
             )
             # Get the comments/docstring of the code block if language is python
             block_comments = (
@@ -1052,6 +1711,104 @@ class Debugger(Object):
             )
             return block_object(None, startline, endline, None, None)
 
+    def __get_endline(
+        self,
+        startline: int,
+        endline: int = None,
+        style: str = Code.indent,
+        syntax_format: str = None,
+        replace_syntax: bool = True,
+        source_index: SymbolIndex = None,
+    ) -> int:
+        """
+        Get the endline of a code block without extracting the block.
+        Parameters:
+            The same as `__build_block`.
+            source_index (SymbolIndex): Statement index of the source for the indent style.
+        Returns:
+            The endline of the code block.
+        """
+        if endline:
+            return endline
+        endline = self.__caller_source.lenght
+        span = source_index.get_span(startline) if source_index else None
+        if style == Code.indent and span:
+            # Get the endline of a code block from the statement span index
+            endline = span[1]
+        elif style == Code.indent:
+            first_line = self.__caller_source.get_line(startline)
+            strips = len(first_line) - len(first_line.lstrip())
+            # Get the endline of a code block using the indent style
+            for line in range(startline + 1, endline):
+                text = self.__caller_source.get_line(line + 1)
+                if len(text) - len(text.lstrip()) == strips:
+                    endline = line
+                    break
+        elif style == Code.syntax:
+            syntax_endline = self.__get_syntax_endline(startline, syntax_format)
+            if syntax_endline:
+                # Maintain end syntax.
+                if replace_syntax:
+                    # Remove so another break point method would find its end syntax
+                    self.__replaced_lines[
+                        syntax_endline
+                    ] = f"Debugger inserted placeholder in line {syntax_endline}"
+                endline = syntax_endline
+        return endline
+
+    def __get_syntax_endline(self, startline: int, syntax_format: str) -> int:
+        """
+        Get the line of the end syntax closing a syntax style code block.
+        Parameters:
+            startline (int): Start line of the code block.
+            syntax_format (str): Syntax format of the end of the code block.
+        Returns:
+            The endline or None if the end syntax is not found.
+        """
+        syntax_format = syntax_format.lower()
+        for line in range(startline, self.__caller_source.lenght):
+            text: str = self.__replaced_lines.get(
+                line + 1
+            ) or self.__caller_source.get_line(line + 1)
+            if syntax_format in text.lower():
+                return line + 1
+        return None
+
+    def get_sampler(self, sampler: Union[str, BaseSampler] = None) -> BaseSampler:
+        """
+        Get a sampler by name. Named samplers are shared by all calls using the same name.
+        Parameters:
+            sampler (str | BaseSampler): Sampler or sampler name. Default is `config.sampler`.
+        Returns:
+            BaseSampler or None if every call should be debugged.
+        """
+        sampler = sampler or config.sampler
+        if not sampler or isinstance(sampler, BaseSampler):
+            return sampler
+        if sampler not in self.samplers:
+            member: Sampler = Sampler.__dict__.get(Enums.members).get(sampler)
+            if not member:
+                logger.warning(
+                    f"`{sampler}` sampler not supported by DEBUGGER. Every call is debugged."
+                )
+                return None
+            self.samplers[sampler] = member.value()
+        return self.samplers[sampler]
+
+    def __get_source_index(self) -> SymbolIndex:
+        """
+        Get the cached symbol span index of the caller source.
+        Returns:
+            SymbolIndex or None if the language is not python or the source can't be parsed.
+        """
+        if self.language != Language.python:
+            return None
+        # Parsed on first access and memoized by the caller source
+        source_index: SymbolIndex = self.__caller_source.index
+        if source_index is None:
+            logger.debug(f"SOURCE-INDEX `unavailable` for {self.__caller}.")
+        return source_index
+
     def __build_context(
         self,
         mode: str = None,
@@ -1094,7 +1851,6 @@ class Debugger(Object):
                     Context.exception_message.value: exception_message,
                     Context.full_traceback: full_traceback,
                     Context.error_line: error_line,
-                    Context.pid.value: self.__caller_pid,
                 },
                 Context.status.value: status,
                 Context.args.value: self.__caller_args,
@@ -1103,33 +1859,42 @@ class Debugger(Object):
             Context.source.value: {
                 Context.startline.value: str(startline),
                 Context.endline.value: str(endline),
-                Context.code.value: self.__caller_source.string,
                 Context.block.value: block,
-                Context.lined_code.value: self.__caller_source.lined_string,
+                Context.source_hash.value: self.__source_hash,
                 Context.linenos.value: str(self.__caller_source.lenght),
                 Context.language.value: self.language,
                 Context.block_comments.value: block_comments,
                 Context.source_path.value: self.__caller,
                 Context.lined_block.value: lined_block,
-                Context.source_list.value: self.__caller_source.lines,
             },
             Context.prompt.value: {
                 Context.suggestions.value: {
-                    Context.lint_suggestions.value: self.lint_suggestions,
-                    Context.linter.value: self.linter.linter_name,
+                    Context.lint_suggestions.value: self.get_lint_suggestions(
+                        startline=startline, endline=endline
+                    ),
+                    Context.linter.value: self.linter.linter_name
+                    if self.linter
+                    else None,
                     Context.subject.value: subject,
                 },
                 Context.mode.value: mode,
                 Context.referer.value: referer,
             },
         }
+        if not self.__source_hash:
+            # The source store is not writable, embed the full source instead
+            context[Context.source.value][
+                Context.code.value
+            ] = self.__caller_source.string
         # logger.debug(f"'CONTEXT'::context_dict={context}")
         return context
 
     @__check_status
     def debugger_end_breakpoint(self):
         if self.language == Language.python:
-            endline = self.runtime_info.get_stack_caller_frame().lineno
+            endline = self.runtime_info.get_stack_caller_frame(
+                self.__caller_filename
+            ).lineno
             logger.debug(f"'ENDBREAKPOINT'::endline={endline}")
 
     @classmethod
@@ -1144,26 +1909,26 @@ class Debugger(Object):
             lint_suggestions (str): Lint suggestions of the executed code.
             linter (str): Lint format of the executed code.
         """
+        cls.dispatch_worker_errors()
+        # The program is ending, wait for a report still being linted so it gets cached
+        cls.get_lint_suggestions(config.lint_timeout)
 
         def dispatch(mode: str):
-            redirect_logs: List[Dict] = cls.watch_logs.get(
-                cls.redirect_on_error.get(mode), []
-            )
             mode_logs: List[Dict] = cls.watch_logs.get(mode, [])
             for log in mode_logs:
-                if not log[Context.flag]:
-                    context = log.get(Context.context)
+                context: Dict = (
+                    cls.materialize_context(log.get(Context.context))
+                    if not log[Context.flag] and log[Context.sampled]
+                    else None
+                )
+                if context:
                     # Redirect all error modes to improve ... if the fix code block isnt within a previous improve code block
                     if mode in cls.on_error_modes:
-                        if any(
-                            [
-                                improve
-                                for improve in redirect_logs
-                                if log.get(Context.startline)
-                                >= improve.get(Context.startline)
-                                and log.get(Context.endline)
-                                <= improve.get(Context.endline)
-                            ]
+                        improve: Dict = cls.watch_logs.get_enclosing(
+                            cls.redirect_on_error.get(mode), log.get(Context.startline)
+                        )
+                        if improve and log.get(Context.endline) <= improve.get(
+                            Context.endline
                         ):
                             continue
                         context[Context.prompt.value][
@@ -1195,3 +1960,4 @@ class Debugger(Object):
         for mode in cls.atexit_modes:  # + cls.on_error_modes:
             dispatch(mode)
         logger.debug("Code Executed successfully. No on error mode was dispatched")
+        cls.log_error_counts()
@@ -0,0 +1,139 @@
+import time
+import threading
+import traceback
+from collections import OrderedDict
+from sani.utils.custom_types import Dict, List, Tuple, types
+from sani.core.config import Config
+
+config = Config()
+
+
+class ErrorFingerprints:
+    """
+    Bounded LRU of the errors raised in the caller script, with their occurrence counters.
+    An error is fingerprinted by its type and its frames in the caller script, normalized to
+    the function and the line offset within it, so the same bug raised by many threads has
+    a single fingerprint. A fingerprint goes through the dispatch path at most `limit` times
+    per `window` seconds; the other occurrences only increment its counters, which are
+    attached to the next dispatched context (see `drain`) and reported once per window
+    (see `report_suppressed`).
+    Observing an error is O(1) in the number of errors and code blocks.
+    """
+
+    def __init__(
+        self, capacity: int = None, window: float = None, limit: int = None
+    ) -> None:
+        """
+        Parameters:
+            capacity (int): Fingerprints kept, the least recently seen are dropped first.
+            window (float): Seconds of the rate limit window of a fingerprint.
+            limit (int): Occurrences of a fingerprint dispatched per window.
+        """
+        self.capacity: int = config.error_capacity if capacity is None else capacity
+        self.window: float = config.error_window if window is None else window
+        self.limit: int = config.error_limit if limit is None else limit
+        # fingerprint -> [count, suppressed count, window start, dispatches in window,
+        # suppression reported in window]
+        self.entries: "OrderedDict[Tuple, List]" = OrderedDict()
+        # Fingerprints with occurrences suppressed since the last drain
+        self.suppressed: Dict[Tuple, List] = dict()
+        self.lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def get_fingerprint(
+        exc_type: type, exc_traceback: types.TracebackType, filename: str
+    ) -> Tuple:
+        """
+        Get the fingerprint of an error: its type and its frames in the caller script.
+        Parameters:
+            exc_type (type): Type of the error.
+            exc_traceback (TracebackType): Traceback of the error.
+            filename (str): Filename of the caller script.
+        """
+        return (
+            getattr(exc_type, "__qualname__", str(exc_type)),
+            tuple(
+                (frame.f_code.co_name, lineno - frame.f_code.co_firstlineno)
+                for frame, lineno in traceback.walk_tb(exc_traceback)
+                if frame.f_code.co_filename == filename
+            ),
+        )
+
+    def observe(self, fingerprint: Tuple) -> bool:
+        """
+        Count an occurrence of an error.
+        Returns:
+            True if the occurrence should be dispatched, False if it is only counted.
+        """
+        now: float = time.monotonic()
+        with self.lock:
+            entry: List = self.entries.get(fingerprint)
+            if entry is None:
+                entry = self.entries[fingerprint] = [0, 0, now, 0, False]
+                if len(self.entries) > self.capacity:
+                    evicted, _ = self.entries.popitem(last=False)
+                    self.suppressed.pop(evicted, None)
+            else:
+                self.entries.move_to_end(fingerprint)
+            entry[0] += 1
+            if now - entry[2] >= self.window:
+                entry[2], entry[3], entry[4] = now, 0, False
+            if entry[3] < self.limit:
+                entry[3] += 1
+                return True
+            entry[1] += 1
+            self.suppressed[fingerprint] = entry
+            return False
+
+    def report_suppressed(self, fingerprint: Tuple) -> int:
+        """
+        Get the suppressed occurrences of an error to report, once per window.
+        Returns:
+            The occurrences suppressed since the last drain, 0 if the suppression of the
+            current window was already reported.
+        """
+        with self.lock:
+            entry: List = self.entries.get(fingerprint)
+            if not entry or entry[4]:
+                return 0
+            entry[4] = True
+            return entry[1]
+
+    def get_count(self, fingerprint: Tuple) -> int:
+        """
+        Get the occurrences of an error since it was first seen.
+        """
+        entry: List = self.entries.get(fingerprint)
+        return entry[0] if entry else 0
+
+    def drain(self) -> List[Dict]:
+        """
+        Get and reset the counters of the errors suppressed since the last drain.
+        Returns:
+            The type, frames, total and suppressed occurrences of each error.
+        """
+        if not self.suppressed:
+            return []
+        with self.lock:
+            pending, self.suppressed = self.suppressed, dict()
+            counters: List[Tuple] = [
+                (fingerprint, entry[0], entry[1])
+                for fingerprint, entry in pending.items()
+            ]
+            for entry in pending.values():
+                entry[1] = 0
+        return [
+            {
+                "exception_type": exception_type,
+                "frames": [list(frame) for frame in frames],
+                "count": count,
+                "suppressed": suppressed,
+            }
+            for (exception_type, frames), count, suppressed in counters
+        ]
+
+    def after_fork(self) -> None:
+        """
+        Recreate the lock in a forked child process, it may be held by a parent thread.
+        """
+        self.lock = threading.Lock()
@@ -1,4 +1,88 @@
-from sani.utils.custom_types import Enum, ABC, abstractmethod
+from sani.utils.custom_types import (
+    Enum,
+    ABC,
+    abstractmethod,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    lint_record,
+    TYPE_CHECKING,
+)
+from bisect import bisect_left, bisect_right
+import os
+
+if TYPE_CHECKING:
+    from sani.core.lint import LinterProcess
+import re
+
+
+class LintReport:
+    """
+    Lint records of a script sorted by line, so the records of a code block are found by
+    bisecting the lines instead of sending the whole report with every block.
+    The formatted records of a block are cached, reports of several linters can be merged.
+    Reports of linters without a record format only keep their text, see `get_block`.
+    """
+
+    def __init__(self, records: List[lint_record] = None, text: str = None) -> None:
+        """
+        Parameters:
+            records (List[lint_record]): Records of the report, in any order.
+            text (str): Text of a report which could not be parsed to records.
+        """
+        self.records: Optional[List[lint_record]] = (
+            sorted(records) if records is not None else None
+        )
+        self.lines: List[int] = [record.line for record in self.records or []]
+        self.text: str = text or str()
+        self.blocks: Dict[Tuple[int, int], str] = dict()
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def get_records(
+        self, startline: int = None, endline: int = None
+    ) -> List[lint_record]:
+        """
+        Get the records of the lines `startline` to `endline` included.
+        """
+        start: int = bisect_left(self.lines, startline) if startline else 0
+        end: int = bisect_right(self.lines, endline) if endline else len(self.lines)
+        return (self.records or [])[start:end]
+
+    def get_block(self, startline: int = None, endline: int = None) -> str:
+        """
+        Get the formatted records of a code block, the whole report without a block.
+        Returns:
+            The records one per line or the text of a report without records.
+        """
+        if self.records is None:
+            return self.text
+        key: Tuple[int, int] = (startline, endline)
+        if key not in self.blocks:
+            self.blocks[key] = "\n".join(
+                self.format_record(record)
+                for record in self.get_records(startline, endline)
+            )
+        return self.blocks[key]
+
+    @staticmethod
+    def format_record(record: lint_record) -> str:
+        return (
+            f"{record.line}:{record.column}: [{record.code}] {record.severity}: "
+            f"{record.message}"
+        )
+
+    @classmethod
+    def merge(cls, *reports: "LintReport") -> "LintReport":
+        """
+        Merge the reports of several linters of a script.
+        """
+        return cls(
+            [record for report in reports for record in report.records or []],
+            "\n".join(report.text for report in reports if report.records is None),
+        )
 
 
 class BaseLinter(ABC):
@@ -8,6 +92,10 @@ class BaseLinter(ABC):
     """
 
     linter_name: str = None
+    # Format of a record in the report, reports without it are kept as text
+    record_pattern: "re.Pattern" = None
+    # Severity of the records by first letter of their code
+    severities: Dict[str, str] = dict()
 
     def __init__(self, *args, **kwargs) -> None:
         self.args = args
@@ -20,6 +108,38 @@ class BaseLinter(ABC):
         """
         raise NotImplementedError()
 
+    def get_options(self) -> Dict:
+        """
+        Get the options changing the report of the linter, reports are cached by options
+        """
+        return dict()
+
+    def parse_report(self, report: str) -> LintReport:
+        """
+        Parse a report of the linter to its records.
+        """
+        if not self.record_pattern:
+            return LintReport(text=report)
+        return LintReport(
+            [
+                lint_record(
+                    int(match.group("line")),
+                    int(match.group("column")),
+                    match.group("code"),
+                    match.groupdict().get("severity")
+                    or self.severities.get(match.group("code")[:1], "warning"),
+                    match.group("message").strip(),
+                )
+                for match in self.record_pattern.finditer(report or str())
+            ]
+        )
+
+    def get_records(self, filepath: str = None) -> LintReport:
+        """
+        Get the records of a script from the linter
+        """
+        return self.parse_report(self.get_report(filepath))
+
 
 class PyLinter(BaseLinter):
     """
@@ -27,29 +147,91 @@ class PyLinter(BaseLinter):
     """
 
     linter_name = "pylint"
+    # path:line:column: code: message (symbol)
+    record_pattern = re.compile(
+        r"^.+?:(?P<line>\d+):(?P<column>\d+): (?P<code>[A-Z]\d+): (?P<message>.*)$",
+        re.MULTILINE,
+    )
+    severities = {
+        "F": "fatal",
+        "E": "error",
+        "W": "warning",
+        "R": "refactor",
+        "C": "convention",
+        "I": "info",
+    }
 
     def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.run = None
+        # Modification times of the modules parsed by astroid, see `refresh`
+        self.module_mtimes: Dict[str, int] = dict()
+
+    def load(self) -> None:
+        """
+        Import pylint on first use, it takes longer than most scripts to import
+        """
         from pylint.lint import Run
         from pylint.reporters.text import TextReporter
+        from astroid import MANAGER
         from io import StringIO
 
-        super().__init__(*args, **kwargs)
-        self.pylint_output = StringIO()  # Custom open stream
-        self.reporter = TextReporter(self.pylint_output)
+        self.stream = StringIO
+        self.reporter = TextReporter
         self.run = Run
+        self.astroid_manager = MANAGER
+
+    def get_options(self) -> Dict:
+        from pylint import __version__
+
+        return {"version": __version__}
 
     def get_report(self, filepath: str = None) -> str:
         """
         Get a report from the linter
         """
+        if not self.run:
+            self.load()
+        filepath = filepath or self.kwargs.get("filepath")
+        self.refresh(filepath)
+        # A new stream and reporter per run, reports of the previous runs are not repeated
+        pylint_output = self.stream()  # Custom open stream
         self.run(
-            [filepath or self.kwargs.get("filepath")],
-            reporter=self.reporter,
+            [filepath],
+            reporter=self.reporter(pylint_output),
             exit=False,
         )
-        suggestions = self.pylint_output.getvalue()  # Retrieve  the text report
+        self.refresh()
+        suggestions = pylint_output.getvalue()  # Retrieve  the text report
         return suggestions
 
+    def refresh(self, filepath: str = None) -> None:
+        """
+        Drop the modules changed since astroid parsed them from its cache, the unchanged
+        modules (the standard library, the installed packages) are not parsed again by the
+        next runs of the same linter. Modules parsed since the last refresh are recorded.
+        Parameters:
+            filepath (str): Path of the script to lint, always parsed again.
+        """
+        linted: Optional[str] = os.path.abspath(filepath) if filepath else None
+        cache: Dict = self.astroid_manager.astroid_cache
+        for name, module in list(cache.items()):
+            path: Optional[str] = getattr(module, "file", None)
+            if not path:
+                continue
+            try:
+                mtime: Optional[int] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if (
+                os.path.abspath(path) == linted
+                or self.module_mtimes.get(path, mtime) != mtime
+            ):
+                cache.pop(name, None)
+                self.module_mtimes.pop(path, None)
+            else:
+                self.module_mtimes[path] = mtime
+
 
 class Flake8Linter(BaseLinter):
     """
@@ -57,22 +239,51 @@ class Flake8Linter(BaseLinter):
     """
 
     linter_name = "flake8"
+    # path:line:column: [code] message : physical line, see `get_report`
+    record_pattern = re.compile(
+        r"^.+?:(?P<line>\d+):(?P<column>\d+): \[(?P<code>[A-Z]+\d+)\] "
+        r"(?P<message>.*?)(?: : .*)?$",
+        re.MULTILINE,
+    )
+    severities = {
+        "F": "error",
+        "E": "error",
+        "W": "warning",
+        "C": "convention",
+        "N": "convention",
+    }
 
     def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.style_guide = None
+
+    def load(self) -> None:
+        """
+        Import flake8 and build its style guide on first use
+        """
         from flake8.api import legacy as flake8
         import operator
 
-        super().__init__(*args, **kwargs)
         self.style_guide = flake8.get_style_guide(
-            max_line_length=kwargs.get("max_line_length") or 120,
+            max_line_length=self.kwargs.get("max_line_length") or 120,
             format="pylint",
         )
         self.operator = operator
 
+    def get_options(self) -> Dict:
+        from flake8 import __version__
+
+        return {
+            "version": __version__,
+            "max_line_length": self.kwargs.get("max_line_length") or 120,
+        }
+
     def get_report(self, filepath: str = None) -> str:
         """
         Get a report from the linter
         """
+        if not self.style_guide:
+            self.load()
         suggestions = str()
         report = self.style_guide.check_files([filepath or self.kwargs.get("filepath")])
         results = report._application.file_checker_manager.results
@@ -131,6 +342,131 @@ class HtmlLinter(BaseLinter):
         return suggestions
 
 
+class CompositeLinter(BaseLinter):
+    """
+    The CompositeLinter class runs several linters in parallel, each in a worker process of
+    its own (see `sani.core.lint.LinterProcess`), and merges their records. A finding
+    reported by more than one linter is kept once, from the first linter reporting it.
+    A linter over `timeout` seconds is skipped, so the lint time is the one of the slowest
+    linter and never their sum.
+    """
+
+    linter_name = "composite"
+    default_linters: Tuple[str, ...] = ("pylint", "flake8")
+    # line:column: [code] severity: message, see `LintReport.format_record`
+    record_pattern = re.compile(
+        r"^(?P<line>\d+):(?P<column>\d+): \[(?P<code>[^\]]+)\] "
+        r"(?P<severity>\w+): (?P<message>.*)$",
+        re.MULTILINE,
+    )
+    # Codes of the same finding from different linters, to the code they are kept as
+    equivalent_codes: Dict[str, str] = {
+        "E501": "C0301",  # line-too-long
+        "W291": "C0303",  # trailing-whitespace
+        "W293": "C0303",
+        "W292": "C0304",  # missing-final-newline
+        "W391": "C0305",  # trailing-newlines
+        "E401": "C0410",  # multiple-imports
+        "E701": "C0321",  # multiple-statements
+        "E702": "C0321",
+        "E703": "W0301",  # unnecessary-semicolon
+        "E711": "C0121",  # singleton-comparison
+        "E712": "C0121",
+        "E722": "W0702",  # bare-except
+        "F401": "W0611",  # unused-import
+        "F403": "W0401",  # wildcard-import
+        "F541": "W1309",  # f-string-without-interpolation
+        "F821": "E0602",  # undefined-variable
+        "F841": "W0612",  # unused-variable
+        "W605": "W1401",  # anomalous-backslash-in-string
+    }
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Parameters:
+            linters (List[str] | Dict[str, Dict]): Names of the linters to run, with their
+                options. Default is pylint and flake8 with the options of the composite.
+            timeout (float): Seconds a linter may take. Default is `SANI_LINTER_TIMEOUT`.
+        """
+        from sani.core.config import Config
+
+        super().__init__(*args, **kwargs)
+        linters = kwargs.pop("linters", None) or self.default_linters
+        self.timeout: float = kwargs.pop("timeout", None) or Config.linter_timeout
+        self.linters: Dict[str, BaseLinter] = {
+            name: Linter[name].value(
+                **(linters[name] if isinstance(linters, dict) else kwargs)
+            )
+            for name in linters
+        }
+        for name, linter in self.linters.items():
+            if not linter.record_pattern:
+                raise ValueError(f"`{name}` linter reports can't be merged")
+        self.processes: Dict[str, "LinterProcess"] = dict()
+
+    def load(self) -> None:
+        """
+        Create the worker processes of the linters, started on first report
+        """
+        from sani.core.lint import LinterProcess
+
+        self.processes = {
+            name: LinterProcess(name, linter.get_options())
+            for name, linter in self.linters.items()
+        }
+
+    def get_options(self) -> Dict:
+        return {
+            "linters": {
+                name: linter.get_options() for name, linter in self.linters.items()
+            },
+            "timeout": self.timeout,
+        }
+
+    def get_report(self, filepath: str = None) -> str:
+        """
+        Get the merged report of the linters
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not self.processes:
+            self.load()
+        filepath = filepath or self.kwargs.get("filepath")
+        with ThreadPoolExecutor(len(self.processes)) as pool:
+            reports: List[Optional[str]] = list(
+                pool.map(
+                    lambda process: process.get_report(filepath, self.timeout),
+                    self.processes.values(),
+                )
+            )
+        records: List[lint_record] = self.merge_records(
+            [
+                self.linters[name].parse_report(report)
+                for name, report in zip(self.processes, reports)
+                if report is not None
+            ]
+        )
+        return "\n".join(LintReport.format_record(record) for record in records)
+
+    def merge_records(self, reports: List[LintReport]) -> List[lint_record]:
+        """
+        Merge the records of the linters, dropping the findings already reported on the
+        same line by a previous linter.
+        """
+        seen: set = set()
+        records: List[lint_record] = []
+        for report in reports:
+            keys: List[Tuple[int, str]] = [
+                (record.line, self.equivalent_codes.get(record.code, record.code))
+                for record in report.records
+            ]
+            records.extend(
+                record for record, key in zip(report.records, keys) if key not in seen
+            )
+            seen.update(keys)
+        return sorted(records)
+
+
 class Linter(Enum):
     """
     Enum for linters
@@ -140,4 +476,5 @@ class Linter(Enum):
     pylint = PyLinter
     pyjslint = PyJsLint
     htmllint = HtmlLinter
+    composite = CompositeLinter
     disable = None
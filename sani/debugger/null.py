@@ -0,0 +1,56 @@
+import os
+
+
+def is_disabled() -> bool:
+    """
+    Check `SANI_DISABLE` without loading the configuration and its dependencies.
+    """
+    return bool(int(os.getenv("SANI_DISABLE", "0") or 0))
+
+
+def identity(function):
+    """
+    Decorator returning the decorated function unchanged.
+    """
+    return function
+
+
+class NullDebugger:
+    """
+    Debugger used when sani is disabled with `SANI_DISABLE`.
+    A stateless singleton that adds nothing to the debugged script:
+    * `wrap` returns the decorated function object itself.
+    * `with debug(...)` enters and exits without doing anything and never suppresses errors.
+    * `debug`, `breakpoint` and `debugger_end_breakpoint` accept any arguments and do nothing.
+    Importing it loads no linter, channel or process utilities.
+    """
+
+    __slots__ = ()
+    disable: bool = True
+    instance: "NullDebugger" = None
+
+    def __new__(cls, *args, **kwargs) -> "NullDebugger":
+        if cls.instance is None:
+            cls.instance = super().__new__(cls)
+        return cls.instance
+
+    def wrap(self, *args, **kwargs):
+        return identity
+
+    def __call__(self, *args, **kwargs) -> "NullDebugger":
+        return self
+
+    def __enter__(self) -> "NullDebugger":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+    def debug(self, *args, **kwargs) -> None:
+        return None
+
+    def breakpoint(self, *args, **kwargs) -> None:
+        return None
+
+    def debugger_end_breakpoint(self, *args, **kwargs) -> None:
+        return None
@@ -13,6 +13,7 @@ from sani.utils.custom_types import (
     Language,
 )
 from sani.utils.exception import UnterminatedCommentError
+from sani.debugger.source import MappedSource
 
 
 class BaseParser(ABC):
@@ -37,222 +38,309 @@ class BaseParser(ABC):
         """
         pass
 
+    def iter_comments(self, source: MappedSource) -> Generator[Comment, None, None]:
+        """Yields the comments of a memory-mapped source file as they are found.
+
+        Parsers with a streaming scanner override this to scan the mapped file in
+        constant memory, the others extract the comments of the whole decoded source.
+
+        Args:
+            source: Memory-mapped source file.
+        Returns:
+            Generator of Comment in the order that they appear in the code.
+        """
+        yield from self.extract_attributes(io.StringIO(source.read()))[0]
+
 
 class PythonParser(BaseParser):
     language = Language.python
     """This class provides methods for parsing comments from Python scripts."""
 
+    # Statement boundaries a docstring can follow
+    statement_tokens = frozenset(
+        (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT, tokenize.ENCODING)
+    )
+    # Tokens skipped when looking for the statement boundaries around a string
+    skipped_tokens = frozenset((tokenize.NL, tokenize.COMMENT))
+    # Fallback scanner for sources that cannot be tokenized
+    scanner: re.Pattern = re.compile(
+        r"""
+        (?P<docstring> [rRuUbBfF]{0,2}(?:"{3}[\s\S]*?"{3}|'{3}[\s\S]*?'{3})) |
+        (?P<unterminated> [rRuUbBfF]{0,2}(?:"{3}|'{3})[\s\S]*) |
+        (?P<string> [rRuUbBfF]{0,2}(?:"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')) |
+        (?P<comment> \#[^\n]*)
+        """,
+        re.VERBOSE,
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    # def extract_attributes(
-    #     self, source: io.TextIOWrapper
-    # ) -> Tuple[List[Comment], List[str], str, int, str]:
-    #     """Extracts a list of comments from the given Python script.
-
-    #     Comments are identified using the tokenize module. Does not include function,
-    #     class, or module docstrings. All comments are single line comments.
-
-    #     Args:
-    #         source: String containing source code to extract comments from.
-    #     Returns:
-    #         Python list of Comment in the order that they appear in the code.
-    #     Raises:
-    #         tokenize.TokenError
-    #     """
-    #     source: str = source.read() if isinstance(source, io.TextIOWrapper) else source
-
-    #     comments = []
-    #     source_list = []
-    #     lined_source = str()
-    #     tokens: Generator = tokenize.tokenize(io.BytesIO(source.encode()).readline)
-    #     for toknum, tokstring, tokloc, _, _ in tokens:
-    #         line = tokloc[0]
-    #         if toknum is tokenize.COMMENT:
-    #             # Removes leading '#' character.
-    #             tokstring = tokstring[1:]
-    #             comments.append(Comment(tokstring, line, False))
-    #         source_list.append(tokstring)
-    #         lined_source += f"{line}:{tokstring}"
-    #     return comments, source_list, lined_source, line, source
-
     def extract_attributes(
         self,
         code: io.TextIOWrapper,
     ) -> Tuple[List[Comment], List[str], str, int, str]:
-        code: str = code.read()
-        source_list = []
-        pattern = r"""(?<!["'`])#+\s*(.*)"""
-        single_qoute = "'''"
-        not_single_syntax = '"' + single_qoute
-        double_qoute = '"""'
-        not_double_syntax = "'" + double_qoute
-        comments: List[Comment] = []
-        closing_count = 0
-        lined_source: str = str()
-        copy: bool = False
-        line_counter = 0
-        content: str = str()
-        source = str()
-        for line_number, line in enumerate(code, start=1):
-            line_counter += 1
-            syntax = (
-                single_qoute
-                if (single_qoute in line and not_single_syntax not in line)
-                else double_qoute
-                if (double_qoute in line and not_double_syntax not in line)
-                else None
+        """Extracts the comments and docstrings from the given Python source code.
+
+        Comments and docstrings are collected in a single `tokenize` pass, so `#`
+        characters and quotes nested in string literals are never mistaken for them.
+        A docstring is a triple-quoted string standing as a statement on its own.
+        Sources that cannot be tokenized are scanned with a regular expression instead.
+        The source outputs are built with joins, in linear time.
+
+        Args:
+            code: String or file containing code to extract comments from.
+        Returns:
+            Python list of Comment in the order that they appear in the code, the lines
+            of the code, the code with line numbers, the number of lines and the code.
+        """
+        code: str = code.read() if isinstance(code, io.IOBase) else code
+        source_list: List[str] = code.splitlines(keepends=True)
+        lined_source: str = "".join(
+            f"{line_number}:{line}"
+            for line_number, line in enumerate(source_list, start=1)
+        )
+        try:
+            comments: List[Comment] = list(
+                self.tokenize_comments(
+                    tokenize.generate_tokens(io.StringIO(code).readline)
+                )
             )
-            print(syntax)
-            if syntax:
-                closing_count += 1
-                copy = True
-                if line.count(syntax) == 2:
-                    # Start and end on same line
-                    closing_count = 2
-                    content = line.replace("\n", " ")
-                    start_line = line_number
-                if closing_count % 2 == 0 and closing_count != 0:
-                    copy = False
-                    line = line[: line.rfind(syntax) + len(syntax)]
-                    # content = content + line.replace("\n", " ")
-                    content = content.strip(syntax).strip()
-                    endline = line_number
-                    comments.append(Comment(content, start_line, multiline=True))
-                    content = str()
-                    continue
-                else:
-                    start_line = line_number
-            if copy:
-                content += line.replace("\n", " ").strip()
-            else:
-                match = re.findall(pattern, line, re.I)
-                match = "".join(match)
-                if match:
-                    comment = Comment(match.strip(), line_number, multiline=False)
-                    comments.append(comment)
-            lined_source += f"{line_number}:{line}"
-            source_list.append(line)
-            source += line
+        except (tokenize.TokenError, SyntaxError):
+            comments = self.scan_comments(code)
+        return comments, source_list, lined_source, len(source_list), code
 
-        return comments, source_list, lined_source, line_counter, source
+    def iter_comments(self, source: MappedSource) -> Generator[Comment, None, None]:
+        """Yields the comments and docstrings of a memory-mapped Python source file.
 
+        The file is tokenized line by line. If it cannot be tokenized, the comments
+        after the last one yielded are taken from the regex scan of the whole source.
 
-class GoParser(BaseParser):
-    """This class provides methods for parsing comments from Go source code."""
+        Args:
+            source: Memory-mapped source file.
+        Returns:
+            Generator of Comment in the order that they appear in the code.
+        """
+        lineno: int = 0
+        try:
+            for comment in self.tokenize_comments(
+                tokenize.tokenize(source.get_readline())
+            ):
+                lineno = comment.lineno
+                yield comment
+        except (tokenize.TokenError, SyntaxError):
+            for comment in self.scan_comments(source.read()):
+                if comment.lineno > lineno:
+                    yield comment
+
+    @staticmethod
+    def get_comment(text: str, lineno: int) -> Comment:
+        """
+        Get the comment of a `#` comment without its leading `#` characters.
+        """
+        return Comment(text.lstrip("#").strip(), lineno, multiline=False)
 
-    language = Language.go
+    @staticmethod
+    def get_docstring(text: str, lineno: int) -> Comment:
+        """
+        Get the comment of a triple-quoted string literal, its lines joined on one line.
+        """
+        body: str = text.lstrip("rRuUbBfF")[3:-3]
+        return Comment(
+            " ".join(line.strip() for line in body.splitlines() if line.strip()),
+            lineno,
+            multiline=True,
+        )
+
+    def tokenize_comments(
+        self, tokens: Generator[tokenize.TokenInfo, None, None]
+    ) -> Generator[Comment, None, None]:
+        """
+        Yield the comments and docstrings of a source from its tokens.
+        Raises:
+            tokenize.TokenError, SyntaxError: The source cannot be tokenized.
+        """
+        # Type of the last token that is not a comment or a blank line
+        previous: int = tokenize.NEWLINE
+        # Triple-quoted string starting a statement, a docstring if it also ends it
+        candidate: tokenize.TokenInfo = None
+        for token in tokens:
+            if token.type in self.skipped_tokens:
+                if token.type == tokenize.COMMENT:
+                    yield self.get_comment(token.string, token.start[0])
+                continue
+            if candidate:
+                if token.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                    yield self.get_docstring(candidate.string, candidate.start[0])
+                candidate = None
+            if (
+                token.type == tokenize.STRING
+                and previous in self.statement_tokens
+                and token.string.endswith(('"""', "'''"))
+            ):
+                candidate = token
+            previous = token.type
+
+    def scan_comments(self, code: str) -> List[Comment]:
+        """
+        Get the comments and docstrings of a source that cannot be tokenized.
+        Triple-quoted strings starting a line are taken as docstrings.
+        """
+        comments: List[Comment] = []
+        line_number: int = 1
+        offset: int = 0
+        for match in self.scanner.finditer(code):
+            kind: str = match.lastgroup
+            if kind == "string":
+                continue
+            line_number += code.count("\n", offset, match.start())
+            offset = match.start()
+            if kind == "comment":
+                comments.append(self.get_comment(match.group(), line_number))
+            elif not code[code.rfind("\n", 0, offset) + 1 : offset].strip():
+                text: str = match.group()
+                if kind == "unterminated":
+                    # Close the string at the end of the source
+                    text += text.lstrip("rRuUbBfF")[:3]
+                comments.append(self.get_docstring(text, line_number))
+        return comments
+
+
+class ScannerParser(BaseParser):
+    """
+    Base class for parsers scanning the code with one compiled alternation regex.
+    The `scanner` of a parser matches, in a single pass over the whole code, the code and
+    string literals preceding a comment, then the comment in one of the named groups:
+        - `line`/`line_content`: single-line comment and its text.
+        - `block`/`block_content`: multi-line comment and its text.
+        - `error`: start of an unterminated multi-line comment.
+        - `end`: end of the code, after the last comment.
+    String literals are consumed by the regex engine, so Python only runs once per
+    comment. The preceding part must stop only where one of the groups matches, else it
+    is backtracked over. Line numbers are resolved by bisecting a precomputed array of
+    the newline offsets.
+    """
+
+    scanner: re.Pattern = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def extract_attributes(
-        self, code: io.TextIOWrapper
+        self,
+        code: io.TextIOWrapper,
     ) -> Tuple[List[Comment], List[str], str, int, str]:
-        """Extracts a list of comments from the given Go source code.
+        """Extracts a list of comments from the given source code.
 
-        Comments are represented with the Comment class found in the module.
-        Go comments come in two forms, single and multi-line comments.
-        - Single-line comments begin with '//' and continue to the end of line.
-        - Multi-line comments begin with '/*' and end with '*/' and can span
-            multiple lines of code. If a multi-line comment does not terminate
-            before EOF is reached, then an exception is raised.
-        Go comments are not allowed to start in a string or rune literal. This
-        module makes sure to watch out for those.
+        Args:
+            code: String or file containing code to extract comments from.
+        Returns:
+            Python list of Comment in the order that they appear in the code.
+        Raises:
+            UnterminatedCommentError: Encountered an unterminated multi-line
+            comment.
+        """
+        code: str = code.read() if isinstance(code, io.IOBase) else code
+        newlines: List[int] = [match.start() for match in re.finditer("\n", code)]
+        comments: List[Comment] = []
+        for match in self.scanner.finditer(code):
+            kind: str = match.lastgroup
+            if kind == "line":
+                comments.append(
+                    Comment(
+                        match.group("line_content"),
+                        bisect_left(newlines, match.start(kind)) + 1,
+                        multiline=False,
+                    )
+                )
+            elif kind == "block":
+                comments.append(
+                    Comment(
+                        match.group("block_content"),
+                        bisect_left(newlines, match.start(kind)) + 1,
+                        multiline=True,
+                    )
+                )
+            elif kind == "error":
+                raise UnterminatedCommentError()
+        # Lines terminated by a newline, numbered from the line following them
+        source_list: List[str] = [line + "\n" for line in code.split("\n")[:-1]]
+        lined_source: str = "".join(
+            f"{line_number}:{line}"
+            for line_number, line in enumerate(source_list, start=2)
+        )
+        return comments, source_list, lined_source, len(newlines) + 1, code
+
+    def iter_comments(self, source: MappedSource) -> Generator[Comment, None, None]:
+        """Yields the comments of a memory-mapped source file as they are found.
 
-        https://golang.org/ref/spec#Comments
+        The `scanner` runs over the mapped bytes and the line numbers are counted
+        between consecutive comments, so only the comments are ever decoded.
 
         Args:
-        code: String containing code to extract comments from.
+            source: Memory-mapped source file.
         Returns:
-        Python list of Comment in the order that they appear in the code.
+            Generator of Comment in the order that they appear in the code.
         Raises:
-        UnterminatedCommentError: Encountered an unterminated multi-line
+            UnterminatedCommentError: Encountered an unterminated multi-line
             comment.
         """
-        code: str = code.read()
-        state = 0
-        current_comment = ""
-        comments: List[Comment] = []
-        line_counter = 1
-        comment_start = 1
-        string_char = ""
-        source_list = []
-        lined_source = str()
-        line_char = str()
-        for char in code:
-            line_char += char
-            if state == 0:
-                # Waiting for comment start character or beginning of
-                # string or rune literal.
-                if char == "/":
-                    state = 1
-                elif char in ('"', "'", "`"):
-                    string_char = char
-                    state = 5
-            elif state == 1:
-                # Found comment start character, classify next character and
-                # determine if single or multi-line comment.
-                if char == "/":
-                    state = 2
-                elif char == "*":
-                    comment_start = line_counter
-                    state = 3
-                else:
-                    state = 0
-            elif state == 2:
-                # In single-line comment, read characters util EOL.
-                if char == "\n":
-                    comment = Comment(current_comment, line_counter, False)
-                    comments.append(comment)
-                    current_comment = ""
-                    state = 0
-                else:
-                    current_comment += char
-            elif state == 3:
-                # In multi-line comment, add characters until '*' is
-                # encountered.
-                if char == "*":
-                    state = 4
-                else:
-                    current_comment += char
-            elif state == 4:
-                # In multi-line comment with asterisk found. Determine if
-                # comment is ending.
-                if char == "/":
-                    comment = Comment(current_comment, comment_start, multiline=True)
-                    comments.append(comment)
-                    current_comment = ""
-                    state = 0
-                else:
-                    current_comment += "*"
-                    # Care for multiple '*' in a row
-                    if char != "*":
-                        current_comment += char
-                        state = 3
-            elif state == 5:
-                # In string literal, expect literal end or escape character.
-                if char == string_char:
-                    state = 0
-                elif char == "\\":
-                    state = 6
-            elif state == 6:
-                # In string literal, escaping current char.
-                state = 5
-            if char == "\n":
-                line_counter += 1
-                source_list.append(line_char)
-                lined_source += f"{line_counter}:{line_char}"
-                line_char = str()
-
-        # EOF.
-        if state in (3, 4):
-            raise UnterminatedCommentError()
-        if state == 2:
-            # Was in single-line comment. Create comment.
-            comment = Comment(current_comment, line_counter, False)
-            comments.append(comment)
-        return comments, source_list, lined_source, line_counter, code
+        # Bytes version of the scanner, compiled patterns are cached by `re`
+        scanner: re.Pattern = re.compile(
+            self.scanner.pattern.encode(), self.scanner.flags & ~re.UNICODE
+        )
+        lineno: int = 1
+        offset: int = 0
+        for match in scanner.finditer(source.buffer):
+            kind: str = match.lastgroup
+            if kind == "error":
+                raise UnterminatedCommentError()
+            if kind not in ("line", "block"):
+                continue
+            lineno += source.count_lines(offset, match.start(kind))
+            offset = match.start(kind)
+            yield Comment(
+                source.decode(match.group(f"{kind}_content")),
+                lineno,
+                multiline=kind == "block",
+            )
+
+
+class GoParser(ScannerParser):
+    """This class provides methods for parsing comments from Go source code.
+
+    Go comments come in two forms, single and multi-line comments.
+    - Single-line comments begin with '//' and continue to the end of line.
+    - Multi-line comments begin with '/*' and end with '*/' and can span
+        multiple lines of code. If a multi-line comment does not terminate
+        before EOF is reached, then an exception is raised.
+    Go comments are not allowed to start in a string, rune or raw string literal.
+
+    https://golang.org/ref/spec#Comments
+    """
+
+    language = Language.go
+    scanner: re.Pattern = re.compile(
+        r"""
+        (?:
+            [^/"'`]+ |
+            /(?:[^/*]|\Z) |
+            "[^"\\]*(?:\\[\s\S][^"\\]*)*(?:"|\\?\Z) |
+            '[^'\\]*(?:\\[\s\S][^'\\]*)*(?:'|\\?\Z) |
+            `[^`\\]*(?:\\[\s\S][^`\\]*)*(?:`|\\?\Z)
+        )*
+        (?:
+            (?P<line> //(?P<line_content>[^\n]*)) |
+            (?P<block> /\*(?P<block_content>[\s\S]*?)\*/) |
+            (?P<error> /\*) |
+            (?P<end> \Z)
+        )
+        """,
+        re.VERBOSE,
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
 
 
 class CParser(BaseParser):
@@ -332,119 +420,39 @@ class CParser(BaseParser):
         return comments, source_list, lined_source, len(source_list), code
 
 
-class JsParser(BaseParser):
+class JsParser(ScannerParser):
+    """This class provides methods for parsing comments from Javascript source code.
+
+    Javascript comments come in two forms, single and multi-line comments.
+        - Single-line comments begin with '//' and continue to the end of line.
+        - Multi-line comments begin with '/*' and end with '*/' and can span
+        multiple lines of code. If a multi-line comment does not terminate
+        before EOF is reached, then an exception is raised.
+    Quoted strings are taken into account when extracting comments.
+    """
+
     language = Language.rust
+    scanner: re.Pattern = re.compile(
+        r"""
+        (?:
+            [^/"']+ |
+            /(?:[^/*]|\Z) |
+            "[^"\\]*(?:\\[\s\S][^"\\]*)*(?:"|\\?\Z) |
+            '[^'\\]*(?:\\[\s\S][^'\\]*)*(?:'|\\?\Z)
+        )*
+        (?:
+            (?P<line> //(?P<line_content>[^\n]*)) |
+            (?P<block> /\*(?P<block_content>[\s\S]*?)\*/) |
+            (?P<error> /\*) |
+            (?P<end> \Z)
+        )
+        """,
+        re.VERBOSE,
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def extract_attributes(
-        self,
-        code: io.TextIOWrapper,
-    ) -> Tuple[List[Comment], List[str], str, int, str]:
-        """Extracts a list of comments from the given Javascript source code.
-
-        Comments are represented with the Comment class found in the module.
-        Javascript comments come in two forms, single and multi-line comments.
-            - Single-line comments begin with '//' and continue to the end of line.
-            - Multi-line comments begin with '/*' and end with '*/' and can span
-            multiple lines of code. If a multi-line comment does not terminate
-            before EOF is reached, then an exception is raised.
-        This module takes quoted strings into account when extracting comments from
-        source code.
-
-        Args:
-            code: String containing code to extract comments from.
-        Returns:
-            Python list of Comment in the order that they appear in the code.
-        Raises:
-            UnterminatedCommentError: Encountered an unterminated multi-line
-            comment.
-        """
-        code: str = code.read()
-        state = 0
-        source_list = []
-        lined_source = str()
-        line_char = str()
-        current_comment = ""
-        comments = []
-        line_counter = 1
-        comment_start = 1
-        string_char = ""
-        for char in code:
-            line_char += char
-            if state == 0:
-                # Waiting for comment start character or beginning of
-                # string.
-                if char == "/":
-                    state = 1
-                elif char in ('"', "'"):
-                    string_char = char
-                    state = 5
-            elif state == 1:
-                # Found comment start character, classify next character and
-                # determine if single or multi-line comment.
-                if char == "/":
-                    state = 2
-                elif char == "*":
-                    comment_start = line_counter
-                    state = 3
-                else:
-                    state = 0
-            elif state == 2:
-                # In single-line comment, read characters until EOL.
-                if char == "\n":
-                    comment = Comment(current_comment, line_counter)
-                    comments.append(comment)
-                    current_comment = ""
-                    state = 0
-                else:
-                    current_comment += char
-            elif state == 3:
-                # In multi-line comment, add characters until '*' is
-                # encountered.
-                if char == "*":
-                    state = 4
-                else:
-                    current_comment += char
-            elif state == 4:
-                # In multi-line comment with asterisk found. Determine if
-                # comment is ending.
-                if char == "/":
-                    comment = Comment(current_comment, comment_start, multiline=True)
-                    comments.append(comment)
-                    current_comment = ""
-                    state = 0
-                else:
-                    current_comment += "*"
-                    # Care for multiple '*' in a row
-                    if char != "*":
-                        current_comment += char
-                        state = 3
-            elif state == 5:
-                # In string literal, expect literal end or escape character.
-                if char == string_char:
-                    state = 0
-                elif char == "\\":
-                    state = 6
-            elif state == 6:
-                # In string literal, escaping current char.
-                state = 5
-            if char == "\n":
-                line_counter += 1
-                source_list.append(line_char)
-                lined_source += f"{line_counter}:{line_char}"
-                line_char = str()
-
-        # EOF.
-        if state in (3, 4):
-            raise UnterminatedCommentError()
-        if state == 2:
-            # Was in single-line comment. Create comment.
-            comment = Comment(current_comment, line_counter)
-            comments.append(comment)
-        return comments, source_list, lined_source, line_counter, code
-
 
 class HtmlParser(BaseParser):
     language = Language.html
@@ -562,85 +570,36 @@ class RubyParser(BaseParser):
         return comments, source_list, lined_source, len(source_list), code
 
 
-class ShellParser(BaseParser):
+class ShellParser(ScannerParser):
+    """This class provides methods for parsing comments from shell scripts.
+
+    Shell script comments only come in one form, single-line. Single line
+    comments start with an unquoted or unescaped '#' and continue on until the
+    end of the line. A quoted '#' is one that is located within a pair of
+    matching single or double quote marks. An escaped '#' is one that is
+    immediately preceeded by a backslash '\'
+    """
+
     language = Language.shell
+    scanner: re.Pattern = re.compile(
+        r"""
+        (?:
+            [^\#\\"']+ |
+            \\(?:[\s\S]|\Z) |
+            "[^"\\]*(?:\\[\s\S][^"\\]*)*(?:"|\\?\Z) |
+            '[^'\\]*(?:\\[\s\S][^'\\]*)*(?:'|\\?\Z)
+        )*
+        (?:
+            (?P<line> \#(?P<line_content>[^\n]*)) |
+            (?P<end> \Z)
+        )
+        """,
+        re.VERBOSE,
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def extract_attributes(
-        self,
-        code: io.TextIOWrapper,
-    ) -> Tuple[List[Comment], List[str], str, int, str]:
-        """Extracts a list of comments from the given shell script.
-
-        Comments are represented with the Comment class found in the module.
-        Shell script comments only come in one form, single-line. Single line
-        comments start with an unquoted or unescaped '#' and continue on until the
-        end of the line. A quoted '#' is one that is located within a pair of
-        matching single or double quote marks. An escaped '#' is one that is
-        immediately preceeded by a backslash '\'
-
-        Args:
-        code: String containing code to extract comments from.
-        Returns:
-        Python list of Comment in the order that they appear in the code.
-        """
-        code: str = code.read()
-        state = 0
-        string_char = ""
-        current_comment = ""
-        comments = []
-        source_list = []
-        line_char = str()
-        lined_source = str()
-        line_counter = 1
-        for char in code:
-            line_char += char
-            if state == 0:
-                # Waiting for comment start character, beginning of string,
-                # or escape character.
-                if char == "#":
-                    state = 1
-                elif char in ('"', "'"):
-                    string_char = char
-                    state = 2
-                elif char == "\\":
-                    state = 4
-            elif state == 1:
-                # Found comment start character. Read comment until EOL.
-                if char == "\n":
-                    comment = Comment(current_comment, line_counter)
-                    comments.append(comment)
-                    current_comment = ""
-                    state = 0
-                else:
-                    current_comment += char
-            elif state == 2:
-                # In string literal, wait for string end or escape char.
-                if char == string_char:
-                    state = 0
-                elif char == "\\":
-                    state = 3
-            elif state == 3:
-                # Escaping current char, inside of string.
-                state = 2
-            elif state == 4:
-                # Escaping current char, outside of string.
-                state = 0
-            if char == "\n":
-                line_counter += 1
-                source_list.append(line_char)
-                lined_source += f"{line_counter}:{line_char}"
-                line_char = str()
-
-        # EOF.
-        if state == 1:
-            # Was in single line comment. Create comment.
-            comment = Comment(current_comment, line_counter)
-            comments.append(comment)
-        return comments, source_list, lined_source, line_counter, code
-
 
 class RustParser(BaseParser):
     language = Language.rust
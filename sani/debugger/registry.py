@@ -0,0 +1,228 @@
+import threading
+from bisect import bisect_left, bisect_right
+from sani.utils.custom_types import Dict, List, Optional, Tuple, Context, types
+
+
+class BlockRegistry:
+    """
+    Sorted-interval registry of the code blocks watched by the debugger, keyed by mode.
+    Blocks of a mode never overlap: overlapping inserts are merged into the existing block,
+    so block starts and ends are both sorted and every lookup is a binary search.
+    Blocks registered for a function are also keyed by its code object, which lets the
+    error path map a traceback frame to its block without a line lookup.
+    Each block is a watch log dict with `startline`, `endline`, `flag` and `context` keys.
+    The registry is sharded by mode: every mode has its own lock, so threads registering or
+    dispatching blocks of different modes never contend. The `flag` of a block is only set
+    through `claim`, which lets exactly one caller dispatch a block.
+    """
+
+    def __init__(self) -> None:
+        self.__starts: Dict[str, List[int]] = dict()
+        self.__logs: Dict[str, List[Dict]] = dict()
+        self.__codes: Dict[types.CodeType, Dict[str, Dict]] = dict()
+        self.__locks: Dict[str, threading.RLock] = dict()
+        self.__codes_lock: threading.Lock = threading.Lock()
+
+    def after_fork(self) -> None:
+        """
+        Recreate the locks in a forked child process, a lock held by another thread of the
+        parent at fork time would never be released in the child.
+        """
+        self.__locks = dict()
+        self.__codes_lock = threading.Lock()
+
+    def __contains__(self, mode: str) -> bool:
+        return bool(self.__logs.get(mode))
+
+    def get(self, mode: str, default: List[Dict] = None) -> List[Dict]:
+        """
+        Get the blocks of a mode sorted by startline.
+        """
+        with self.get_lock(mode):
+            return list(self.__logs.get(mode, [])) or default
+
+    def get_lock(self, mode: str) -> threading.RLock:
+        """
+        Get the lock of a mode shard.
+        """
+        lock = self.__locks.get(mode)
+        if lock is None:
+            # setdefault is atomic, racing threads end up with the same lock
+            lock = self.__locks.setdefault(mode, threading.RLock())
+        return lock
+
+    def register(
+        self,
+        mode: str,
+        log: Dict,
+        code: types.CodeType = None,
+        exclusive: List[str] = (),
+    ) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Insert a block unless it overlaps a block of one of the exclusive modes.
+        The check and the insert are atomic: the shards of the mode and the exclusive modes
+        are locked together, always in the same order.
+        Parameters:
+            mode (str): Debugger mode.
+            log (Dict): Watch log with `startline` and `endline` keys.
+            code (CodeType): Code object of the wrapped function if any.
+            exclusive (List[str]): Modes the block must not overlap.
+        Returns:
+            The overlapping block of an exclusive mode if the block was not inserted, and
+            the block the log was merged into (see `insert`).
+        """
+        modes: List[str] = sorted(
+            {getattr(mode_, "value", mode_) for mode_ in (mode, *exclusive)}
+        )
+        locks: List[threading.RLock] = [self.get_lock(mode_) for mode_ in modes]
+        for lock in locks:
+            lock.acquire()
+        try:
+            for mode_ in exclusive:
+                conflict = self.overlap(
+                    mode_, log[Context.startline.value], log[Context.endline.value]
+                )
+                if conflict:
+                    return conflict, None
+            return None, self.insert(mode, log, code)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def claim(self, mode: str, log: Dict) -> bool:
+        """
+        Set the flag of a block of a mode if it is not set yet.
+        Returns:
+            True for the one caller that set the flag, False if it was already set.
+        """
+        with self.get_lock(mode):
+            if log[Context.flag.value]:
+                return False
+            log[Context.flag.value] = True
+            return True
+
+    def modes(self) -> List[str]:
+        """
+        Get the modes with at least one block.
+        """
+        return [mode for mode, logs in self.__logs.items() if logs]
+
+    def insert(
+        self, mode: str, log: Dict, code: types.CodeType = None
+    ) -> Optional[Dict]:
+        """
+        Insert a block, merging it into the block of the same mode it overlaps with.
+        Parameters:
+            mode (str): Debugger mode.
+            log (Dict): Watch log with `startline` and `endline` keys.
+            code (CodeType): Code object of the wrapped function if any.
+        Returns:
+            The block the log was merged into or None if it was inserted as a new block.
+        """
+        startline: int = log[Context.startline.value]
+        endline: int = log[Context.endline.value]
+        with self.get_lock(mode):
+            merged = self.overlap(mode, startline, endline)
+            if merged:
+                self.extend(mode, merged, startline, endline)
+            else:
+                starts = self.__starts.setdefault(mode, [])
+                index = bisect_right(starts, startline)
+                starts.insert(index, startline)
+                self.__logs.setdefault(mode, []).insert(index, log)
+            if code is not None:
+                with self.__codes_lock:
+                    self.__codes.setdefault(code, {})[mode] = merged or log
+            return merged
+
+    def extend(self, mode: str, log: Dict, startline: int, endline: int) -> Dict:
+        """
+        Extend a block to also cover startline to endline.
+        Blocks of the same mode the extended block now overlaps are merged into it.
+        """
+        with self.get_lock(mode):
+            starts, logs = self.__starts[mode], self.__logs[mode]
+            index = self.__index(mode, log)
+            del starts[index], logs[index]
+            startline = min(startline, log[Context.startline.value])
+            endline = max(endline, log[Context.endline.value])
+            first = last = bisect_left(starts, startline)
+            while first > 0 and logs[first - 1][Context.endline.value] > startline:
+                first -= 1
+                startline = starts[first]
+            while last < len(starts) and starts[last] < endline:
+                endline = max(endline, logs[last][Context.endline.value])
+                last += 1
+            for swallowed in logs[first:last]:
+                self.__replace_code(mode, swallowed, log)
+            del starts[first:last], logs[first:last]
+            starts.insert(first, startline)
+            logs.insert(first, log)
+            log[Context.startline.value] = startline
+            log[Context.endline.value] = endline
+            return log
+
+    def overlap(self, mode: str, startline: int, endline: int) -> Optional[Dict]:
+        """
+        Get a block of a mode that overlaps startline to endline.
+        A block ending on the line another starts is not an overlap.
+        """
+        with self.get_lock(mode):
+            starts = self.__starts.get(mode)
+            if not starts:
+                return None
+            index = bisect_right(starts, endline) - 1
+            if index < 0:
+                return None
+            log = self.__logs[mode][index]
+            if (
+                log[Context.endline.value] > startline
+                or log[Context.startline.value] == startline
+            ):
+                return log
+            return None
+
+    def get_enclosing(self, mode: str, lineno: int) -> Optional[Dict]:
+        """
+        Get the block of a mode that contains a line.
+        """
+        with self.get_lock(mode):
+            starts = self.__starts.get(mode)
+            if not starts:
+                return None
+            index = bisect_right(starts, lineno) - 1
+            if index < 0:
+                return None
+            log = self.__logs[mode][index]
+            return log if lineno <= log[Context.endline.value] else None
+
+    def get_block(self, mode: str, startline: int) -> Optional[Dict]:
+        """
+        Get the block of a mode starting on a line.
+        """
+        with self.get_lock(mode):
+            starts = self.__starts.get(mode, [])
+            index = bisect_left(starts, startline)
+            if index < len(starts) and starts[index] == startline:
+                return self.__logs[mode][index]
+            return None
+
+    def get_by_code(self, code: types.CodeType, mode: str) -> Optional[Dict]:
+        """
+        Get the block registered for a function's code object in a mode.
+        """
+        codes = self.__codes.get(code)
+        return codes.get(mode) if codes else None
+
+    def __index(self, mode: str, log: Dict) -> int:
+        starts, logs = self.__starts[mode], self.__logs[mode]
+        index = bisect_left(starts, log[Context.startline.value])
+        while logs[index] is not log:
+            index += 1
+        return index
+
+    def __replace_code(self, mode: str, old: Dict, new: Dict) -> None:
+        with self.__codes_lock:
+            for codes in self.__codes.values():
+                if codes.get(mode) is old:
+                    codes[mode] = new
@@ -0,0 +1,144 @@
+import time
+import random
+import threading
+import itertools
+from sani.utils.custom_types import (
+    Enum,
+    ABC,
+    abstractmethod,
+    Any,
+    Dict,
+    List,
+    types,
+)
+from sani.utils.utils import get_content_hash
+from sani.core.config import Config
+
+config = Config()
+
+
+class BaseSampler(ABC):
+    """
+    An abstract class to be inherited by all samplers
+    must have a `sample` method.
+    A sampler decides which calls of a debugger method build a context;
+    calls that are not sampled skip the context work entirely.
+    A code block is dispatched once at most, so a sampler picks the call dispatching it
+    rather than limiting the dispatches of a callsite over time: rate based policies
+    delay the dispatch, `once` and `first` decide which blocks are dispatched at all.
+    """
+
+    sampler_name: str = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.args = args
+        self.kwargs = kwargs
+
+    @abstractmethod
+    def sample(self, callsite: Any, content: types.FunctionType = None) -> bool:
+        """
+        Check if a call should be sampled.
+            Parameters:
+                callsite (Hashable): Key of the calling site e.g. the wrapped function or the block lines.
+                content (Callable[[], str]): Lazily get the source of the code block.
+            Returns:
+                True if the call should be debugged.
+        """
+        raise NotImplementedError()
+
+
+class ProbabilitySampler(BaseSampler):
+    """
+    Sample calls with a fixed probability.
+    """
+
+    sampler_name = "probability"
+
+    def __init__(self, rate: float = None, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.rate: float = config.sample_rate if rate is None else rate
+
+    def sample(self, callsite: Any, content: types.FunctionType = None) -> bool:
+        return random.random() < self.rate
+
+
+class FirstSampler(BaseSampler):
+    """
+    Sample the first `limit` calls of each callsite.
+    """
+
+    sampler_name = "first"
+
+    def __init__(self, limit: int = None, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.limit: int = config.sample_limit if limit is None else limit
+        self.calls: Dict[Any, itertools.count] = dict()
+
+    def sample(self, callsite: Any, content: types.FunctionType = None) -> bool:
+        calls = self.calls.get(callsite) or self.calls.setdefault(
+            callsite, itertools.count()
+        )
+        return next(calls) < self.limit
+
+
+class TokenBucketSampler(BaseSampler):
+    """
+    Sample calls of each callsite with a token bucket
+    refilled with `rate` tokens per second up to `capacity` tokens.
+    """
+
+    sampler_name = "token_bucket"
+
+    def __init__(
+        self, rate: float = None, capacity: int = None, *args, **kwargs
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.rate: float = config.sample_rate if rate is None else rate
+        self.capacity: int = config.sample_limit if capacity is None else capacity
+        # callsite -> [tokens, last refill time]
+        self.buckets: Dict[Any, List[float]] = dict()
+        self.lock = threading.Lock()
+
+    def sample(self, callsite: Any, content: types.FunctionType = None) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.setdefault(callsite, [self.capacity, now])
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                return False
+            bucket[0] -= 1
+            return True
+
+
+class BlockHashSampler(BaseSampler):
+    """
+    Sample a code block once per content hash,
+    callsites with the same block source are only sampled once.
+    """
+
+    sampler_name = "once"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.hashes: set = set()
+        self.lock = threading.Lock()
+
+    def sample(self, callsite: Any, content: types.FunctionType = None) -> bool:
+        content_hash = get_content_hash(content() if content else str(callsite))
+        with self.lock:
+            if content_hash in self.hashes:
+                return False
+            self.hashes.add(content_hash)
+            return True
+
+
+class Sampler(Enum):
+    """
+    Enum for samplers
+    """
+
+    probability = ProbabilitySampler
+    first = FirstSampler
+    token_bucket = TokenBucketSampler
+    once = BlockHashSampler
@@ -1,9 +1,121 @@
 import io
-import astor
 import linecache
+import tokenize
+from functools import lru_cache
 from sani.core.ops import os
-from sani.utils.custom_types import Any, Generator, script, ast, Enum, Language
+from sani.utils.custom_types import (
+    Any,
+    Generator,
+    List,
+    Optional,
+    ast,
+    Enum,
+    Language,
+    Comment,
+)
 from sani.debugger.parser import Parser, BaseParser
+from sani.debugger.source import SourceBuffer
+from sani.debugger.symbols import SymbolIndex
+
+# Value of a lazy script field not computed yet
+UNSET = object()
+
+
+class SourceScript(SourceBuffer):
+    """
+    Attributes of a script: its source buffer and its ast, imports, comments and ast
+    dump, each computed on first access and memoized.
+    The ast of a python source is parsed once, with its statement index, and every field
+    derived from it reuses it.
+    """
+
+    __slots__ = ("language", "_index", "_imports", "_comments", "_ast_dump")
+
+    def __init__(
+        self, text: str, language: str = None, comments: List[Comment] = None
+    ) -> None:
+        """
+        Parameters:
+            text (str): Source of the script.
+            language (str): Language of the script.
+            comments (List[Comment]): Comments of the script if already extracted.
+        """
+        super().__init__(text)
+        self.language: str = language
+        self._index = self._imports = self._ast_dump = UNSET
+        self._comments = UNSET if comments is None else comments
+
+    @property
+    def index(self) -> Optional[SymbolIndex]:
+        """
+        Statement index of the parsed source, shared with `PythonScript.get_source_index`.
+        None if the script is not python or can't be parsed.
+        """
+        if self._index is UNSET:
+            self._index = None
+            if self.language == Language.python:
+                try:
+                    self._index = PythonScript.get_source_index(self.text)
+                except (SyntaxError, ValueError):
+                    pass
+        return self._index
+
+    @property
+    def ast(self) -> Optional[ast.Module]:
+        index: SymbolIndex = self.index
+        return index.tree if index else None
+
+    @property
+    def imports(self) -> Optional[str]:
+        """
+        Module level import statements, sliced from the source. A line holding several
+        imports e.g. `import a; import b` is sliced once.
+        """
+        if self._imports is UNSET:
+            tree: ast.Module = self.ast
+            if tree is None:
+                self._imports = None
+                return self._imports
+            ranges: List[str] = []
+            endline: int = 0
+            for node in PythonScript.get_script_imports(tree, format="ast"):
+                # Imports are in source order, skip the lines already sliced
+                if node.end_lineno > endline:
+                    ranges.append(
+                        self.get_range(max(node.lineno, endline + 1), node.end_lineno)
+                    )
+                    endline = node.end_lineno
+            self._imports = ("").join(ranges)
+        return self._imports
+
+    @property
+    def docstring(self) -> Optional[str]:
+        """
+        Module docstring.
+        """
+        tree: ast.Module = self.ast
+        return ast.get_docstring(tree) if tree else None
+
+    @property
+    def comments(self) -> List[Comment]:
+        """
+        Comments of the script, extracted by the parser of its language.
+        """
+        if self._comments is UNSET:
+            parser: Parser = Parser.__dict__.get("_member_map_").get(self.language)
+            self._comments = (
+                parser.value().extract_attributes(io.StringIO(self.text))[0]
+                if parser
+                else []
+            )
+        return self._comments
+
+    @property
+    def ast_dump(self) -> Optional[str]:
+        if self._ast_dump is UNSET:
+            tree: ast.Module = self.ast
+            self._ast_dump = ast.dump(tree) if tree else None
+        return self._ast_dump
 
 
 class BaseScript:
@@ -13,7 +125,7 @@ class BaseScript:
     """
 
     script_type: str = None
-    script = script
+    script = SourceScript
 
     def __init__(self, *args, **kwargs) -> None:
         self.args = args
@@ -22,30 +134,14 @@ class BaseScript:
             Parser.__dict__.get("_member_map_").get(self.script_type).value()
         )
 
-    def get_script(self, file) -> script:
+    def get_script(self, file) -> SourceScript:
         """
         Get a report from the script
         """
 
-    def get_attributes(self, source_code: io.TextIOWrapper) -> script:
-        (
-            comments,
-            source_list,
-            lined_source,
-            lenght,
-            code,
-        ) = self.parser.extract_attributes(source_code)
-        return script(
-            lenght,
-            source_list,
-            code,
-            lined_source,
-            None,
-            None,
-            None,
-            comments,
-            None,
-        )
+    def get_attributes(self, source_code: io.TextIOWrapper) -> SourceScript:
+        comments, _, _, _, code = self.parser.extract_attributes(source_code)
+        return self.script(code, language=self.script_type, comments=comments)
 
     def get_script_path(self, file: str) -> str:
         """
@@ -79,6 +175,19 @@ class PythonScript(BaseScript):
 
         return ast.parse(script)
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def get_source_index(script: str) -> SymbolIndex:
+        """
+        Get the symbol span index of a source script.
+        Each distinct source is parsed once; later calls return the cached index.
+        Parameters:
+            script (str): Source script.
+        Returns:
+            SymbolIndex: Index of every statement to its (lineno, end_lineno) span and the parsed module.
+        """
+        return SymbolIndex(PythonScript.get_ast(script))
+
     @staticmethod
     def get_script_from_ast(ast: ast.AST) -> str:
         """
@@ -86,6 +195,8 @@ class PythonScript(BaseScript):
         Parameters:
             ast (ast.AST): Abstract syntax tree object.
         """
+        import astor
+
         return astor.to_source(ast)
 
     @staticmethod
@@ -133,47 +244,22 @@ class PythonScript(BaseScript):
         """
         return os.path.basename(file)
 
-    def get_script(self, file: str) -> script:
+    def get_script(self, file: str) -> SourceScript:
         """
-        Get the lines of a python source file as a list of strings.
+        Get the source of a python source file.
         Parameters:
             file (string): filepath to python source file.
         Returns:
-            A NamedTuple object of Type[ScriptLines] ie.`NamedTuple("Script",[("lenght", int),("lines", List[str]),("string", str),(lined_string,str),("lined_list", List[str]),("ast",ast.Ast), ("imports", str),("comments", str),("ast_dump",str,)],)`.
+            SourceScript: Source buffer of the script, its lines are sliced from it on demand
+            and its ast, imports, comments and ast dump are computed on first access.
         """
-
-        lined_list = list()
-        lined_string = str()
-        string = str()
-        lines = linecache.getlines(file)
-
-        for index, line in enumerate(lines):
-            lined_text = f"{index + 1} : {line}"
-            lined_list.append(lined_text)
-            lined_string += lined_text
-            string += line
-        # ast_object = PythonScript.get_ast(string)
-        ast_object = None
-
-        # ast_dump = ast.dump(ast_object)
-        ast_dump = None
-        # imports = ("").join(
-        #     [impt for impt in PythonScript.get_script_imports(ast_object)]
-        # )
-        imports = None
-        # comments = PythonScript.get_comments(ast_object)
-        comments = None
-        return self.script(
-            len(lines),
-            lines,
-            string,
-            lined_string,
-            lined_list,
-            ast_object,
-            imports,
-            comments,
-            ast_dump,
-        )
+        try:
+            # Decoded like linecache does, without keeping the lines in its cache
+            with tokenize.open(file) as source:
+                string = source.read()
+        except (OSError, SyntaxError):
+            string = ("").join(linecache.getlines(file))
+        return self.script(string, language=self.script_type)
 
 
 class GoScript(BaseScript):
@@ -0,0 +1,259 @@
+import os
+import re
+import mmap
+from array import array
+from sani.utils.custom_types import Generator, List, Tuple
+
+
+class MappedSource:
+    """
+    Read-only memory map of a source file with lazy line access.
+    The file is never read as a whole: parsers scan the mapped bytes directly and the
+    start offsets of the lines are only indexed up to the last line accessed, so reading
+    the comments and a few lines of a multi-megabyte file uses constant memory.
+    Use as a context manager, or `close` the source once done.
+    """
+
+    # Bytes scanned at once when counting lines
+    chunk_size: int = 1 << 20
+
+    def __init__(self, filepath: str, encoding: str = "utf-8") -> None:
+        """
+        Parameters:
+            filepath (str): Path of the source file.
+            encoding (str): Encoding of the source file.
+        """
+        self.filepath: str = filepath
+        self.encoding: str = encoding
+        self.file = open(filepath, "rb")
+        # Empty files cannot be mapped
+        self.buffer = (
+            mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.fstat(self.file.fileno()).st_size
+            else b""
+        )
+        # Start offsets of the lines indexed so far
+        self.offsets: array = array("Q", [0])
+
+    def __enter__(self) -> "MappedSource":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def close(self) -> None:
+        """
+        Unmap and close the source file.
+        """
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.file.close()
+
+    def decode(self, data: bytes) -> str:
+        return data.decode(self.encoding, errors="replace")
+
+    def read(self) -> str:
+        """
+        Get the whole source, for parsers without a streaming scanner.
+        """
+        return self.decode(self.buffer[:])
+
+    def count_lines(self, start: int, end: int) -> int:
+        """
+        Count the newlines between two offsets, copying at most `chunk_size` bytes at once.
+        """
+        count: int = 0
+        for offset in range(start, end, self.chunk_size):
+            count += self.buffer[offset : min(offset + self.chunk_size, end)].count(
+                b"\n"
+            )
+        return count
+
+    def get_offset(self, lineno: int) -> int:
+        """
+        Get the start offset of a line, indexing the lines up to it.
+        Parameters:
+            lineno (int): Line number, starting at 1.
+        Raises:
+            IndexError: The source has no such line.
+        """
+        if lineno < 1:
+            raise IndexError(f"line {lineno} out of range")
+        while len(self.offsets) < lineno:
+            end: int = self.buffer.find(b"\n", self.offsets[-1])
+            if end == -1:
+                raise IndexError(f"line {lineno} out of range")
+            self.offsets.append(end + 1)
+        offset: int = self.offsets[lineno - 1]
+        if offset >= len(self.buffer) and lineno > 1:
+            raise IndexError(f"line {lineno} out of range")
+        return offset
+
+    def get_line(self, lineno: int) -> str:
+        """
+        Get a line of the source with its line ending.
+        Parameters:
+            lineno (int): Line number, starting at 1.
+        Raises:
+            IndexError: The source has no such line.
+        """
+        offset: int = self.get_offset(lineno)
+        if offset >= len(self.buffer):
+            raise IndexError(f"line {lineno} out of range")
+        end: int = self.buffer.find(b"\n", offset) + 1 or len(self.buffer)
+        return self.decode(self.buffer[offset:end])
+
+    def iter_raw_lines(self, offset: int = 0) -> Generator[bytes, None, None]:
+        """
+        Yield the undecoded lines of the source from an offset.
+        """
+        size: int = len(self.buffer)
+        while offset < size:
+            end: int = self.buffer.find(b"\n", offset) + 1 or size
+            yield self.buffer[offset:end]
+            offset = end
+
+    def iter_lines(
+        self, startline: int = 1, endline: int = None
+    ) -> Generator[str, None, None]:
+        """
+        Yield the lines of the source between two lines, both included.
+        Parameters:
+            startline (int): First line, starting at 1.
+            endline (int): Last line, the last line of the source if None.
+        """
+        lineno: int = startline
+        for line in self.iter_raw_lines(self.get_offset(startline)):
+            if endline is not None and lineno > endline:
+                break
+            yield self.decode(line)
+            lineno += 1
+
+    def get_readline(self):
+        """
+        Get a `readline` callable over the undecoded lines of the source, as used by
+        `tokenize.tokenize`.
+        """
+        lines: Generator[bytes, None, None] = self.iter_raw_lines()
+        return lambda: next(lines, b"")
+
+
+class SourceBuffer:
+    """
+    Immutable source text with an index of its line start offsets.
+    The text is held once: lines, line ranges and numbered views are sliced from it on
+    demand, so a loaded source costs about its own size plus 4 bytes per line.
+    """
+
+    __slots__ = ("text", "offsets")
+
+    def __init__(self, text: str) -> None:
+        """
+        Parameters:
+            text (str): Source text, with `\\n` line endings.
+        """
+        self.text: str = text
+        # Start offsets of the lines, followed by the end of the text
+        self.offsets: array = array("I" if len(text) < 1 << 32 else "Q", [0])
+        self.offsets.extend(match.end() for match in re.finditer("\n", text))
+        if self.offsets[-1] != len(text):
+            self.offsets.append(len(text))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lenght(self) -> int:
+        """
+        Number of lines of the source.
+        """
+        return len(self.offsets) - 1
+
+    @property
+    def string(self) -> str:
+        return self.text
+
+    @property
+    def lines(self) -> List[str]:
+        """
+        Lines of the source with their line endings, built on each access.
+        """
+        return self.get_lines(1, len(self))
+
+    @property
+    def lined_string(self) -> str:
+        """
+        Source with line numbers, built on each access.
+        """
+        return self.get_lined(1, len(self))
+
+    @property
+    def lined_list(self) -> List[str]:
+        """
+        Lines of the source with line numbers, built on each access.
+        """
+        return [f"{lineno}:{line}" for lineno, line in enumerate(self.lines, start=1)]
+
+    def get_span(self, startline: int, endline: int) -> Tuple[int, int]:
+        """
+        Get the offsets of a range of lines, clamped to the source like a list slice.
+        Parameters:
+            startline (int): First line, starting at 1.
+            endline (int): Last line, included.
+        """
+        start: int = min(max(startline - 1, 0), len(self))
+        end: int = min(max(endline, start), len(self))
+        return self.offsets[start], self.offsets[end]
+
+    def get_line(self, lineno: int) -> str:
+        """
+        Get a line of the source with its line ending.
+        Parameters:
+            lineno (int): Line number, starting at 1.
+        Raises:
+            IndexError: The source has no such line.
+        """
+        if not 0 < lineno <= len(self):
+            raise IndexError(f"line {lineno} out of range")
+        return self.text[self.offsets[lineno - 1] : self.offsets[lineno]]
+
+    def get_range(self, startline: int, endline: int) -> str:
+        """
+        Get the text of a range of lines, both included.
+        """
+        start, end = self.get_span(startline, endline)
+        return self.text[start:end]
+
+    def get_lines(self, startline: int, endline: int) -> List[str]:
+        """
+        Get the lines of a range of lines, both included, with their line endings.
+        """
+        return list(self.iter_lines(startline, endline))
+
+    def get_lined(self, startline: int, endline: int) -> str:
+        """
+        Get a range of lines, both included, prefixed with their line numbers.
+        """
+        start: int = max(startline, 1)
+        return "".join(
+            f"{lineno}:{line}"
+            for lineno, line in enumerate(self.iter_lines(start, endline), start=start)
+        )
+
+    def iter_lines(
+        self, startline: int = 1, endline: int = None
+    ) -> Generator[str, None, None]:
+        """
+        Yield the lines of a range of lines, both included, with their line endings.
+        Parameters:
+            startline (int): First line, starting at 1.
+            endline (int): Last line, the last line of the source if None.
+        """
+        start: int = min(max(startline - 1, 0), len(self))
+        end: int = len(self) if endline is None else min(max(endline, start), len(self))
+        text, offsets = self.text, self.offsets
+        for index in range(start, end):
+            yield text[offsets[index] : offsets[index + 1]]
@@ -0,0 +1,85 @@
+from bisect import bisect_left, bisect_right
+from sani.utils.custom_types import List, Tuple, Optional, ast
+
+DOCSTRING_NODES: Tuple[type] = (
+    ast.Module,
+    ast.ClassDef,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+)
+
+
+class SymbolIndex:
+    """
+    Index of every statement (functions and classes included) of a parsed module
+    to its (lineno, end_lineno) span.
+    Spans are stored in source order so block boundaries, enclosing statements and
+    docstrings are found with a binary search instead of scanning or re-parsing the source.
+    """
+
+    __slots__ = ("tree", "starts", "ends", "nodes", "parents")
+
+    def __init__(self, tree: ast.Module) -> None:
+        self.tree: ast.Module = tree
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.nodes: List[ast.stmt] = []
+        self.parents: List[int] = []
+        # Pre-order walk so parents come before their children and spans are sorted by startline
+        stack: List[Tuple[ast.AST, int]] = [(tree, -1)]
+        while stack:
+            node, parent = stack.pop()
+            if isinstance(node, ast.stmt):
+                decorators = getattr(node, "decorator_list", None)
+                self.starts.append(
+                    min(node.lineno, *(item.lineno for item in decorators))
+                    if decorators
+                    else node.lineno
+                )
+                self.ends.append(node.end_lineno or node.lineno)
+                self.nodes.append(node)
+                self.parents.append(parent)
+                parent = len(self.nodes) - 1
+            stack.extend(
+                (child, parent) for child in reversed(list(ast.iter_child_nodes(node)))
+            )
+
+    def get_index(self, lineno: int) -> Optional[int]:
+        """
+        Get the position of the outermost statement starting on a line.
+        Parameters:
+            lineno (int): Line number, decorators included.
+        Returns:
+            Position in the index or None if no statement starts on the line.
+        """
+        index = bisect_left(self.starts, lineno)
+        if index < len(self.starts) and self.starts[index] == lineno:
+            return index
+        return None
+
+    def get_span(self, lineno: int) -> Optional[Tuple[int, int]]:
+        """
+        Get the (lineno, end_lineno) span of the outermost statement starting on a line.
+        """
+        index = self.get_index(lineno)
+        return None if index is None else (self.starts[index], self.ends[index])
+
+    def get_enclosing(self, lineno: int) -> Optional[ast.stmt]:
+        """
+        Get the innermost statement whose span contains a line.
+        """
+        index = bisect_right(self.starts, lineno) - 1
+        while index >= 0 and self.ends[index] < lineno:
+            index = self.parents[index]
+        return self.nodes[index] if index >= 0 else None
+
+    def get_docstring(self, lineno: int, clean: bool = False) -> Optional[str]:
+        """
+        Get the docstring of the class or function starting on a line.
+        Falls back to the module docstring for any other statement.
+        """
+        index = self.get_index(lineno)
+        node = self.nodes[index] if index is not None else None
+        if not isinstance(node, DOCSTRING_NODES):
+            node = self.tree
+        return ast.get_docstring(node, clean=clean)
@@ -1,6 +1,5 @@
-from typing import Union, Dict, List, Any, Tuple, NamedTuple, Type, Generator, Optional
+from typing import Union, Dict, List, Any, Tuple, NamedTuple, Type, Generator, Optional, Set, TYPE_CHECKING
 import types
-import shutil
 from enum import Enum
 import ast
 from abc import ABC, abstractmethod, abstractclassmethod
@@ -19,21 +18,13 @@ Comment = NamedTuple(
         ("multiline", bool),
     ],
 )
-script = NamedTuple(
-    "Script",
+frame_object = NamedTuple(
+    "Frame",
     [
-        ("lenght", int),
-        ("lines", List[str]),
-        ("string", str),
-        ("lined_string", str),
-        ("lined_list", List[str]),
-        ("ast", ast.AST),
-        ("imports", str),
-        ("comments", List[Comment]),
-        (
-            "ast_dump",
-            str,
-        ),
+        ("frame", types.FrameType),
+        ("filename", str),
+        ("lineno", int),
+        ("function", str),
     ],
 )
 block_object = NamedTuple(
@@ -59,6 +50,29 @@ engine = NamedTuple(
 
 io_object = NamedTuple("IO", [("path", str), ("stream", io.TextIOWrapper)])
 
+preload_object = NamedTuple(
+    "Preload",
+    [
+        ("signature", Tuple[int, int]),
+        ("caller_source", Any),
+        ("script", Any),
+        ("comments", List[Comment]),
+        ("source_hash", str),
+        ("lint_worker", Any),
+    ],
+)
+
+lint_record = NamedTuple(
+    "LintRecord",
+    [
+        ("line", int),
+        ("column", int),
+        ("code", str),
+        ("severity", str),
+        ("message", str),
+    ],
+)
+
 
 error_object = NamedTuple(
     "Error",
@@ -157,6 +171,7 @@ class Context(str, Enum):
     mode = "mode"
     referer = "referer"
     flag = "flag"
+    sampled = "sampled"
     language = "language"
     context = "context"
     pid = "pid"
@@ -166,6 +181,10 @@ class Context(str, Enum):
     command = "command"
     lined_block = "lined_block"
     source_list = "source_list"
+    source_hash = "source_hash"
+    workers = "workers"
+    ledger_key = "ledger_key"
+    error_counts = "error_counts"
 
 
 class ChatResponse(str, Enum):
@@ -215,6 +234,8 @@ class Executables(str, Enum):
     typescript = "tsc"
 
     def get(language: str, command: List[str]) -> List[str]:
+        import shutil
+
         executable: Executables = Executables.__dict__.get(Enums.members).get(language)
         if executable:
             exec_dir = shutil.which(executable.value)
@@ -223,5 +244,17 @@ class Executables(str, Enum):
             return [exec_dir] + command
 
     def get_custom_exec(executable: str, command: List[str]) -> List[str]:
+        import shutil
+
         exec_dir = shutil.which(executable)
         return [exec_dir] + command
+
+
+class Overflow(str, Enum):
+    """
+    Overflow policies of the dispatch queue
+    """
+
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+    block = "block"
@@ -18,14 +18,26 @@ _LOGGER.setLevel(_LEVEL)
 
 
 def get_logger(format_str: str = None) -> logging.Logger:
+    """
+    Get the logger of a module, configured with its console handler on the first call
+    only, so each log line is printed once and under the name of its module.
+    Parameters:
+        format_str (str): Name of the module, `__name__`.
+    """
+    logger: logging.Logger = logging.getLogger(format_str) if format_str else _LOGGER
+    if logger.handlers:
+        return logger
     formatter = logging.Formatter(
         f"%(asctime)s::%(levelname)s::{format_str if format_str else str()}::%(message)s"
     )
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    _LOGGER.addHandler(console_handler)
+    logger.addHandler(console_handler)
+    logger.setLevel(_LEVEL)
+    # The handler is on the module logger, don't print again through the parent loggers
+    logger.propagate = False
 
-    return _LOGGER
+    return logger
 
     # logging.basicConfig(level=logging.INFO,
     #                     format='%(asctime)s - %(message)s',
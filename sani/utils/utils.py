@@ -13,3 +13,11 @@ class Object(Dictionary, object):
 
     pass
 
+
+def get_content_hash(content: str) -> str:
+    """
+    Get a stable hash of a text content, the same across runs and processes.
+    """
+    import hashlib
+
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()